@@ -0,0 +1,310 @@
+"""
+Microbenchmarks for the reactive core, no Qt needed.
+
+Every scenario runs in --processes fresh interpreters and reports its best
+throughput (operations per second) over all of their runs. Each process also
+times a pure-Python calibration loop, the score is the scenario's throughput
+in calibration loops, its median over the runs is compared with
+bench_reactive_baseline.json, so the baseline holds on other machines.
+A scenario fails when its score drops more than --threshold below the baseline.
+
+Usage:
+    python benchmarks/bench_reactive.py                    # check against the baseline
+    python benchmarks/bench_reactive.py -k memo            # only scenarios matching "memo"
+    python benchmarks/bench_reactive.py --save             # rewrite baseline from this machine
+
+tests/test_bench_reactive.py runs each scenario once with the test suite,
+and this gate with REACTPYQT_BENCH=1, see contribute.md.
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import timeit
+from typing import Callable
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "bench_reactive_baseline.json"
+)
+
+sys.path.insert(0, ROOT)
+
+from reactpyqt.reactive import (  # noqa: E402
+    Owner,
+    create_effect,
+    create_list,
+    create_memo,
+    create_selector,
+    create_signal,
+    map_list,
+    run_with_owner,
+    with_text,
+)
+
+# name -> setup, setup 返回被计时的 op 和它每次调用算几次操作
+SCENARIOS: dict[str, Callable[[], tuple[Callable[[], None], int]]] = {}
+
+
+def scenario(fn):
+    SCENARIOS[fn.__name__] = fn
+    return fn
+
+
+@scenario
+def signal_get_set():
+    value, set_value = create_signal(0)
+
+    def op():
+        set_value(value() + 1)
+
+    return op, 1
+
+
+@scenario
+def fan_out_1_to_1000():
+    value, set_value = create_signal(0)
+    for _ in range(1000):
+        create_effect(lambda: value())
+
+    def op():
+        set_value(lambda v: v + 1)
+
+    return op, 1
+
+
+@scenario
+def fan_in_100_to_1():
+    signals = [create_signal(0) for _ in range(100)]
+    create_effect(lambda: sum(value() for value, _ in signals))
+
+    def op():
+        for _, set_value in signals:
+            set_value(lambda v: v + 1)
+
+    return op, len(signals)
+
+
+@scenario
+def memo_chain_100():
+    value, set_value = create_signal(0)
+    last = value
+    for _ in range(100):
+        last = create_memo(lambda prev=last: prev() + 1)
+    create_effect(lambda: last())
+
+    def op():
+        set_value(lambda v: v + 1)
+
+    return op, 1
+
+
+@scenario
+def diamond_100():
+    value, set_value = create_signal(0)
+    for _ in range(100):
+        left = create_memo(lambda: value() + 1)
+        right = create_memo(lambda: value() * 2)
+        create_effect(lambda left=left, right=right: left() + right())
+
+    def op():
+        set_value(lambda v: v + 1)
+
+    return op, 1
+
+
+@scenario
+def effect_churn_100():
+    value, _ = create_signal(0)
+
+    def op():
+        owner = Owner()
+        run_with_owner(owner, lambda: [create_effect(lambda: value()) for _ in range(100)])
+        owner.dispose()
+
+    return op, 100
+
+
+@scenario
+def selector_1000_rows():
+    selected, set_selected = create_signal(0)
+    is_selected = create_selector(selected)
+    for i in range(1000):
+        create_effect(lambda i=i: is_selected(i))
+
+    def op():
+        set_selected(lambda v: (v + 1) % 1000)
+
+    return op, 1
+
+
+@scenario
+def map_list_1000():
+    items, set_items = create_signal(list(range(1000)))
+    mapped = map_list(items, lambda item, idx: item * 2)
+    create_effect(lambda: mapped())
+
+    def op():
+        set_items(lambda prev: prev[1:] + prev[:1])
+
+    return op, 1
+
+
+@scenario
+def with_text_update():
+    first, set_first = create_signal(0)
+    second, _ = create_signal("x")
+    text = with_text("{} / {}", first, second)
+    create_effect(lambda: text())
+
+    def op():
+        set_first(lambda v: v + 1)
+
+    return op, 1
+
+
+@scenario
+def with_text_bind_update():
+    first, set_first = create_signal(0)
+    second, _ = create_signal("x")
+    texts = []
+    with_text("{} / {}", first, second).bind(texts.append)
+
+    def op():
+        set_first(lambda v: v + 1)
+        texts.clear()
+
+    return op, 1
+
+
+@scenario
+def reactive_list_append_pop():
+    items = create_list(range(1000))
+    create_effect(lambda: items())
+
+    def op():
+        items.append(0)
+        items.pop(0)
+
+    return op, 2
+
+
+def calibration():
+    """
+    Plain Python doing what the reactive core does most, calls, closures and set updates,
+    its speed follows the interpreter and the machine but not reactpyqt.
+    """
+    subscribers = set()
+
+    def notify(value):
+        return value + 1
+
+    def op():
+        for i in range(100):
+            subscribers.add(notify)
+            notify(i)
+            subscribers.discard(notify)
+
+    return op, 1
+
+
+def measure(setup, repeat: int) -> tuple[float, float]:
+    """
+    Best ops/s of setup and of calibration, timed alternately in this process.
+    """
+    timers = []
+    for fn in (setup, calibration):
+        op, ops_per_call = fn()
+        timer = timeit.Timer(op)
+        number, _ = timer.autorange()
+        timers.append((timer, number, ops_per_call))
+
+    best = [float("inf")] * len(timers)
+    for _ in range(repeat):
+        # 交替测, 机器一段时间变慢时两者一起变慢
+        for idx, (timer, number, _) in enumerate(timers):
+            best[idx] = min(best[idx], timer.timeit(number))
+    ops, calibration_ops = (
+        number * ops_per_call / elapsed
+        for (_, number, ops_per_call), elapsed in zip(timers, best)
+    )
+    return ops, calibration_ops
+
+
+def measure_isolated(name: str, repeat: int, processes: int) -> tuple[float, float]:
+    """
+    Best ops/s and median score of name over processes runs.
+    """
+    # 每个场景单独的进程, 前面场景留下的 effect 不会影响后面的
+    best_ops = 0.0
+    scores = []
+    for _ in range(processes):
+        proc = subprocess.run(
+            [sys.executable, __file__, "--worker", name, "--repeat", str(repeat)],
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"{name} failed:\n{proc.stderr}")
+        ops, calibration_ops = map(float, proc.stdout.strip().splitlines()[-1].split())
+        best_ops = max(best_ops, ops)
+        scores.append(ops / calibration_ops)
+    return best_ops, statistics.median(scores)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-k", default="", help="only run scenarios whose name contains this")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--processes", type=int, default=3)
+    parser.add_argument("--threshold", type=float, default=0.3)
+    parser.add_argument("--save", action="store_true")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(*measure(SCENARIOS[args.worker], args.repeat))
+        return 0
+
+    baseline = {}
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE) as f:
+            baseline = json.load(f)
+
+    failed = False
+    results = {}
+    print(f"{'scenario':<28}{'ops/s':>14}{'score':>12}{'baseline':>12}{'change':>10}")
+    for name in SCENARIOS:
+        if args.k not in name:
+            continue
+        ops, score = measure_isolated(name, args.repeat, args.processes)
+        results[name] = score
+
+        expected = baseline.get(name)
+        if expected is None:
+            print(f"{name:<28}{ops:>14,.0f}{score:>12.4g}{'-':>12}{'':>10}")
+            continue
+        change = score / expected - 1
+        mark = ""
+        if change < -args.threshold:
+            mark = "  !! regressed"
+            failed = True
+        print(f"{name:<28}{ops:>14,.0f}{score:>12.4g}{expected:>12.4g}{change:>+10.1%}{mark}")
+
+    if args.save:
+        baseline.update({name: float(f"{score:.4g}") for name, score in results.items()})
+        with open(BASELINE_FILE, "w") as f:
+            json.dump(baseline, f, indent=4)
+            f.write("\n")
+        print(f"Baseline written to {BASELINE_FILE}")
+        return 0
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+"""
+Rendering benchmarks against a real Qt binding (offscreen).
+
+Every scenario runs in a fresh process per binding, so PyQt6 and PySide6
+can be compared on the same workloads.
+
+Usage:
+    python benchmarks/bench_render.py                   # every installed binding
+    python benchmarks/bench_render.py --api pyside6     # one binding
+    python benchmarks/bench_render.py --rows 5000 --json results.json
+    python benchmarks/bench_render.py --flat             # also compare flat leaf widgets
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from importlib.util import find_spec
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BINDINGS = {"pyqt6": "PyQt6", "pyside6": "PySide6"}
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run_scenarios(rows: int, flat: bool) -> dict[str, float]:
+    sys.path.insert(0, ROOT)
+    from loguru import logger
+
+    logger.remove()
+
+    from reactpyqt.qt import QT_API
+    from reactpyqt.qt.QtCore import QObject
+    from reactpyqt.qt.QtWidgets import QApplication, QWidget, QVBoxLayout
+    from reactpyqt.core import Component, VBox, HBox, Label, Button, For, Switch, Case, Router, render
+    from reactpyqt.reactive import create_signal, create_list, with_text
+    from reactpyqt.renderer import use_flat_widgets
+
+    use_flat_widgets(flat)
+    app = QApplication.instance() or QApplication(sys.argv)
+    # 容器被回收后 effect 还会继续更新已删除的控件, 所以这里要一直持有
+    containers: list[QWidget] = []
+
+    def mount(component: Component) -> QWidget:
+        container = QWidget()
+        container.setLayout(QVBoxLayout())
+        # 可见的容器才会做布局和绘制, 和真实的窗口一样
+        container.show()
+        render(container, component)
+        containers.append(container)
+        return container
+
+    results: dict[str, float] = {"api": f"{QT_API}{'-flat' if flat else ''}"}
+
+    # 1. mount a list of static rows
+    class StaticList(Component):
+        def render(self):
+            return VBox(For(each=self.props["each"], map_fn=lambda item, _: HBox(Label(item), Label("static"))))
+
+    items, set_items = create_signal([f"row {i}" for i in range(rows)])
+    results["mount_static_rows"] = _timed(lambda: mount(StaticList(each=items)))
+
+    # 2. replace every row of a signal backed For
+    results["replace_all_rows"] = _timed(lambda: set_items([f"new {i}" for i in range(rows)]))
+
+    # 2b. the same, including the layout and paint passes that follow
+    def replace_and_process():
+        set_items([f"again {i}" for i in range(rows)])
+        app.processEvents()
+
+    results["replace_rows_and_layout"] = _timed(replace_and_process)
+
+    # 3. append rows one by one to a ReactiveList
+    todos = create_list([f"row {i}" for i in range(rows)])
+    mount(StaticList(each=todos))
+
+    def append_rows():
+        for i in range(100):
+            todos.append(f"appended {i}")
+
+    results["append_100_rows"] = _timed(append_rows)
+
+    # 4. update dynamic labels
+    count, set_count = create_signal(0)
+
+    class Counters(Component):
+        def render(self):
+            return VBox(*[Label(with_text("{} #{}", count, lambda i=i: i)) for i in range(rows)])
+
+    mount(Counters())
+    results["update_dynamic_labels"] = _timed(lambda: set_count(1))
+
+    # 5. toggle a Switch between two subtrees
+    flag, set_flag = create_signal(True)
+
+    class Toggle(Component):
+        def render(self):
+            return VBox(
+                Switch(
+                    condition=flag,
+                    cases=[
+                        Case(when=lambda v: v, render=VBox(*[Label(f"a{i}") for i in range(100)])),
+                        Case(when=lambda v: not v, render=VBox(*[Button(f"b{i}") for i in range(100)])),
+                    ],
+                )
+            )
+
+    mount(Toggle())
+
+    def toggle():
+        for _ in range(10):
+            set_flag(lambda v: not v)
+
+    results["toggle_switch_10x"] = _timed(toggle)
+
+    # 5b. mount a Switch and a Router over 30 screens, then visit each once
+    screens = {f"s{i}": (lambda i=i: VBox(*[Label(f"s{i} {j}") for j in range(20)])) for i in range(30)}
+    case, _ = create_signal("s0")
+    route, set_route = create_signal("s0")
+
+    class SwitchScreens(Component):
+        def render(self):
+            return VBox(
+                Switch(
+                    condition=case,
+                    cases=[Case(when=lambda r, name=name: r == name, render=build()) for name, build in screens.items()],
+                )
+            )
+
+    class RouterScreens(Component):
+        def render(self):
+            return VBox(Router(route=route, routes=screens))
+
+    results["mount_switch_30_screens"] = _timed(lambda: mount(SwitchScreens()))
+    results["mount_router_30_screens"] = _timed(lambda: mount(RouterScreens()))
+
+    def visit_screens():
+        for name in screens:
+            set_route(name)
+
+    results["visit_router_30_screens"] = _timed(visit_screens)
+
+    # 6. mount interactive rows, a closure per row vs a delegated action
+    class ClosureRows(Component):
+        def render(self):
+            each = self.props["each"]
+            return VBox(
+                For(
+                    each=each,
+                    map_fn=lambda item, idx: HBox(
+                        Label(item), Button("x", on_click=lambda: each.pop(idx))
+                    ),
+                )
+            )
+
+    class ActionRows(Component):
+        def render(self):
+            each = self.props["each"]
+            return VBox(
+                For(
+                    each=each,
+                    map_fn=lambda item, idx: HBox(Label(item), Button("x", on_click="remove")),
+                    actions={"remove": lambda item, idx: each.pop(idx)},
+                )
+            )
+
+    closure_rows = create_list([f"row {i}" for i in range(rows)])
+    action_rows = create_list([f"row {i}" for i in range(rows)])
+    results["mount_closure_rows"] = _timed(lambda: mount(ClosureRows(each=closure_rows)))
+    results["mount_action_rows"] = _timed(lambda: mount(ActionRows(each=action_rows)))
+
+    app.processEvents()
+    results["qobjects"] = sum(len(c.findChildren(QObject)) for c in containers)
+    return results
+
+
+def run_binding(api: str, rows: int, flat: bool) -> dict:
+    env = dict(os.environ, REACTPYQT_QT_API=api)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    proc = subprocess.run(
+        [sys.executable, __file__, "--worker", "--rows", str(rows)]
+        + (["--flat"] if flat else []),
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{api} benchmark failed:\n{proc.stderr}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--api", choices=list(BINDINGS))
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument(
+        "--flat", action="store_true", help="also run with use_flat_widgets()"
+    )
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_scenarios(args.rows, args.flat)))
+        return 0
+
+    apis = [args.api] if args.api else [api for api, module in BINDINGS.items() if find_spec(module)]
+    results = [run_binding(api, args.rows, False) for api in apis]
+    if args.flat:
+        results += [run_binding(api, args.rows, True) for api in apis]
+
+    scenarios = [name for name in results[0] if name != "api"]
+    print(f"{'scenario':<24}" + "".join(f"{r['api']:>12}" for r in results))
+    for name in scenarios:
+        if name == "qobjects":
+            print(f"{name:<24}" + "".join(f"{r[name]:>12}" for r in results))
+        else:
+            print(f"{name:<24}" + "".join(f"{r[name] * 1000:>10.1f}ms" for r in results))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=4)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+Import-time report and regression budget for reactpyqt.
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter for
+every module listed in importtime_budget.json, prints the slowest imports and
+fails when a module exceeds its budget or pulls in a forbidden dependency
+(e.g. PyQt6 / loguru, which must only be imported on first use).
+
+Usage:
+    python benchmarks/importtime.py              # check against the budget
+    python benchmarks/importtime.py --top 20     # show more of the report
+    python benchmarks/importtime.py --update     # rewrite budget from this machine
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "importtime_budget.json")
+
+
+def measure(module: str) -> list[tuple[str, int, int]]:
+    """
+    Import `module` in a fresh interpreter and parse the -X importtime output.
+
+    :return: list of (module, self_us, cumulative_us)
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr}")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def best_of(module: str, repeat: int) -> tuple[int, list[tuple[str, int, int]]]:
+    best_total, best_rows = None, None
+    for _ in range(repeat):
+        rows = measure(module)
+        total = sum(self_us for _, self_us, _ in rows)
+        if best_total is None or total < best_total:
+            best_total, best_rows = total, rows
+    return best_total, best_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--update", action="store_true")
+    args = parser.parse_args()
+
+    with open(BUDGET_FILE) as f:
+        budget = json.load(f)
+
+    failed = False
+    for module, spec in budget["modules"].items():
+        total, rows = best_of(module, args.repeat)
+        imported = {name for name, _, _ in rows}
+
+        print(f"== {module}: {total / 1000:.1f} ms (budget {spec['max_us'] / 1000:.1f} ms)")
+        for name, self_us, cumulative_us in sorted(rows, key=lambda r: -r[1])[: args.top]:
+            print(f"   {self_us:>8} us  {cumulative_us:>8} us  {name}")
+
+        for forbidden in spec.get("forbidden", []):
+            if any(name == forbidden or name.startswith(f"{forbidden}.") for name in imported):
+                print(f"!! {module} imports {forbidden} at load time")
+                failed = True
+
+        if args.update:
+            spec["max_us"] = int(total * budget.get("headroom", 3.0))
+        elif total > spec["max_us"]:
+            print(f"!! {module} import time over budget")
+            failed = True
+
+    if args.update:
+        with open(BUDGET_FILE, "w") as f:
+            json.dump(budget, f, indent=4)
+            f.write("\n")
+        print(f"Budget written to {BUDGET_FILE}")
+        return 0
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,8 +9,7 @@ from reactpyqt.core import (
     Input,
     ScrollArea,
     For,
-    Switch,
-    Case,
+    Router,
 )
 from reactpyqt.reactive import create_signal, create_effect
 from loguru import logger
@@ -20,20 +19,15 @@ todo, set_todo = create_signal(["Hello", "World"])
 create_effect(lambda: logger.info(f"Todo: {todo()}"))
 
 
-class Router(Component):
+class Pages(Component):
     def render(self):
-        return Switch(
-            condition=page,
-            cases=[
-                Case(
-                    when=lambda page: page == "home",
-                    render=Home(),
-                ),
-                Case(
-                    when=lambda page: page == "add-todo",
-                    render=AddTodo(),
-                ),
-            ],
+        return Router(
+            route=page,
+            routes={
+                "home": Home,
+                "add-todo": AddTodo,
+            },
+            prefetch=["add-todo"],
             fallback=Label("404"),
         )
 
@@ -87,7 +81,7 @@ class Home(Component):
 
 class App(Component):
     def render(self):
-        return VBox(Router(), key="app-wrapper")
+        return VBox(Pages(), key="app-wrapper")
 
 
 if __name__ == "__main__":
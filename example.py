@@ -13,6 +13,7 @@ from reactpyqt.core import (
 )
 from reactpyqt.reactive import (
     create_signal,
+    create_list,
     create_effect,
     with_text,
 )
@@ -68,7 +69,6 @@ class Nav(Component):
 class TodoItem(Component):
     def render(self):
         item = self.props.get("item")
-        remove_fn = self.props.get("remove_fn")
 
         nested_items, set_nested_items = create_signal(
             ["Nested item in todo 1", "Nested item in todo 2"]
@@ -90,10 +90,11 @@ class TodoItem(Component):
                     key=f"nested-item-for-{item}",
                 ),
             ),
+            # "remove" 是外层 For 的 action, 行里不需要闭包
             Button(
                 "Delete",
                 key=f"todo-item-delete-{item}",
-                on_click=lambda: remove_fn(self.props.get("idx")),
+                on_click="remove",
             ),
             key=f"todo-item-hbox-{item}",
         )
@@ -109,23 +110,22 @@ class App(Component):
         is_logged_in, set_is_logged_in = create_signal(False)
         set_timeout(lambda: set_is_logged_in(True), 5)
 
-        todo, set_todo = create_signal(["First Render", "Buy something"])
+        todo = create_list(["First Render", "Buy something"])
         create_effect(lambda: logger.debug("todo changed: {}", todo()))
 
         count, set_count = create_signal(0)
         set_interval(lambda: set_count(count() + 1), 1)
 
         def add_todo():
-            set_todo(lambda prev: [*prev, f"New Todo {len(prev)}"])
+            todo.append(f"New Todo {len(todo)}")
 
-        def remove_todo(idx):
-            set_todo(lambda prev: prev[:idx] + prev[idx + 1 :])
+        def remove_todo(item, idx):
+            todo.pop(idx)
 
         def render_list(item, idx):
             return TodoItem(
                 item=item,
                 idx=idx,
-                remove_fn=remove_todo,
                 key=f"todo-item-component-{item}",
             )
 
@@ -149,6 +149,7 @@ class App(Component):
                         each=todo,
                         map_fn=render_list,
                         fallback=Label("No todo items", key="no-todo"),
+                        actions={"remove": remove_todo},
                         key="todo-list-for",
                     ),
                     key="scroll-area",
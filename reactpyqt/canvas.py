@@ -0,0 +1,70 @@
+"""
+Draw primitives for Canvas.
+
+    from reactpyqt.core import Canvas
+    from reactpyqt.canvas import Rect, Line, Text, Path
+
+    Canvas(
+        shapes=lambda: [Rect(x(), 10, 20, 20, fill="red"), Text(0, 40, label())],
+        static=[Line(0, 0, 200, 0), Line(0, 0, 0, 200)],
+        size=(200, 200),
+    )
+
+shapes may be a list, an accessor or a ReactiveList of primitives, drawn in order.
+Primitives are plain tuples compared by value: only the areas of primitives
+that appeared or disappeared since the last change are repainted.
+static is drawn once into a cached pixmap under shapes, for axes, grids and such.
+
+Colors are anything QColor accepts, e.g. "red", "#ff8800", or an (r, g, b[, a]) tuple.
+"""
+
+from __future__ import annotations
+from typing import NamedTuple, Union
+
+Color = Union[str, tuple]
+
+
+class Rect(NamedTuple):
+    x: float
+    y: float
+    width: float
+    height: float
+    fill: Color | None = None
+    stroke: Color | None = "black"
+    stroke_width: float = 1
+
+
+class Line(NamedTuple):
+    x1: float
+    y1: float
+    x2: float
+    y2: float
+    color: Color = "black"
+    width: float = 1
+
+
+class Text(NamedTuple):
+    """
+    x, y is the top left corner of the text.
+    """
+
+    x: float
+    y: float
+    text: str
+    color: Color = "black"
+    size: int = 12
+
+
+class Path(NamedTuple):
+    """
+    A polyline through points, a tuple of (x, y), closed back to the first point if closed.
+    """
+
+    points: tuple[tuple[float, float], ...]
+    closed: bool = False
+    fill: Color | None = None
+    stroke: Color | None = "black"
+    stroke_width: float = 1
+
+
+Shape = Union[Rect, Line, Text, Path]
@@ -1,76 +1,114 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Callable, Any
-from uuid import uuid4
-from loguru import logger
-
-from PyQt6.QtWidgets import (
-    QVBoxLayout,
-    QMainWindow,
-    QApplication,
-    QWidget,
-)
-from PyQt6.QtCore import QThreadPool
+from contextlib import nullcontext
+from typing import Callable, Any, Iterator, AsyncIterator, NamedTuple
 import sys
 
-from .qt_widget import (
-    QT_Widget,
-    QT_HBox,
-    QT_VBox,
-    QT_Button,
-    QT_Label,
-    QT_Input,
-    QT_ScrollArea,
-)
 from .globalvar import __app__, __is_first_render__, __intervals__
-from .reactive import create_effect, SignalAccessor, create_memo, map_list
+from .reactive import (
+    create_effect,
+    SignalAccessor,
+    create_memo,
+    map_list,
+    untrack,
+    ReactiveList,
+    Owner,
+    get_owner,
+    run_with_owner,
+    on_cleanup,
+    catch_errors,
+    create_selector,
+    Signal,
+    Ref,
+)
 from .utils.rect import zoom_rect
-from .utils.debug import print_layout_contents, print_tree
+from .utils.debug import print_widget_tree, print_tree
 from .utils.validation import (
     is_main_thread,
     is_virtual_widget_node,
     is_control_flow_node,
 )
-from .utils.layout import insert_widgets_to_layout, remove_widgets_by_length
-from .utils.common import flatten
+from .utils.layout import (
+    replace_rendered_widgets,
+    swap_rendered_widgets,
+    find_control_flow_index,
+    insert_widgets_at,
+    remove_widget_from_layout,
+)
+from .utils.common import normalize_children, gen_key
+from .renderer import get_renderer
+from .resource import SuspenseContext, run_with_suspense
+from .delegate import EventDelegate, create_delegate_owner
+from .utils.log import logger
+from . import diagnostics
+
+# Qt binding 只在真正创建控件时才 import, 保证 import reactpyqt 足够快
+# fmt: off
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from .qt_widget import QT_Widget
+# fmt: on
 
 
 class VirtualWidget(ABC):
     def __init__(self, *children, **props):
-        logger.debug(f"Creating VirtualWidget props {props}")
+        logger.debug("Creating VirtualWidget props {}", props)
 
         if props.get("key", None):
             self.key = props["key"]
         else:
-            key = str(uuid4())
+            key = gen_key()
             self.key = key
             props["key"] = key
 
         self.tag: str | None = props.pop("tag", None)
-        self.children: list[VirtualWidget | Component | ControlFlow] = children
+        self.children: tuple[VirtualWidget | Component | ControlFlow, ...] = (
+            normalize_children(children)
+        )
         self.props: dict = props
+        # None: 还没计算, 见 is_static
+        self._static: bool | None = None
 
     def __repr__(self) -> str:
         return f"<VirtualWidget tag={self.tag} key={self.key} props={self.props} children={self.children}>"
 
 
 def create_qt_widget(node: VirtualWidget) -> QT_Widget:
-    logger.debug(f"Creating QT_Widget[{node.tag}] for {node}")
-    tag = node.tag
-    if tag == "button":
-        return QT_Button(**node.props)
-    elif tag == "label":
-        return QT_Label(**node.props)
-    elif tag == "input":
-        return QT_Input(**node.props)
-    elif tag == "vbox":
-        return QT_VBox(**node.props)
-    elif tag == "hbox":
-        return QT_HBox(**node.props)
-    elif tag == "scrollarea":
-        return QT_ScrollArea(**node.props)
-    else:
-        raise ValueError(f"Invalid tag: {tag}")
+    logger.debug("Creating QT_Widget[{}] for {}", node.tag, node)
+    return get_renderer().create_widget(node.tag, node.props)
+
+
+def is_static(vwgt: VirtualWidget) -> bool:
+    """
+    Whether vwgt is a static subtree, the result is cached on vwgt.
+
+    A static subtree only contains VirtualWidgets whose props are plain values:
+    no accessors, no callbacks, no ref and no layout instance.
+    """
+    if vwgt._static is None:
+        vwgt._static = _compute_is_static(vwgt)
+    return vwgt._static
+
+
+def _compute_is_static(vwgt: VirtualWidget) -> bool:
+    for name, value in vwgt.props.items():
+        if name in ("ref", "layout") or callable(value):
+            return False
+    return all(
+        isinstance(child, VirtualWidget) and is_static(child) for child in vwgt.children
+    )
+
+
+def create_qt_widget_static(vwgt: VirtualWidget) -> QT_Widget:
+    """
+    Create the QT_Widgets of a static subtree directly,
+    without ReactiveNode, reconcile_children or commit_work.
+    """
+    renderer = get_renderer()
+    widget = renderer.create_widget(vwgt.tag, vwgt.props)
+    for child in vwgt.children:
+        renderer.append_widget(widget, create_qt_widget_static(child))
+    return widget
 
 
 def create_reactive_node(
@@ -80,9 +118,9 @@ def create_reactive_node(
     if isinstance(child, Component):
         return ReactiveNode.from_component(child, parent)
     elif isinstance(child, VirtualWidget):
-        result = ReactiveNode.from_virtual_widget(child, parent)
-        result.qt_widget = create_qt_widget(result)
-        return result
+        if is_static(child):
+            return ReactiveNode.from_static_virtual_widget(child, parent)
+        return ReactiveNode.from_virtual_widget(child, parent)
     elif isinstance(child, ControlFlow):
         return ReactiveNode.from_control_flow(child, parent)
     else:
@@ -93,25 +131,16 @@ def create_qt_widget_nested(vwgt: VirtualWidget) -> QT_Widget:
     """
     Will transform VirtualWidget to ReactiveNode tree
     and create QT_Widget for each node.
+
+    Static subtrees skip the ReactiveNode tree and are built directly.
     """
+    if is_static(vwgt):
+        return create_qt_widget_static(vwgt)
+
     node = create_reactive_node(vwgt, None)
     node.make_tree_after_this_node()
 
-    def cb(node: ReactiveNode, _: int):
-        if node.parent is None:
-            return
-
-        host_node = node.parent.find_virtual_widget_parent(include_self=True)
-        add_node = node.find_virtual_widget_child(include_self=True)
-
-        if host_node is None:
-            return
-        logger.debug(f"Adding {add_node.qt_widget} to {host_node.key}")
-        if add_node is None:
-            return
-        host_node.qt_widget.layout().addWidget(add_node.qt_widget)
-
-    node.for_each_child(cb)
+    node.for_each_child(commit_work)
 
     root_widget = node.find_virtual_widget_child().qt_widget
     if root_widget is None:
@@ -132,80 +161,262 @@ def create_qt_widget_nested_component(component: Component):
     root_widget = node.find_virtual_widget_child().qt_widget
     if root_widget is None:
         raise ValueError("Root widget is None")
-    logger.debug(f"Create QT_Widget for {component.key}: {root_widget.objectName()}")
-    print_layout_contents(root_widget.layout())
+    logger.debug("Create QT_Widget for {}", component.key)
+    print_widget_tree(root_widget)
     return root_widget
 
 
+def create_qt_widget_for_item(item: VirtualWidget | Component) -> QT_Widget:
+    if isinstance(item, VirtualWidget):
+        return create_qt_widget_nested(item)
+    elif isinstance(item, Component):
+        return create_qt_widget_nested_component(item)
+    else:
+        raise ValueError(f"Invalid item {item}")
+
+
+def create_owned_widget(
+    node: ReactiveNode,
+    parent_owner: Owner | None,
+    build: Callable[[], VirtualWidget | Component],
+) -> QT_Widget:
+    """
+    Create the widget of one row/case of a control flow node under its own Owner,
+    so node.dispose_widget can release its effects and timers later.
+    """
+    owner = Owner(parent_owner)
+    try:
+        # 不能让子树里读到的 signal 订阅到 control flow 自己的 effect 上
+        widget = run_with_owner(
+            owner, lambda: untrack(lambda: create_qt_widget_for_item(build()))
+        )
+    except Exception:
+        # 已经创建的 effect 和 timer 不能留下来
+        owner.dispose()
+        raise
+    node.owners[id(widget)] = owner
+    return widget
+
+
+def discard_widgets(node: ReactiveNode, widgets: list[QT_Widget]):
+    """
+    Throw away widgets built for node that never made it into the layout.
+    """
+    renderer = get_renderer()
+    for widget in widgets:
+        node.dispose_widget(widget)
+        renderer.destroy_widget(widget)
+
+
+def create_owned_widgets(
+    node: ReactiveNode,
+    parent_owner: Owner | None,
+    items: list[VirtualWidget | Component],
+) -> list[QT_Widget]:
+    """
+    create_owned_widget for every item, all or nothing.
+
+    If one item fails the widgets built so far are discarded and the error is raised,
+    the layout is left as it was.
+    """
+    widgets = []
+    try:
+        for item in items:
+            widgets.append(create_owned_widget(node, parent_owner, lambda: item))
+    except Exception:
+        discard_widgets(node, widgets)
+        raise
+    return widgets
+
+
+def handle_control_flow_for_list(parent: ReactiveNode, node: ReactiveNode):
+    """
+    For over a ReactiveList, apply each patch to the layout
+    instead of rebuilding every row.
+
+    map_fn receives the index of the item at the time its row is created.
+    """
+    control_flow: For = node.control_flow
+    source: ReactiveList = control_flow.each
+    if control_flow.streamed:
+        # 用到时才 import, stream 依赖 QtCore
+        from .stream import stream_list
+
+        # 在这个 For 的 owner 下开始, For 移除时生产者跟着停下来
+        source = node.stream = stream_list(
+            control_flow.each,
+            chunk_size=control_flow.chunk_size,
+            max_rows=control_flow.max_rows,
+        )
+    host_node = parent.find_virtual_widget_parent(include_self=True)
+    host = host_node.qt_widget
+    renderer = get_renderer()
+
+    rows: list[QT_Widget] = []
+    fallback_widget: QT_Widget | None = None
+    owner, node.delegate = create_delegate_owner(control_flow.actions, lambda: rows)
+
+    def build_row(item, idx: int) -> QT_Widget:
+        row = create_owned_widget(node, owner, lambda: control_flow.map_fn(item, idx))
+        if node.delegate is not None:
+            node.delegate.add_row(row, item)
+        return row
+
+    def remove_row(widget: QT_Widget):
+        remove_widget_from_layout(host, widget)
+        node.dispose_widget(widget)
+
+    def start_index() -> int:
+        # 已经有控件时直接用第一个控件的位置, 不需要再去找前一个兄弟节点
+        first = rows[0] if rows else fallback_widget
+        if first is not None:
+            return renderer.index_of(host, first)
+        return find_control_flow_index(host_node, node)
+
+    def mount_rows(index: int, widgets: list[QT_Widget]):
+        nonlocal fallback_widget
+        if fallback_widget is not None:
+            remove_row(fallback_widget)
+            fallback_widget = None
+        insert_widgets_at(host, index, widgets)
+
+    def build_rows(items: list, index: int) -> list[QT_Widget]:
+        # 全部建好才挂载, 失败时布局保持原样
+        new_rows = []
+        try:
+            for offset, item in enumerate(items):
+                new_rows.append(build_row(item, index + offset))
+        except Exception:
+            discard_widgets(node, new_rows)
+            raise
+        return new_rows
+
+    def mount_fallback_if_empty(index: int):
+        nonlocal fallback_widget
+        if rows or control_flow.fallback is None:
+            return
+        fallback_widget = create_owned_widget(node, owner, lambda: control_flow.fallback)
+        insert_widgets_at(host, index, [fallback_widget])
+
+    def sync_rendered_widgets():
+        if rows:
+            node.rendered_widgets = rows
+        elif fallback_widget is not None:
+            node.rendered_widgets = [fallback_widget]
+        else:
+            node.rendered_widgets = []
+
+    def handler(patch: tuple):
+        if not is_main_thread():
+            raise ValueError("Signal handler must run in main thread")
+        logger.debug("For {} patch {}", node.key, patch[0])
+
+        op = patch[0]
+        # 单行的修改不值得, batch 开关的开销和 host 的子控件数量成正比
+        bulk = op in ("insert_range", "remove_range", "reset")
+        with renderer.batch(host) if bulk else nullcontext():
+            start = start_index()
+            if op == "insert":
+                _, index, item = patch
+                row = build_row(item, index)
+                mount_rows(start + index, [row])
+                rows.insert(index, row)
+            elif op == "insert_range":
+                _, index, items = patch
+                new_rows = build_rows(items, index)
+                mount_rows(start + index, new_rows)
+                rows[index:index] = new_rows
+            elif op == "remove":
+                _, index, _ = patch
+                remove_row(rows.pop(index))
+                mount_fallback_if_empty(start)
+            elif op == "remove_range":
+                _, first, stop = patch
+                for row in rows[first:stop]:
+                    remove_row(row)
+                del rows[first:stop]
+                mount_fallback_if_empty(start)
+            elif op == "move":
+                _, from_index, to_index = patch
+                row = rows.pop(from_index)
+                rows.insert(to_index, row)
+                renderer.take_widget(host, row)
+                renderer.insert_widget(host, start + to_index, row)
+            elif op == "replace":
+                _, index, item = patch
+                row = build_row(item, index)
+                renderer.insert_widget(host, start + index, row)
+                remove_row(rows[index])
+                rows[index] = row
+            elif op == "reset":
+                _, items = patch
+                # 先建新的, 失败时旧的行还在
+                new_rows = build_rows(items, 0)
+                for row in rows:
+                    remove_row(row)
+                rows.clear()
+                if new_rows:
+                    mount_rows(start, new_rows)
+                    rows.extend(new_rows)
+                else:
+                    mount_fallback_if_empty(start)
+            else:
+                raise ValueError(f"Invalid list patch {patch}")
+        sync_rendered_widgets()
+
+    items = untrack(source.get)
+    rows.extend(build_row(item, idx) for idx, item in enumerate(items))
+    index = find_control_flow_index(host_node, node)
+    if rows:
+        insert_widgets_at(host, index, rows)
+    else:
+        mount_fallback_if_empty(index)
+    sync_rendered_widgets()
+
+    handler = catch_errors(handler)
+    source.subscribe_patch(handler)
+    on_cleanup(lambda: source.unsubscribe_patch(handler))
+
+
 def handle_control_flow_for(parent: ReactiveNode, node: ReactiveNode):
-    length = None
+    owner, node.delegate = create_delegate_owner(
+        node.control_flow.actions, lambda: node.rendered_widgets
+    )
+    # 挂载时才创建, map_fn 的错误才会交给外面的 ErrorBoundary, 移除时也跟着 owner 释放
+    accessor = create_memo(map_list(node.control_flow.each, node.control_flow.map_fn))
 
     def handler():
         if not is_main_thread():
             raise ValueError("Signal handler must run in main thread")
-        global __is_first_render__
-        nonlocal length
 
         host_node = parent.find_virtual_widget_parent(include_self=True)
-        # logger.warning(f"Handling For {node.key}, host_node: {host_node.key}")
-        # logger.warning(f"Host node qt_widget: {host_node.qt_widget}")
 
-        items: list[VirtualWidget | Component] = node.control_flow.accessor()
+        items: list[VirtualWidget | Component] = accessor()
         if not isinstance(items, list):
             raise ValueError(f"Invalid control flow For items {items}")
 
-        current_length = len(items)
-        if __is_first_render__:
-            length = current_length
-
-        qt_widgets = []
-        for item in items:
-            if isinstance(item, VirtualWidget):
-                qt_widgets.append(create_qt_widget_nested(item))
-            elif isinstance(item, Component):
-                qt_widgets.append(create_qt_widget_nested_component(item))
-            else:
-                raise ValueError(f"Invalid item {item}")
-
-        if __is_first_render__:
-            if current_length == 0:
-                insert_widgets_to_layout(
-                    host_node,
-                    node,
-                    [create_qt_widget(node.control_flow.fallback)],
-                )
-            else:
-                insert_widgets_to_layout(host_node, node, qt_widgets)
-        else:
-            if isinstance(length, int) and length > 0:
-                remove_widgets_by_length(host_node, node, length)
-
-            if current_length == 0:
-                insert_widgets_to_layout(
-                    host_node,
-                    node,
-                    [create_qt_widget(node.control_flow.fallback)],
-                )
-            else:
-                insert_widgets_to_layout(host_node, node, qt_widgets)
+        if not items and node.control_flow.fallback is not None:
+            items = [node.control_flow.fallback]
+        qt_widgets = create_owned_widgets(node, owner, items)
+        if node.delegate is not None:
+            # map_list 的结果和 each 一一对应, fallback 时 each 是空的
+            for widget, item in zip(qt_widgets, untrack(node.control_flow.each)):
+                node.delegate.add_row(widget, item)
 
-        if node.control_flow.fallback is not None and current_length == 0:
-            length = 1
-        else:
-            length = current_length
+        replace_rendered_widgets(host_node, node, qt_widgets)
 
-        logger.debug(f"For control flow {node.key} handler done")
+        logger.debug("For control flow {} handler done", node.key)
 
     create_effect(handler)
 
 
 def handle_control_flow_switch(parent: ReactiveNode, node: ReactiveNode):
-    logger.debug(f"Handling Switch {node.key}")
+    logger.debug("Handling Switch {}", node.key)
+    owner = get_owner()
 
     def handler():
         if not is_main_thread():
             raise ValueError("Signal handler must run in main thread")
-        global __is_first_render__
         host_node = parent.find_virtual_widget_parent(include_self=True)
 
         current_condition = node.control_flow.condition()
@@ -215,55 +426,310 @@ def handle_control_flow_switch(parent: ReactiveNode, node: ReactiveNode):
                 current_case = case
                 break
 
-        logger.debug(f"Switch {node.key} current case {current_case}")
+        logger.debug("Switch {} current case {}", node.key, current_case)
         if current_case is None:
-            if __is_first_render__:
-                pass
-            else:
-                remove_widgets_by_length(host_node, node, 1)
-                if node.control_flow.fallback is None:
-                    return
+            render = node.control_flow.fallback
         else:
-            if isinstance(current_case.render, VirtualWidget):
-                qt_widget = create_qt_widget_nested(current_case.render)
-                # if current_case.node is None:
-                #     current_case.node = create_reactive_node(current_case.render, node)
-                #     current_case.node.make_tree_after_this_node()
-                #     current_case.node.for_each_child(commit_work)
-                # else:
-                #     current_case.node.for_each_child(commit_work)
-                # qt_widget = current_case.node.find_virtual_widget_child().qt_widget
-            elif isinstance(current_case.render, Component):
-                qt_widget = create_qt_widget_nested_component(current_case.render)
-                # if current_case.node is None:
-                #     current_case.node = create_reactive_node(current_case.render, node)
-                #     current_case.node.make_tree_after_this_node()
-                #     current_case.node.for_each_child(commit_work)
-                # else:
-                #     current_case.node.for_each_child(commit_work)
-                # qt_widget = current_case.node.find_virtual_widget_child().qt_widget
-            elif isinstance(current_case.render, ControlFlow):
-                raise ValueError("ControlFlow cannot be nested")
-            else:
-                raise ValueError(f"Invalid render {current_case.render}")
-
-            logger.warning(
-                f"Switch {node.key} current case {current_case}, qt_widget {qt_widget}"
-            )
-            print_layout_contents(qt_widget.layout())
-            if __is_first_render__:
-                logger.debug(f"First render, adding {qt_widget} to {host_node.key}")
-                insert_widgets_to_layout(host_node, node, [qt_widget])
+            render = current_case.render
+        if isinstance(render, ControlFlow):
+            raise ValueError("ControlFlow cannot be nested")
+
+        qt_widgets = (
+            [] if render is None else [create_owned_widget(node, owner, lambda: render)]
+        )
+        replace_rendered_widgets(host_node, node, qt_widgets)
+
+    create_effect(handler)
+
+
+def handle_control_flow_suspense(parent: ReactiveNode, node: ReactiveNode):
+    """
+    Build the children off screen, show the fallback while a resource
+    read in them is pending and swap the children in with a single
+    layout update once every resource is ready.
+    """
+    control_flow: Suspense = node.control_flow
+    host_node = parent.find_virtual_widget_parent(include_self=True)
+    owner = get_owner()
+    context = SuspenseContext()
+    mounted = False
+
+    def build_children() -> list[QT_Widget]:
+        return create_owned_widgets(node, owner, control_flow.children)
+
+    content = untrack(lambda: run_with_suspense(context, build_children))
+
+    def destroy_unmounted():
+        # 还没挂载的控件不在任何布局里, 要自己销毁
+        if not mounted:
+            renderer = get_renderer()
+            for widget in content:
+                renderer.destroy_widget(widget)
+
+    on_cleanup(destroy_unmounted)
+
+    def handler():
+        nonlocal mounted
+        if not is_main_thread():
+            raise ValueError("Signal handler must run in main thread")
+        if mounted:
+            return
+
+        if context.ready():
+            logger.debug("Suspense {} ready", node.key)
+            mounted = True
+            replace_rendered_widgets(host_node, node, content)
+        elif not node.rendered_widgets and control_flow.fallback is not None:
+            fallback = create_owned_widget(node, owner, lambda: control_flow.fallback)
+            replace_rendered_widgets(host_node, node, [fallback])
+
+    create_effect(handler)
+
+
+def handle_control_flow_portal(parent: ReactiveNode, node: ReactiveNode):
+    """
+    Build the children once and append them to the Portal's target host,
+    when the target changes the same widgets are moved to the new host.
+    """
+    control_flow: Portal = node.control_flow
+    owner = get_owner()
+    renderer = get_renderer()
+    widgets = create_owned_widgets(node, owner, control_flow.children)
+    current_host: QT_Widget | None = None
+
+    def handler():
+        nonlocal current_host
+        if not is_main_thread():
+            raise ValueError("Signal handler must run in main thread")
+
+        target = control_flow.target()
+        if target is current_host:
+            return
+        logger.debug("Portal {} moving to {}", node.key, target)
+        for widget in widgets:
+            if current_host is not None:
+                renderer.detach_widget(current_host, widget)
+            if target is not None:
+                renderer.append_widget(target, widget)
+        current_host = target
+
+    create_effect(handler)
+
+    def unmount():
+        for widget in widgets:
+            if current_host is not None:
+                renderer.remove_widget(current_host, widget)
             else:
-                remove_widgets_by_length(host_node, node, 1)
-                insert_widgets_to_layout(host_node, node, [qt_widget])
+                renderer.destroy_widget(widget)
+
+    on_cleanup(unmount)
+
+
+def handle_control_flow_dynamic(parent: ReactiveNode, node: ReactiveNode):
+    """
+    With cache, every chosen Component class is built once, switching detaches
+    the current widget and inserts the cached one.
+    """
+    control_flow: Dynamic = node.control_flow
+    host_node = parent.find_virtual_widget_parent(include_self=True)
+    owner = get_owner()
+    renderer = get_renderer()
+    cache: dict[Any, QT_Widget | None] = {}
+
+    def build(choice) -> QT_Widget | None:
+        if choice is None:
+            if control_flow.fallback is None:
+                return None
+            return create_owned_widget(node, owner, lambda: control_flow.fallback)
+        if isinstance(choice, type):
+            return create_owned_widget(node, owner, lambda: choice(**control_flow.props))
+        if isinstance(choice, ControlFlow):
+            raise ValueError("ControlFlow cannot be nested")
+        return create_owned_widget(node, owner, lambda: choice)
+
+    def handler():
+        if not is_main_thread():
+            raise ValueError("Signal handler must run in main thread")
+
+        choice = control_flow.component()
+        logger.debug("Dynamic {} choice {}", node.key, choice)
+        # 只缓存 class 和 None, 每次返回的新实例永远不会再命中, 缓存了只会一直变大
+        if control_flow.cache and (choice is None or isinstance(choice, type)):
+            if choice not in cache:
+                cache[choice] = build(choice)
+            widget = cache[choice]
+        else:
+            widget = build(choice)
+
+        host = host_node.qt_widget
+        cached = {id(w) for w in cache.values() if w is not None}
+        with renderer.batch(host):
+            # 缓存里的只摘下来, 其他的不会再用到, 直接删除
+            for old in node.rendered_widgets:
+                if id(old) not in cached:
+                    renderer.remove_widget(host, old)
+                    node.dispose_widget(old)
+            node.rendered_widgets = [w for w in node.rendered_widgets if id(w) in cached]
+            swap_rendered_widgets(host_node, node, [] if widget is None else [widget])
+
+    create_effect(handler)
+
+    def destroy_detached():
+        # 挂载中的控件跟着宿主一起删除, 缓存里的要自己销毁
+        for widget in cache.values():
+            if widget is not None and widget not in node.rendered_widgets:
+                renderer.destroy_widget(widget)
+
+    on_cleanup(destroy_detached)
+
+
+def handle_control_flow_router(parent: ReactiveNode, node: ReactiveNode):
+    """
+    The screen of a route is found with one dict lookup and built on its first visit,
+    or before that by prefetch, one screen per idle event loop turn.
+    """
+    control_flow: Router = node.control_flow
+    host_node = parent.find_virtual_widget_parent(include_self=True)
+    owner = get_owner()
+    renderer = get_renderer()
+    # route -> screen
+    screens: dict[Any, QT_Widget | None] = {}
+    # 等着空闲时创建的 route
+    pending: list = []
+    state = {"scheduled": False, "disposed": False}
+
+    def build(route) -> QT_Widget | None:
+        if route is _NOT_FOUND:
+            if control_flow.fallback is None:
+                return None
+            return create_owned_widget(node, owner, lambda: control_flow.fallback)
+        return create_owned_widget(node, owner, control_flow.routes[route])
+
+    def screen(route) -> QT_Widget | None:
+        if route not in control_flow.routes:
+            route = _NOT_FOUND
+        if route not in screens:
+            screens[route] = build(route)
+        return screens[route]
+
+    def prefetch_next():
+        state["scheduled"] = False
+        if state["disposed"]:
+            return
+        while pending:
+            route = pending.pop(0)
+            if route in screens:
+                continue
+            logger.debug("Router {} prefetch {}", node.key, route)
+            try:
+                screens[route] = build(route)
+            except Exception as e:
+                # 真正访问时会再创建一次, 那时候的错误交给 ErrorBoundary
+                logger.warning("Router {} failed to prefetch {}: {}", node.key, route, e)
+            break
+        schedule_prefetch()
+
+    def schedule_prefetch():
+        if pending and not state["scheduled"]:
+            state["scheduled"] = True
+            renderer.call_when_idle(prefetch_next)
+
+    def handler():
+        if not is_main_thread():
+            raise ValueError("Signal handler must run in main thread")
+
+        route = control_flow.route()
+        logger.debug("Router {} route {}", node.key, route)
+        if not control_flow.cache:
+            widget = build(route if route in control_flow.routes else _NOT_FOUND)
+            replace_rendered_widgets(host_node, node, [] if widget is None else [widget])
+            return
+
+        widget = screen(route)
+        swap_rendered_widgets(host_node, node, [] if widget is None else [widget])
+
+        likely = control_flow.prefetch
+        if callable(likely):
+            likely = untrack(lambda: control_flow.prefetch(route))
+        pending[:] = [
+            r for r in likely or () if r in control_flow.routes and r not in screens
+        ]
+        schedule_prefetch()
 
     create_effect(handler)
 
+    def destroy_detached():
+        state["disposed"] = True
+        for widget in screens.values():
+            if widget is not None and widget not in node.rendered_widgets:
+                renderer.destroy_widget(widget)
+
+    on_cleanup(destroy_detached)
+
+
+def handle_control_flow_error_boundary(parent: ReactiveNode, node: ReactiveNode):
+    """
+    Build the children under an Owner with an error handler, an exception while
+    building them or in any effect created under them replaces the children
+    with the fallback. Widgets outside the boundary are not touched.
+    """
+    control_flow: ErrorBoundary = node.control_flow
+    host_node = parent.find_virtual_widget_parent(include_self=True)
+    owner = get_owner()
+    content_owner: Owner | None = None
+    building = False
+    build_errors: list[Exception] = []
+
+    def on_error(error: Exception):
+        logger.opt(exception=error).error("ErrorBoundary {} caught {!r}", node.key, error)
+        if building:
+            # 建完之后统一处理, 不能在建到一半的时候换成 fallback
+            build_errors.append(error)
+        else:
+            show_fallback(error)
+
+    def show_fallback(error: Exception):
+        if content_owner is not None:
+            content_owner.dispose()
+        fallback = control_flow.fallback
+        if callable(fallback) and not isinstance(fallback, (VirtualWidget, Component)):
+            fallback = fallback(error, reset)
+        widgets = [] if fallback is None else create_owned_widgets(node, owner, [fallback])
+        replace_rendered_widgets(host_node, node, widgets)
+
+    def mount():
+        nonlocal content_owner, building
+        content_owner = Owner(owner, error_handler=on_error)
+        building = True
+        try:
+            widgets = create_owned_widgets(node, content_owner, control_flow.children)
+        except Exception as e:
+            widgets = None
+            build_errors.append(e)
+        finally:
+            building = False
+
+        if build_errors:
+            error = build_errors[0]
+            build_errors.clear()
+            if widgets:
+                discard_widgets(node, widgets)
+            show_fallback(error)
+        else:
+            replace_rendered_widgets(host_node, node, widgets)
+
+    def reset():
+        """
+        Build the children again, for a retry button in the fallback.
+        """
+        untrack(mount)
+
+    untrack(mount)
+
 
 class ReactiveNode(VirtualWidget):
     def __init__(self, *children, **props):
-        logger.debug(f"Creating ReactiveNode props {props}")
+        logger.debug("Creating ReactiveNode props {}", props)
         super().__init__(*children, **props)
         self.component: Component | None = None
         self.control_flow: ControlFlow | None = None
@@ -272,6 +738,16 @@ class ReactiveNode(VirtualWidget):
         self.parent: ReactiveNode | None = None
         self.sibling: ReactiveNode | None = None
         self.prev_sibling: ReactiveNode | None = None
+        # control flow 节点当前挂载在宿主布局里的控件
+        self.rendered_widgets: list[QT_Widget] = []
+        # 每个 rendered_widget 的 Owner, key 是 id(widget)
+        self.owners: dict[int, Owner] = {}
+        # 有 actions 的 For 节点的 EventDelegate
+        self.delegate: EventDelegate | None = None
+        # each 是迭代器的 For 节点挂载时开始读的列表, 由节点持有
+        self.stream: ReactiveList | None = None
+        if diagnostics.__enabled__:
+            diagnostics.track("node", self)
 
     def __repr__(self) -> str:
         return f"""<ReactiveNode key={
@@ -290,6 +766,16 @@ class ReactiveNode(VirtualWidget):
         # return f"<ReactiveNode tag={self.tag} key={self.key} component={self.component} control_flow={self.control_flow} props={self.props}>"
         # return f"<ReactiveNode tag={self.tag} key={self.key} component={self.component} control_flow={self.control_flow}>"
 
+    def dispose_widget(self, widget: QT_Widget):
+        """
+        Release effects, subscriptions and timers of a removed row/case widget.
+        """
+        owner = self.owners.pop(id(widget), None)
+        if owner is not None:
+            owner.dispose()
+        if self.delegate is not None:
+            self.delegate.remove_row(widget)
+
     def find_parent(
         self,
         cb: Callable[[ReactiveNode], bool],
@@ -360,25 +846,20 @@ class ReactiveNode(VirtualWidget):
         )
 
     def reconcile_children(self):
-        nested = []
-
-        children: list[VirtualWidget | Component | ControlFlow] = flatten(self.children)
-        logger.debug(
-            f"Reconciling {self.key} children", [child.key for child in children]
-        )
-        prev_sibling = None
-        for idx, child in enumerate(children):
-            logger.debug(f"Reconciling {self.key} child {child.key}")
-            child_node = create_reactive_node(child, self)
+        if diagnostics.__enabled__:
+            diagnostics.set_owner(diagnostics.owner_of(self) or diagnostics.__owner__)
 
-            if idx == 0:
-                self.child = child_node
-            else:
-                child_node.prev_sibling = prev_sibling
-                prev_sibling.sibling = child_node
+        # children 在 VirtualWidget.__init__ 里已经 normalize 过了
+        nested = [create_reactive_node(child, self) for child in self.children]
+        if not nested:
+            return nested
 
-            prev_sibling = child_node
-            nested.append(child_node)
+        self.child = nested[0]
+        for idx in range(1, len(nested)):
+            prev_sibling = nested[idx - 1]
+            child_node = nested[idx]
+            child_node.prev_sibling = prev_sibling
+            prev_sibling.sibling = child_node
 
         return nested
 
@@ -387,7 +868,7 @@ class ReactiveNode(VirtualWidget):
 
         while len(stack) > 0:
             current_node = stack.pop()
-            logger.debug(f"Reconciling {current_node.key}")
+            logger.debug("Reconciling {}", current_node.key)
             nested_child = current_node.reconcile_children()
             stack.extend(nested_child)
 
@@ -411,8 +892,16 @@ class ReactiveNode(VirtualWidget):
 
     @staticmethod
     def from_component(component: Component, parent: ReactiveNode | None = None):
-        logger.debug(f"Creating ReactiveNode from {component}")
-        result = ReactiveNode(component.render(), **component.props)
+        logger.debug("Creating ReactiveNode from {}", component)
+        if diagnostics.__enabled__:
+            prev_owner = diagnostics.set_owner(type(component).__name__)
+            try:
+                rendered = component.render()
+            finally:
+                diagnostics.set_owner(prev_owner)
+        else:
+            rendered = component.render()
+        result = ReactiveNode(rendered, **component.props)
         result.component = component
         result.parent = parent
 
@@ -420,7 +909,7 @@ class ReactiveNode(VirtualWidget):
 
     @staticmethod
     def from_virtual_widget(virtual_widget: VirtualWidget, parent: ReactiveNode):
-        logger.debug(f"Creating ReactiveNode from {virtual_widget}")
+        logger.debug("Creating ReactiveNode from {}", virtual_widget)
         result = ReactiveNode(
             *virtual_widget.children,
             tag=virtual_widget.tag,
@@ -432,6 +921,19 @@ class ReactiveNode(VirtualWidget):
 
         return result
 
+    @staticmethod
+    def from_static_virtual_widget(virtual_widget: VirtualWidget, parent: ReactiveNode):
+        """
+        Leaf ReactiveNode for a static subtree, its children are not reconciled.
+        """
+        logger.debug("Creating static ReactiveNode from {}", virtual_widget)
+        result = ReactiveNode(tag=virtual_widget.tag, **virtual_widget.props)
+        result.parent = parent
+
+        result.qt_widget = create_qt_widget_static(virtual_widget)
+
+        return result
+
     @staticmethod
     def from_control_flow(control_flow: ControlFlow, parent: ReactiveNode):
         result = ReactiveNode()
@@ -444,7 +946,7 @@ class ReactiveNode(VirtualWidget):
 
 class Component(ABC):
     def __init__(self, **props):
-        self.key = props.get("key", str(uuid4()))
+        self.key = props.get("key") or gen_key()
         self.props = props
 
     def __repr__(self) -> str:
@@ -459,9 +961,9 @@ class Component(ABC):
 
 
 class ControlFlow(ABC):
-    def __init__(self, *, type, key=str(uuid4())):
+    def __init__(self, *, type, key=None):
         self.type = type
-        self.key = key
+        self.key = key if key is not None else gen_key()
 
     def __repr__(self) -> str:
         return f"<ControlFlow[{self.__class__.__name__}] key={self.key}>"
@@ -475,11 +977,27 @@ def commit_work(node: ReactiveNode, deepth: int):
     if host_node is None:
         return
 
+    if diagnostics.__enabled__:
+        diagnostics.set_owner(diagnostics.owner_of(node) or diagnostics.__owner__)
+
     if is_control_flow_node(node):
         if isinstance(node.control_flow, For):
-            handle_control_flow_for(host_node, node)
+            if node.control_flow.streamed or isinstance(node.control_flow.each, ReactiveList):
+                handle_control_flow_for_list(host_node, node)
+            else:
+                handle_control_flow_for(host_node, node)
         elif isinstance(node.control_flow, Switch):
             handle_control_flow_switch(host_node, node)
+        elif isinstance(node.control_flow, Suspense):
+            handle_control_flow_suspense(host_node, node)
+        elif isinstance(node.control_flow, Portal):
+            handle_control_flow_portal(host_node, node)
+        elif isinstance(node.control_flow, ErrorBoundary):
+            handle_control_flow_error_boundary(host_node, node)
+        elif isinstance(node.control_flow, Dynamic):
+            handle_control_flow_dynamic(host_node, node)
+        elif isinstance(node.control_flow, Router):
+            handle_control_flow_router(host_node, node)
         else:
             raise ValueError(f"Invalid control flow {node.control_flow}")
     else:
@@ -487,8 +1005,8 @@ def commit_work(node: ReactiveNode, deepth: int):
         if add_node is None:
             return
 
-        logger.debug(f"Adding {add_node.qt_widget} to {host_node.key}")
-        host_node.qt_widget.layout().addWidget(add_node.qt_widget)
+        logger.debug("Adding {} to {}", add_node.qt_widget, host_node.key)
+        get_renderer().append_widget(host_node.qt_widget, add_node.qt_widget)
 
 
 def render(container: QT_Widget, component: Component):
@@ -502,9 +1020,9 @@ def render(container: QT_Widget, component: Component):
         root_node.for_each_child(commit_work)
 
         first_hold = root_node.find_virtual_widget_child()
-        container.layout().addWidget(first_hold.qt_widget)
+        get_renderer().append_widget(container, first_hold.qt_widget)
 
-        print_layout_contents(container.layout())
+        print_widget_tree(container)
 
     commit_root()
     global __is_first_render__
@@ -519,6 +1037,8 @@ class MainWindow:
         title="ReactPyQt",
         geometry=None,
     ):
+        from .qt.QtWidgets import QVBoxLayout, QMainWindow, QApplication, QWidget
+
         global __app__
         if __app__ is None:
             __app__ = QApplication(sys.argv)
@@ -539,10 +1059,14 @@ class MainWindow:
         render(self.root, app)
 
     def handle_quit(self):
+        from .qt.QtCore import QThreadPool
+        from .persist import close_stores
+
         global __intervals__
-        for interval in __intervals__:
+        for interval in list(__intervals__):
             interval.stop()
         QThreadPool.globalInstance().clear()
+        close_stores()
 
     def start(self):
         global __app__
@@ -584,27 +1108,273 @@ class ScrollArea(VirtualWidget):
         super().__init__(tag="scrollarea", *children, **props)
 
 
+class Table(VirtualWidget):
+    """
+    Rows are rendered by a QTableView, columns is a list of (title, value_fn).
+    """
+
+    def __init__(self, *, rows, columns, **props):
+        super().__init__(tag="table", rows=rows, columns=columns, **props)
+
+
+class ListView(VirtualWidget):
+    def __init__(self, *, items, **props):
+        super().__init__(tag="listview", items=items, **props)
+
+
+class Canvas(VirtualWidget):
+    """
+    Draws shapes, a list, accessor or ReactiveList of reactpyqt.canvas primitives,
+    over static, primitives cached as a pixmap. See reactpyqt/canvas.py.
+    """
+
+    def __init__(self, *, shapes, static=None, **props):
+        super().__init__(tag="canvas", shapes=shapes, static=static, **props)
+
+
 class For(ControlFlow):
+    """
+    actions maps names to action(item, idx, *args), rows use the names as handlers
+    (on_click="remove") instead of a closure per row, see delegate.py.
+
+    each may also be an iterator or async iterator, its items are appended
+    chunk_size at a time while they arrive, keeping the last max_rows, see stream.py.
+    It is read from when the For is mounted and stops when the For is removed.
+    """
+
     def __init__(
         self,
         *,
-        key=str(uuid4()),
-        each: list,
+        key=None,
+        each: SignalAccessor | ReactiveList | Iterator | AsyncIterator,
         map_fn: Callable | None = None,
         fallback: Component | VirtualWidget | None = None,
+        actions: dict[str, Callable] | None = None,
+        chunk_size=100,
+        max_rows: int | None = None,
     ):
         super().__init__(type="for", key=key)
+        # 挂载时才开始读, 见 handle_control_flow_for_list
+        self.streamed = not callable(each) and (
+            hasattr(each, "__next__") or hasattr(each, "__aiter__")
+        )
         self.map_fn = map_fn
         self.each = each
         self.fallback = fallback
-        self.accessor = create_memo(map_list(self.each, self.map_fn))
+        self.actions = actions
+        self.chunk_size = chunk_size
+        self.max_rows = max_rows
+
+
+class TreeRow(NamedTuple):
+    node: Any
+    key: Any
+    depth: int
+
+
+class Tree(For):
+    """
+    A For over the visible nodes of a hierarchy, children are loaded on expand.
+
+        tree = Tree(
+            roots=[root_dir],
+            load_children=lambda path: sorted(path.iterdir()),
+            has_children=lambda path: path.is_dir(),
+            render=lambda path, depth: HBox(
+                Button(lambda: "-" if tree.is_expanded(path) else "+", on_click="toggle"),
+                Label(path.name),
+                margin=(depth * 16, 0, 0, 0),
+            ),
+        )
+
+    The expanded keys are a signal (expanded, set_expanded), expand/collapse/toggle
+    change it. load_children(node) runs when a branch is expanded, in the thread pool
+    with background=True. Collapsing removes and disposes the rows of the branch,
+    expanded descendants are expanded again with it.
+    The "toggle" action is available to rows, see For actions.
+    """
+
+    def __init__(
+        self,
+        *,
+        key=None,
+        roots: list | SignalAccessor,
+        load_children: Callable[[Any], list],
+        render: Callable[[Any, int], VirtualWidget | Component],
+        has_children: Callable[[Any], bool] | None = None,
+        node_key: Callable[[Any], Any] | None = None,
+        expanded=(),
+        background=False,
+        fallback: Component | VirtualWidget | None = None,
+        actions: dict[str, Callable] | None = None,
+    ):
+        self.rows = ReactiveList()
+        super().__init__(
+            key=key,
+            each=self.rows,
+            map_fn=lambda row, idx: render(row.node, row.depth),
+            fallback=fallback,
+            actions={"toggle": lambda row, idx: self.toggle(row.node), **(actions or {})},
+        )
+        self.load_children = load_children
+        self.has_children = has_children or (lambda node: True)
+        self.node_key = node_key or (lambda node: node)
+        self.background = background
+
+        expanded_signal = Signal(frozenset(expanded))
+        self.expanded, self.set_expanded = expanded_signal.get, expanded_signal.set
+        self._loading = Signal(frozenset())
+        self.is_expanded = self._selector(self.expanded)
+        self.is_loading = self._selector(self._loading.get)
+
+        # 当前可见的行, key -> TreeRow
+        self._visible: dict[Any, TreeRow] = {}
+        # key -> 在 rows 里的位置, _indexed 之前的行是准确的, 之后的用到时再编号
+        self._indices: dict[Any, int] = {}
+        self._indexed = 0
+        self.rows.subscribe_patch(self._handle_rows_patch)
+        # 子节点已经插入到 rows 里的 key
+        self._open: set = set()
+        self._applied: frozenset = frozenset()
+        # background 加载中的 task, key -> Task
+        self._tasks: dict = {}
+
+        if callable(roots):
+            create_effect(lambda: self._track_roots(roots))
+        else:
+            self._reset(roots)
+        create_effect(self._apply_expanded)
+
+    def _selector(self, source: SignalAccessor) -> Callable[[Any], bool]:
+        is_in = create_selector(source, lambda key, keys: key in keys)
+        return lambda node: is_in(self.node_key(node))
+
+    def expand(self, node):
+        if self.has_children(node):
+            self.set_expanded(lambda keys: keys | {self.node_key(node)})
+
+    def collapse(self, node):
+        self.set_expanded(lambda keys: keys - {self.node_key(node)})
+
+    def toggle(self, node):
+        if self.node_key(node) in untrack(self.expanded):
+            self.collapse(node)
+        else:
+            self.expand(node)
+
+    def _row(self, node, depth: int) -> TreeRow:
+        row = TreeRow(node, self.node_key(node), depth)
+        self._visible[row.key] = row
+        return row
+
+    def _track_roots(self, roots: SignalAccessor):
+        nodes = roots()
+        untrack(lambda: self._reset(nodes))
+
+    def _reset(self, roots: list):
+        self._visible.clear()
+        self._open.clear()
+        self.rows.set([self._row(node, 0) for node in roots])
+        # 已经展开的分支按新的 roots 重新展开
+        for row in list(self.rows.get()):
+            if row.key in self._applied:
+                self._expand(row.key)
+
+    def _apply_expanded(self):
+        keys = self.expanded()
+        prev, self._applied = self._applied, keys
+        untrack(lambda: self._apply_changes(prev, keys))
+
+    def _apply_changes(self, prev: frozenset, keys: frozenset):
+        for key in prev - keys:
+            self._collapse(key)
+        for key in keys - prev:
+            self._expand(key)
+
+    def _handle_rows_patch(self, patch: tuple):
+        op = patch[0]
+        if op == "reset":
+            self._indices.clear()
+            self._indexed = 0
+        else:
+            # 这个位置之后的行号可能都变了
+            first = min(patch[1], patch[2]) if op == "move" else patch[1]
+            self._indexed = min(self._indexed, first)
+
+    def _index_of(self, key) -> int:
+        rows = self.rows.get()
+        index = self._indices.get(key)
+        if index is not None and index < len(rows) and rows[index].key == key:
+            return index
+        # 从上次编号到的位置往后找, 刚插入的子节点就在附近, 依次展开时不用每次从头找
+        while self._indexed < len(rows):
+            row_key = rows[self._indexed].key
+            self._indices[row_key] = self._indexed
+            self._indexed += 1
+            if row_key == key:
+                return self._indexed - 1
+        return -1
+
+    def _expand(self, key):
+        row = self._visible.get(key)
+        # 不可见的分支等它的父节点展开时再展开
+        if row is None or key in self._open or not self.has_children(row.node):
+            return
+        if not self.background:
+            self._insert_children(row, self.load_children(row.node))
+            return
+        if key in untrack(self._loading.get):
+            return
+
+        from .timer import run_in_thread
+
+        def done(children, error):
+            self._loading.set(lambda keys: keys - {key})
+            self._tasks.pop(key, None)
+            if error is not None:
+                logger.error(
+                    "Tree {} failed to load children of {}: {}", self.key, key, error
+                )
+            # 加载期间可能已经收起或者被移除了
+            elif key in self._applied and self._visible.get(key) is row:
+                self._insert_children(row, children)
+
+        self._loading.set(lambda keys: keys | {key})
+        # 结果到达前 task 不能被回收
+        self._tasks[key] = run_in_thread(lambda: self.load_children(row.node), done)
+
+    def _insert_children(self, row: TreeRow, children: list):
+        if row.key in self._open:
+            return
+        index = self._index_of(row.key)
+        child_rows = [self._row(child, row.depth + 1) for child in children]
+        self._open.add(row.key)
+        self.rows.insert_range(index + 1, child_rows)
+        for child in child_rows:
+            if child.key in self._applied:
+                self._expand(child.key)
+
+    def _collapse(self, key):
+        if key not in self._open:
+            return
+        self._open.discard(key)
+        rows = self.rows.get()
+        index = self._index_of(key)
+        depth = rows[index].depth
+        end = index + 1
+        while end < len(rows) and rows[end].depth > depth:
+            self._visible.pop(rows[end].key, None)
+            self._indices.pop(rows[end].key, None)
+            self._open.discard(rows[end].key)
+            end += 1
+        self.rows.remove_range(index + 1, end)
 
 
 class Switch(ControlFlow):
     def __init__(
         self,
         *,
-        key=str(uuid4()),
+        key=None,
         condition: SignalAccessor,
         cases: list[Case],
         fallback: Component | VirtualWidget | None = None,
@@ -615,11 +1385,139 @@ class Switch(ControlFlow):
         self.fallback = fallback
 
 
+class Suspense(ControlFlow):
+    """
+    Show fallback until every resource read by children is loaded,
+    then show children.
+    """
+
+    def __init__(
+        self,
+        *children: VirtualWidget | Component,
+        key=None,
+        fallback: Component | VirtualWidget | None = None,
+    ):
+        super().__init__(type="suspense", key=key)
+        self.children = normalize_children(children)
+        self.fallback = fallback
+
+
+class Portal(ControlFlow):
+    """
+    Render children into another host (a dock, an overlay, ...) instead of the parent.
+
+    mount is the host widget, a Ref to it or an accessor returning it (or None),
+    when the accessor changes the existing widgets move to the new host.
+    """
+
+    def __init__(
+        self,
+        *children: VirtualWidget | Component,
+        key=None,
+        mount: QT_Widget | Ref | SignalAccessor,
+    ):
+        super().__init__(type="portal", key=key)
+        self.children = normalize_children(children)
+        if isinstance(mount, Ref):
+            self.target: SignalAccessor = lambda: mount.current
+        elif callable(mount):
+            self.target = mount
+        else:
+            self.target = lambda: mount
+
+
+class Dynamic(ControlFlow):
+    """
+    Render what component() returns, a Component class is called with props.
+
+    With cache, a Component class shown before is detached instead of destroyed
+    and comes back with its state and effects when it is chosen again.
+    Instances returned by component() are not cached, they are built every time.
+    """
+
+    def __init__(
+        self,
+        *,
+        key=None,
+        component: SignalAccessor,
+        props: dict | None = None,
+        cache=True,
+        fallback: Component | VirtualWidget | None = None,
+    ):
+        super().__init__(type="dynamic", key=key)
+        self.component = component
+        self.props = props or {}
+        self.cache = cache
+        self.fallback = fallback
+
+
+# Router 里所有没有定义的 route 的 key
+_NOT_FOUND = object()
+
+
+class Router(ControlFlow):
+    """
+    Render routes[route()], routes maps a route to a function returning its screen,
+    e.g. a Component class. Unknown routes render fallback.
+
+    With cache, a screen is built on its first visit and detached instead of
+    destroyed when another route is shown. prefetch is a list of routes, or
+    a function of the current route returning one, whose screens are built
+    ahead of time while the event loop is idle.
+    """
+
+    def __init__(
+        self,
+        *,
+        key=None,
+        route: SignalAccessor,
+        routes: dict[Any, Callable[[], Component | VirtualWidget]],
+        cache=True,
+        prefetch: list | Callable[[Any], list] | None = None,
+        fallback: Component | VirtualWidget | None = None,
+    ):
+        super().__init__(type="router", key=key)
+        self.route = route
+        self.routes = routes
+        self.cache = cache
+        self.prefetch = prefetch
+        self.fallback = fallback
+
+
+class ErrorBoundary(ControlFlow):
+    """
+    Show fallback instead of children when building them, or an effect
+    created under them, raises.
+
+    fallback is a VirtualWidget/Component, or a function
+    fallback(error, reset) returning one, calling reset() builds the children again.
+    """
+
+    def __init__(
+        self,
+        *children: VirtualWidget | Component | ControlFlow,
+        key=None,
+        fallback: (
+            Component
+            | VirtualWidget
+            | Callable[[Exception, Callable[[], None]], Component | VirtualWidget]
+            | None
+        ) = None,
+    ):
+        super().__init__(type="error_boundary", key=key)
+        # control flow 需要一个宿主, 放进一个没有边距的 VBox 里
+        self.children = tuple(
+            VBox(child) if isinstance(child, ControlFlow) else child
+            for child in normalize_children(children)
+        )
+        self.fallback = fallback
+
+
 class Case(ControlFlow):
     def __init__(
         self,
         *,
-        key=str(uuid4()),
+        key=None,
         when: Callable[[Any], bool],
         render: VirtualWidget | Component | ControlFlow,
     ):
@@ -0,0 +1,99 @@
+"""
+Event delegation for For rows.
+
+    For(
+        each=todo,
+        map_fn=lambda item, idx: HBox(Label(item), Button("Delete", on_click="remove")),
+        actions={"remove": lambda item, idx: todo.pop(idx)},
+    )
+
+A string handler names an action of the nearest For that defines it.
+The For connects every such widget to one shared slot, which walks up from
+the sender to its row and calls the action with the row's item and current index.
+Rows only hold their item, not a closure per row, and stay static subtrees.
+"""
+
+from __future__ import annotations
+from typing import Callable, Any
+
+from .reactive import Owner, get_owner, catch_errors
+from .renderer import get_renderer
+from .utils.log import logger
+
+
+class EventDelegate:
+    """
+    The actions of a For and the item of each of its rows.
+    """
+
+    def __init__(
+        self,
+        actions: dict[str, Callable],
+        rows: Callable[[], list],
+        parent: EventDelegate | None = None,
+    ):
+        # 出错时和普通 effect 一样交给 ErrorBoundary
+        self.actions = {name: catch_errors(action) for name, action in actions.items()}
+        self.rows = rows
+        # 外层 For 的 delegate, 自己没有的 action 交给它
+        self.parent = parent
+        # id(row widget) -> item
+        self.items: dict[int, Any] = {}
+        # renderer 需要的共享 slot, 例如 QT_EventDelegate, 第一次用到时才创建
+        self.slot = None
+
+    def __repr__(self) -> str:
+        return f"<EventDelegate actions={list(self.actions)} rows={len(self.items)}>"
+
+    def add_row(self, widget, item):
+        self.items[id(widget)] = item
+
+    def remove_row(self, widget):
+        self.items.pop(id(widget), None)
+
+    def dispatch(self, action: str, sender, *args):
+        """
+        Call action with the item and index of the row sender is in, then args.
+        """
+        delegate = self
+        while action not in delegate.actions:
+            delegate = delegate.parent
+            if delegate is None:
+                raise KeyError(f"No For defines the action {action!r}")
+
+        renderer = get_renderer()
+        row = sender
+        while row is not None and id(row) not in delegate.items:
+            row = renderer.parent_of(row)
+        if row is None:
+            logger.warning("{} is not in a row of {}, {} ignored", sender, delegate, action)
+            return
+
+        rows = delegate.rows()
+        index = next(i for i, widget in enumerate(rows) if widget is row)
+        delegate.actions[action](delegate.items[id(row)], index, *args)
+
+
+def get_delegate() -> EventDelegate | None:
+    """
+    The EventDelegate of the nearest For around the current owner.
+    """
+    owner = get_owner()
+    while owner is not None:
+        if owner.delegate is not None:
+            return owner.delegate
+        owner = owner.parent
+    return None
+
+
+def create_delegate_owner(
+    actions: dict[str, Callable] | None, rows: Callable[[], list]
+) -> tuple[Owner | None, EventDelegate | None]:
+    """
+    Owner for the rows of a For, with a delegate if the For has actions.
+    """
+    owner = get_owner()
+    if not actions:
+        return owner, None
+    delegate = EventDelegate(actions, rows, get_delegate())
+    return Owner(owner, delegate=delegate), delegate
@@ -0,0 +1,166 @@
+"""
+Live object accounting for ReactiveNodes, signals, effects and widgets.
+
+Objects are held by weakrefs, tracking never keeps anything alive.
+
+    from reactpyqt import diagnostics
+
+    diagnostics.enable()  # before render, earlier objects are not counted
+    before = diagnostics.snapshot()
+    ...
+    after = diagnostics.snapshot()
+    print(diagnostics.report(before, after))
+    print(diagnostics.stale_effects())
+"""
+
+from __future__ import annotations
+import sys
+from collections import Counter
+from typing import Any
+from weakref import WeakKeyDictionary
+
+# fmt: off
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from .core import ReactiveNode
+# fmt: on
+
+KINDS = ("node", "signal", "effect", "widget")
+
+__enabled__ = False
+# 当前正在渲染的组件名, 新建的 signal/effect/widget 都记在它名下
+__owner__: str | None = None
+__live__: dict[str, WeakKeyDictionary] = {kind: WeakKeyDictionary() for kind in KINDS}
+
+
+def enable():
+    global __enabled__
+    __enabled__ = True
+
+
+def disable():
+    global __enabled__
+    __enabled__ = False
+    for objects in __live__.values():
+        objects.clear()
+
+
+def is_enabled() -> bool:
+    return __enabled__
+
+
+def track(kind: str, obj):
+    """
+    Count obj while it is alive, callers check __enabled__ first.
+    """
+    __live__[kind][obj] = __owner__ or "?"
+
+
+def set_owner(owner: str | None) -> str | None:
+    """
+    Set the component name new objects are counted under, return the previous one.
+    """
+    global __owner__
+    prev_owner = __owner__
+    __owner__ = owner
+    return prev_owner
+
+
+def owner_of(node: ReactiveNode) -> str | None:
+    """
+    Class name of the nearest component at or above node.
+    """
+    while node is not None:
+        if node.component is not None:
+            return type(node.component).__name__
+        node = node.parent
+    return None
+
+
+def count() -> dict[str, int]:
+    return {kind: len(objects) for kind, objects in __live__.items()}
+
+
+def snapshot() -> Counter:
+    """
+    Live objects counted by (kind, component name).
+    """
+    result = Counter()
+    for kind, objects in __live__.items():
+        for obj, owner in list(objects.items()):
+            if kind == "node":
+                owner = owner_of(obj) or owner
+            result[(kind, owner)] += 1
+    return result
+
+
+def diff(before: Counter, after: Counter) -> list[tuple[str, str, int]]:
+    """
+    (kind, component name, growth) for every count that changed, largest growth first.
+    """
+    changes = []
+    for key in set(before) | set(after):
+        delta = after.get(key, 0) - before.get(key, 0)
+        if delta:
+            changes.append((*key, delta))
+    changes.sort(key=lambda change: (-change[2], change[0], change[1]))
+    return changes
+
+
+def report(before: Counter, after: Counter) -> str:
+    lines = [
+        f"{kind:<8}{owner:<32}{delta:+d}" for kind, owner, delta in diff(before, after)
+    ]
+    return "\n".join(lines) if lines else "no change"
+
+
+def _is_destroyed(obj) -> bool:
+    from .qt import QT_BINDING, is_deleted
+
+    qt_core = sys.modules.get(f"{QT_BINDING}.QtCore")
+    if qt_core is not None and isinstance(obj, qt_core.QObject):
+        return is_deleted(obj)
+    # HeadlessWidget
+    return getattr(obj, "destroyed", None) is True
+
+
+def _closure_targets(fn, depth=0):
+    """
+    Objects an effect reaches through its closure, bound methods and nested closures.
+    """
+    if depth > 3:
+        return
+    target = getattr(fn, "__self__", None)
+    if target is not None:
+        yield target
+        return
+    for cell in getattr(fn, "__closure__", None) or ():
+        try:
+            value = cell.cell_contents
+        except ValueError:
+            # 还没赋值的 cell
+            continue
+        if callable(value) and not isinstance(value, type):
+            yield from _closure_targets(value, depth + 1)
+        else:
+            yield value
+
+
+def stale_effects() -> list[tuple[str, Any]]:
+    """
+    (component name, effect) for live effects that still update a destroyed widget.
+
+    Such effects are kept alive by the signals they subscribed to
+    and are the usual cause of memory growth after a For or Switch rerenders.
+    """
+    result = []
+    for effect, owner in list(__live__["effect"].items()):
+        for target in _closure_targets(effect):
+            try:
+                destroyed = _is_destroyed(target)
+            except ImportError:
+                return result
+            if destroyed:
+                result.append((owner, effect))
+                break
+    return result
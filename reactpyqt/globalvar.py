@@ -1,4 +1,7 @@
+from weakref import WeakSet
+
 __listener__ = None
+__owner__ = None
 __is_first_render__ = True
 __app__ = None
-__intervals__ = []
+__intervals__ = WeakSet()
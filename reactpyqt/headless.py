@@ -0,0 +1,203 @@
+"""
+A pure-Python renderer, component trees render into HeadlessWidgets
+instead of QWidgets, no QApplication is needed.
+
+    from reactpyqt.headless import render_headless
+
+    root = render_headless(App())
+    root.find("add-todo").click()
+    assert root.snapshot() == {...}
+"""
+
+from __future__ import annotations
+from typing import Any
+
+from .reactive import create_effect
+from .renderer import Renderer, get_renderer, set_renderer
+from .delegate import get_delegate
+from . import diagnostics
+
+# fmt: off
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from .core import Component
+# fmt: on
+
+
+def _serialize(value: Any):
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_serialize(item) for item in value]
+    if isinstance(value, dict):
+        return {str(k): _serialize(v) for k, v in value.items()}
+    name = getattr(value, "name", None)
+    if isinstance(name, str):
+        # enum, 例如 Qt.AlignmentFlag
+        return name
+    return f"<{type(value).__name__}>"
+
+
+class HeadlessWidget:
+    """
+    In-memory widget, props holding accessors are kept up to date by effects.
+    """
+
+    def __init__(self, tag: str, props: dict):
+        self.tag = tag
+        self.key: str = props.get("key")
+        self.parent: HeadlessWidget | None = None
+        self.children: list[HeadlessWidget] = []
+        self.values: dict[str, Any] = {}
+        self.handlers: dict[str, Any] = {}
+        # 字符串 handler 是 For 的 action, 由它的 delegate 分发
+        self.delegate = None
+        self.destroyed = False
+        if diagnostics.__enabled__:
+            diagnostics.track("widget", self)
+
+        for name, value in props.items():
+            if name == "key":
+                continue
+            elif name == "ref":
+                value.current = self
+            elif name.startswith("on_"):
+                self.handlers[name] = value
+                if isinstance(value, str):
+                    self.delegate = get_delegate()
+                    if self.delegate is None:
+                        raise ValueError(
+                            f"Action {value!r} used outside of a For with actions"
+                        )
+            elif callable(value):
+                self._bind(name, value)
+            else:
+                self.values[name] = value
+
+    def __repr__(self) -> str:
+        return f"<HeadlessWidget[{self.tag}] key={self.key}>"
+
+    def _bind(self, name: str, accessor):
+        def handler():
+            if not self.destroyed:
+                self.values[name] = accessor()
+
+        create_effect(handler)
+
+    @property
+    def text(self):
+        return self.values.get("text")
+
+    def _call(self, name: str, *args):
+        handler = self.handlers.get(name)
+        if isinstance(handler, str):
+            self.delegate.dispatch(handler, self, *args)
+        elif handler:
+            handler(*args)
+
+    def click(self):
+        self._call("on_click")
+
+    def edit(self, text: str):
+        self.values["text"] = text
+        self._call("on_edit", text)
+
+    def walk(self):
+        stack = [self]
+        while stack:
+            current = stack.pop()
+            yield current
+            stack.extend(reversed(current.children))
+
+    def find(self, key: str) -> HeadlessWidget | None:
+        for widget in self.walk():
+            if widget.key == key:
+                return widget
+        return None
+
+    def find_all(self, tag: str) -> list[HeadlessWidget]:
+        return [widget for widget in self.walk() if widget.tag == tag]
+
+    def snapshot(self, *, keys=False) -> dict:
+        """
+        Serializable (json) representation of this subtree.
+
+        Keys are left out by default because generated keys are random.
+        """
+        result: dict[str, Any] = {"tag": self.tag}
+        if keys:
+            result["key"] = self.key
+        if self.values:
+            result["props"] = {
+                name: _serialize(value) for name, value in sorted(self.values.items())
+            }
+        if self.children:
+            result["children"] = [child.snapshot(keys=keys) for child in self.children]
+        return result
+
+
+class HeadlessRenderer(Renderer):
+    def create_widget(self, tag: str, props: dict) -> HeadlessWidget:
+        return HeadlessWidget(tag, props)
+
+    def widget_key(self, widget: HeadlessWidget) -> str:
+        return widget.key
+
+    def child_count(self, host: HeadlessWidget) -> int:
+        return len(host.children)
+
+    def child_at(self, host: HeadlessWidget, index: int):
+        if 0 <= index < len(host.children):
+            return host.children[index]
+        return None
+
+    def index_of(self, host: HeadlessWidget, widget: HeadlessWidget) -> int:
+        for index, child in enumerate(host.children):
+            if child is widget:
+                return index
+        return -1
+
+    def parent_of(self, widget: HeadlessWidget) -> HeadlessWidget | None:
+        return widget.parent
+
+    def insert_widget(self, host: HeadlessWidget, index: int, widget: HeadlessWidget):
+        if widget.parent is not None:
+            self.take_widget(widget.parent, widget)
+        host.children.insert(index, widget)
+        widget.parent = host
+
+    def take_widget(self, host: HeadlessWidget, widget: HeadlessWidget):
+        index = self.index_of(host, widget)
+        if index >= 0:
+            del host.children[index]
+        widget.parent = None
+
+    def destroy_widget(self, widget: HeadlessWidget):
+        for child in widget.walk():
+            child.destroyed = True
+
+
+def use_headless() -> HeadlessRenderer:
+    """
+    Make the headless renderer the current renderer, return it.
+    """
+    renderer = get_renderer()
+    if not isinstance(renderer, HeadlessRenderer):
+        renderer = HeadlessRenderer()
+        set_renderer(renderer)
+    return renderer
+
+
+def render_headless(component: Component) -> HeadlessWidget:
+    """
+    Render component into a headless root container and return the container.
+
+    The headless renderer stays the current renderer, so later signal updates
+    keep patching the same HeadlessWidget tree.
+    """
+    from .core import render
+
+    renderer = use_headless()
+    root = renderer.create_widget("root", {"key": "root"})
+    render(root, component)
+    return root
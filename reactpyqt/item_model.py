@@ -0,0 +1,127 @@
+from __future__ import annotations
+import operator
+from typing import Callable, Any
+from .qt.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+from .reactive import create_effect, on_cleanup, SignalAccessor, ReactiveList
+from .utils.log import logger
+
+Column = tuple[str, Callable[[Any], Any]]
+
+
+class ReactiveTableModel(QAbstractTableModel):
+    """
+    A QAbstractTableModel over a reactive list of rows.
+
+    A ReactiveList maps its patches to beginInsertRows / beginRemoveRows /
+    beginMoveRows / dataChanged and applies them to the model's own copy.
+    A plain signal is compared with the previous list by identity and turned into
+    the smallest insert / remove / dataChanged range, prefer a ReactiveList for large tables.
+    Views only ask for the visible rows, so no widget is created per cell.
+    """
+
+    def __init__(self, rows: SignalAccessor | ReactiveList, columns: list[Column]):
+        super().__init__()
+        self.columns = columns
+        self._rows: list = []
+
+        # 自己的一份拷贝, 只在 begin*/end* 之间修改, 否则 view 会读到还没通知的行
+        if isinstance(rows, ReactiveList):
+            self._rows = list(rows.get())
+            rows.subscribe_patch(self.apply_patch)
+            # 否则 list 一直持有 model, 控件删除后也不会释放
+            on_cleanup(lambda: rows.unsubscribe_patch(self.apply_patch))
+        elif not callable(rows):
+            self._rows = list(rows)
+        else:
+            create_effect(lambda: self.apply_rows(rows()))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        _, value_fn = self.columns[index.column()]
+        return str(value_fn(self._rows[index.row()]))
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.columns[section][0]
+        return str(section + 1)
+
+    def row_at(self, index: QModelIndex):
+        return self._rows[index.row()]
+
+    def _rows_changed(self, first: int, last: int):
+        self.dataChanged.emit(
+            self.index(first, 0),
+            self.index(last, len(self.columns) - 1),
+        )
+
+    def apply_patch(self, patch: tuple):
+        logger.debug("ReactiveTableModel patch {}", patch[0])
+        op = patch[0]
+        rows = self._rows
+        if op == "insert":
+            _, index, item = patch
+            self.beginInsertRows(QModelIndex(), index, index)
+            rows.insert(index, item)
+            self.endInsertRows()
+        elif op == "insert_range":
+            _, index, items = patch
+            self.beginInsertRows(QModelIndex(), index, index + len(items) - 1)
+            rows[index:index] = items
+            self.endInsertRows()
+        elif op == "remove":
+            index = patch[1]
+            self.beginRemoveRows(QModelIndex(), index, index)
+            del rows[index]
+            self.endRemoveRows()
+        elif op == "remove_range":
+            _, start, stop = patch
+            self.beginRemoveRows(QModelIndex(), start, stop - 1)
+            del rows[start:stop]
+            self.endRemoveRows()
+        elif op == "move":
+            _, from_index, to_index = patch
+            # beginMoveRows 的目标位置是移动前的行号
+            dest = to_index + 1 if to_index > from_index else to_index
+            self.beginMoveRows(QModelIndex(), from_index, from_index, QModelIndex(), dest)
+            rows.insert(to_index, rows.pop(from_index))
+            self.endMoveRows()
+        elif op == "replace":
+            _, index, item = patch
+            rows[index] = item
+            self._rows_changed(index, index)
+        elif op == "reset":
+            self.beginResetModel()
+            self._rows = list(patch[1])
+            self.endResetModel()
+        else:
+            raise ValueError(f"Invalid list patch {patch}")
+
+    def apply_rows(self, rows: list):
+        model_rows = self._rows
+        prev_len = len(model_rows)
+        # 逐行比较在 C 里做, 只拷贝换掉的那一段, 不每次拷贝整个列表
+        same = list(map(operator.is_, model_rows, rows))
+        if False in same:
+            first = same.index(False)
+            last = len(same) - 1 - same[::-1].index(False)
+            model_rows[first : last + 1] = rows[first : last + 1]
+            self._rows_changed(first, last)
+
+        if len(rows) > prev_len:
+            self.beginInsertRows(QModelIndex(), prev_len, len(rows) - 1)
+            model_rows.extend(rows[prev_len:])
+            self.endInsertRows()
+        elif len(rows) < prev_len:
+            self.beginRemoveRows(QModelIndex(), len(rows), prev_len - 1)
+            del model_rows[len(rows) :]
+            self.endRemoveRows()
@@ -0,0 +1,262 @@
+"""
+Persist signal values between runs.
+
+    from reactpyqt.persist import open_store
+
+    store = open_store("state.rpq")  # before render
+    todo = store.list("todo", [])
+    count, set_count = store.signal("count", 0)
+
+    MainWindow(App()).start()
+
+Values are restored when a signal is registered, so the first frame
+already shows them. Every change is appended to the file right away,
+a ReactiveList only appends its patch. The file is compacted down to one
+record per signal when it is opened, when it grows past COMPACT_RATIO times
+the size it had after the last compaction, and in MainWindow.handle_quit.
+
+File layout: MAGIC, then records of
+    kind (b"v" value | b"p" list patch), name length, payload length, name, pickle
+The file is mmapped and only the records of registered names are unpickled.
+"""
+
+from __future__ import annotations
+import mmap
+import os
+import pickle
+import struct
+from typing import Any
+
+from .reactive import Signal, ReactiveList, SignalAccessor, SignalSetter
+from .utils.log import logger
+
+MAGIC = b"RPQP\x01"
+
+_HEADER = struct.Struct("<cHI")
+_VALUE = b"v"
+_PATCH = b"p"
+
+# 文件超过上次整理后大小的这么多倍时整理, 很小的文件不整理
+COMPACT_RATIO = 4
+COMPACT_MIN_SIZE = 16 * 1024
+
+
+def _apply_patch(items: list, patch: tuple):
+    op = patch[0]
+    if op == "insert":
+        items.insert(patch[1], patch[2])
+    elif op == "insert_range":
+        items[patch[1] : patch[1]] = patch[2]
+    elif op == "remove":
+        del items[patch[1]]
+    elif op == "remove_range":
+        del items[patch[1] : patch[2]]
+    elif op == "move":
+        items.insert(patch[2], items.pop(patch[1]))
+    elif op == "replace":
+        items[patch[1]] = patch[2]
+    else:
+        raise ValueError(f"Invalid list patch {patch}")
+
+
+class PersistStore:
+    """
+    An append-only file of signal values, see the module docstring.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._signals: dict[str, Signal] = {}
+        # name -> 最新 value record 的 (start, end), 以及它之后的 patch records
+        self._records: dict[str, tuple[tuple[int, int], list[tuple[int, int]]]] = {}
+        self._mmap: mmap.mmap | None = None
+        self._file = None
+        # 文件现在的大小, 和上次整理后 (或打开时) 还有用的 record 的大小
+        self._size = 0
+        self._live_size = 0
+        self._open()
+
+    def __repr__(self) -> str:
+        return f"<PersistStore path={self.path} signals={list(self._signals)}>"
+
+    def _open(self):
+        end, live_size = self._load()
+        if end and live_size < os.path.getsize(self.path):
+            # 有被后面的值覆盖的, 或上次写到一半的 record, 打开时整理一次
+            self.compact()
+            return
+
+        self._file = open(self.path, "r+b" if end else "wb")
+        if end:
+            self._file.seek(end)
+        else:
+            self._file.write(MAGIC)
+            self._file.flush()
+            end = live_size = len(MAGIC)
+        self._size = end
+        self._live_size = live_size
+
+    def _load(self) -> tuple[int, int]:
+        """
+        Index the records of the file, return the end of the last complete one
+        and the size the file would have after compaction.
+        """
+        self._records.clear()
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return 0, 0
+
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        data = self._mmap
+        if data[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{self.path} is not a reactpyqt persist file")
+
+        # name -> 最新 value record 和它之后的 patch records 的大小
+        live_sizes: dict[str, int] = {}
+        offset = len(MAGIC)
+        while offset + _HEADER.size <= len(data):
+            kind, name_length, length = _HEADER.unpack_from(data, offset)
+            start = offset + _HEADER.size + name_length
+            end = start + length
+            if end > len(data):
+                logger.warning("Dropping incomplete record at {} in {}", offset, self.path)
+                break
+            name = data[offset + _HEADER.size : start].decode()
+            if kind == _VALUE:
+                self._records[name] = ((start, end), [])
+                live_sizes[name] = end - offset
+            elif name in self._records:
+                self._records[name][1].append((start, end))
+                live_sizes[name] += end - offset
+            offset = end
+        return offset, len(MAGIC) + sum(live_sizes.values())
+
+    def _unpickle(self, start: int, end: int):
+        with memoryview(self._mmap) as view:
+            with view[start:end] as payload:
+                return pickle.loads(payload)
+
+    def _restore(self, name: str) -> tuple[bool, Any]:
+        record = self._records.get(name)
+        if record is None:
+            return False, None
+        value_range, patch_ranges = record
+        value = self._unpickle(*value_range)
+        for patch_range in patch_ranges:
+            _apply_patch(value, self._unpickle(*patch_range))
+        return True, value
+
+    @staticmethod
+    def _write_record(f, kind: bytes, name: str, data: bytes) -> int:
+        name_bytes = name.encode()
+        f.write(_HEADER.pack(kind, len(name_bytes), len(data)))
+        f.write(name_bytes)
+        f.write(data)
+        return _HEADER.size + len(name_bytes) + len(data)
+
+    def _append(self, kind: bytes, name: str, payload):
+        data = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+        self._size += self._write_record(self._file, kind, name, data)
+        self._file.flush()
+        if self._size > max(self._live_size * COMPACT_RATIO, COMPACT_MIN_SIZE):
+            self.compact()
+
+    def register(self, name: str, signal: Signal):
+        """
+        Restore the saved value of name into signal and save every change of it.
+
+        Must be called before the signal is rendered, restoring does not notify.
+        """
+        if name in self._signals:
+            raise ValueError(f"Signal {name} is already persisted")
+        self._signals[name] = signal
+
+        found, value = self._restore(name)
+        if found:
+            signal._value = list(value) if isinstance(signal, ReactiveList) else value
+        else:
+            self._append(_VALUE, name, signal._value)
+
+        if isinstance(signal, ReactiveList):
+
+            def handle_patch(patch: tuple):
+                if patch[0] == "reset":
+                    self._append(_VALUE, name, signal._value)
+                elif patch[0] == "remove":
+                    # 被删掉的 item 不用再存一遍
+                    self._append(_PATCH, name, patch[:2])
+                else:
+                    self._append(_PATCH, name, patch)
+
+            signal.subscribe_patch(handle_patch)
+        else:
+            signal.subscribe(lambda: self._append(_VALUE, name, signal._value))
+
+    def signal(self, name: str, default=None) -> tuple[SignalAccessor, SignalSetter]:
+        """
+        Like create_signal, the value is restored from and saved to the store.
+        """
+        s = Signal(default)
+        self.register(name, s)
+        return (s.get, s.set)
+
+    def list(self, name: str, default=None) -> ReactiveList:
+        """
+        Like create_list, the items are restored from and saved to the store.
+        """
+        items = ReactiveList(default)
+        self.register(name, items)
+        return items
+
+    def compact(self):
+        """
+        Rewrite the file with a single value record per registered name.
+
+        Names that are not registered keep their last value and patch records as they are.
+        """
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            for name, (value_range, patch_ranges) in self._records.items():
+                if name in self._signals:
+                    continue
+                # 没注册的不需要 unpickle, 原样复制
+                self._write_record(f, _VALUE, name, self._mmap[slice(*value_range)])
+                for patch_range in patch_ranges:
+                    self._write_record(f, _PATCH, name, self._mmap[slice(*patch_range)])
+            for name, signal in self._signals.items():
+                data = pickle.dumps(signal._value, protocol=pickle.HIGHEST_PROTOCOL)
+                self._write_record(f, _VALUE, name, data)
+
+        # Windows 上还映射着的文件不能被替换
+        self._close_files()
+        os.replace(tmp_path, self.path)
+        self._open()
+
+    def _close_files(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def close(self):
+        self.compact()
+        self._close_files()
+        if self in __stores__:
+            __stores__.remove(self)
+
+
+__stores__: list[PersistStore] = []
+
+
+def open_store(path: str) -> PersistStore:
+    store = PersistStore(path)
+    __stores__.append(store)
+    return store
+
+
+def close_stores():
+    for store in list(__stores__):
+        store.close()
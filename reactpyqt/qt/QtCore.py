@@ -0,0 +1,9 @@
+from . import QT_API
+
+# fmt: off
+if QT_API == "pyqt6":
+    from PyQt6.QtCore import *  # noqa: F401, F403
+    from PyQt6.QtCore import pyqtSignal as Signal, pyqtSlot as Slot  # noqa: F401
+else:
+    from PySide6.QtCore import *  # noqa: F401, F403
+# fmt: on
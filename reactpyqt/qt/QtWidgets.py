@@ -0,0 +1,8 @@
+from . import QT_API
+
+# fmt: off
+if QT_API == "pyqt6":
+    from PyQt6.QtWidgets import *  # noqa: F401, F403
+else:
+    from PySide6.QtWidgets import *  # noqa: F401, F403
+# fmt: on
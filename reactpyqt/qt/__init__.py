@@ -0,0 +1,53 @@
+"""
+Qt binding selection.
+
+Set REACTPYQT_QT_API to "pyqt6" or "pyside6" to choose the binding,
+otherwise PyQt6 is used when installed and PySide6 as the fallback.
+
+Import Qt classes from the submodules, e.g. `from reactpyqt.qt.QtWidgets import QLabel`.
+They re-export the binding's own classes, so there is no wrapper between
+reactpyqt and Qt at call time. Signal/Slot are the names on both bindings.
+
+Importing this package only selects the binding, it does not import it.
+"""
+
+import os
+from importlib.util import find_spec
+
+_BINDINGS = {
+    "pyqt6": "PyQt6",
+    "pyside6": "PySide6",
+}
+
+
+def _select_api() -> str:
+    api = os.environ.get("REACTPYQT_QT_API", "").lower()
+    if api:
+        if api not in _BINDINGS:
+            raise ImportError(
+                f"Invalid REACTPYQT_QT_API {api}, expected one of {list(_BINDINGS)}"
+            )
+        return api
+
+    for api, module in _BINDINGS.items():
+        if find_spec(module) is not None:
+            return api
+    raise ImportError("reactpyqt requires PyQt6 or PySide6")
+
+
+QT_API = _select_api()
+QT_BINDING = _BINDINGS[QT_API]
+
+
+def is_deleted(obj) -> bool:
+    """
+    Check if the C++ object behind a Qt wrapper has been destroyed.
+    """
+    if QT_API == "pyqt6":
+        from PyQt6 import sip
+
+        return sip.isdeleted(obj)
+
+    import shiboken6
+
+    return not shiboken6.isValid(obj)
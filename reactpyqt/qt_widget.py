@@ -1,6 +1,7 @@
 from __future__ import annotations
+from collections import Counter
 from typing import Callable, Any
-from PyQt6.QtWidgets import (
+from .qt.QtWidgets import (
     QWidget,
     QVBoxLayout,
     QHBoxLayout,
@@ -9,11 +10,29 @@ from PyQt6.QtWidgets import (
     QPushButton,
     QLineEdit,
     QScrollArea,
+    QTableView,
+    QListView,
+    QHeaderView,
+)
+from .qt.QtCore import Qt, QObject, Slot, QPoint, QPointF, QRect, QRectF
+from .qt.QtGui import (
+    QBrush,
+    QColor,
+    QFont,
+    QFontMetrics,
+    QPainter,
+    QPainterPath,
+    QPen,
+    QPixmap,
 )
-from PyQt6.QtCore import Qt
-from loguru import logger
 
-from .reactive import create_effect, SignalAccessor
+from .reactive import create_effect, SignalAccessor, TextBinding
+from .style import apply_qss
+from .item_model import ReactiveTableModel
+from .delegate import EventDelegate, get_delegate
+from .canvas import Rect, Line, Text, Path
+from .utils.log import logger
+from . import diagnostics
 
 
 def _set_with_operation(set_fn: Callable, value: Any, operation: str):
@@ -52,7 +71,7 @@ def apply_widget_props(widget: QWidget, **props):
     for key, value in props.items():
         if key == "qss":
             # widget.setStyleSheet(value)
-            handle_accessor(widget.setStyleSheet, value)
+            handle_accessor(lambda qss: apply_qss(widget, qss), value)
         elif key == "minimum_size":
             # widget.setMinimumSize(*value)
             handle_accessor(widget.setMinimumSize, value, operation="*")
@@ -99,6 +118,44 @@ def create_widget(widget: QT_Widget | str | int):
         raise TypeError(f"Invalid widget: {widget}")
 
 
+class QT_EventDelegate(QObject):
+    """
+    The one slot every delegated button/input of a For is connected to.
+
+    The action name is a property of the sender, the row is found from the sender.
+    """
+
+    def __init__(self, delegate: EventDelegate):
+        super().__init__()
+        self.delegate = delegate
+
+    @Slot()
+    def click(self):
+        sender = self.sender()
+        self.delegate.dispatch(sender.property("reactpyqt_on_click"), sender)
+
+    @Slot(str)
+    def edit(self, text: str):
+        sender = self.sender()
+        self.delegate.dispatch(sender.property("reactpyqt_on_edit"), sender, text)
+
+
+def connect_action(sender: QObject, name: str, action: str):
+    """
+    Connect the signal of handler name (on_click, on_edit) to the current EventDelegate.
+    """
+    delegate = get_delegate()
+    if delegate is None:
+        raise ValueError(f"Action {action!r} used outside of a For with actions")
+    if delegate.slot is None:
+        delegate.slot = QT_EventDelegate(delegate)
+    sender.setProperty(f"reactpyqt_{name}", action)
+    if name == "on_click":
+        sender.clicked.connect(delegate.slot.click)
+    else:
+        sender.textEdited.connect(delegate.slot.edit)
+
+
 class QT_Widget(QWidget):
     """
     A QWidget wrapper.
@@ -106,7 +163,9 @@ class QT_Widget(QWidget):
 
     def __init__(self, **props):
         super().__init__()
-        logger.debug(f"Init QT_Widget with props: {props}")
+        logger.debug("Init QT_Widget with props: {}", props)
+        if diagnostics.__enabled__:
+            diagnostics.track("widget", self)
 
         defult_layout = QVBoxLayout()
         defult_layout.setContentsMargins(0, 0, 0, 0)
@@ -116,10 +175,10 @@ class QT_Widget(QWidget):
         apply_style_props(self, layout, **props)
 
         if props.get("ref", None):
-            logger.debug(f"Setting ref {self} to {props['ref']}")
+            logger.debug("Setting ref {} to {}", self, props["ref"])
             props["ref"].current = self
         if props.get("key", None):
-            logger.debug(f"Setting objectName {props['key']} to {self}")
+            logger.debug("Setting objectName {} to {}", props["key"], self)
             self.setObjectName(props["key"])
             layout.setObjectName(f"{props['key']}_layout")
 
@@ -197,19 +256,24 @@ class QT_Button(QT_Widget):
     ):
         super().__init__(**props)
 
-        if on_click:
+        if on_click and not isinstance(on_click, str):
             self.on_click = on_click
 
         self.button = QPushButton()
 
         # 不知道为什么这里用 handle_accessor 会报错 wrapped C/C++ object has been deleted
         # handle_accessor(self.button.setText, text, operation="str")
-        if callable(text):
+        if isinstance(text, TextBinding):
+            text.bind(self.button.setText)
+        elif callable(text):
             create_effect(lambda: self.button.setText(str(text())))
         else:
             self.button.setText(str(text))
 
-        self.button.clicked.connect(self.on_click)
+        if isinstance(on_click, str):
+            connect_action(self.button, "on_click", on_click)
+        else:
+            self.button.clicked.connect(self.on_click)
         if props.get("key", None):
             self.button.setObjectName(f"{props['key']}_button")
 
@@ -231,7 +295,9 @@ class QT_Label(QT_Widget):
 
         # 不知道为什么这里用 handle_accessor 会报错 wrapped C/C++ object has been deleted
         # handle_accessor(self.label.setText, text, operation="str")
-        if callable(text):
+        if isinstance(text, TextBinding):
+            text.bind(self.label.setText)
+        elif callable(text):
             create_effect(lambda: self.label.setText(str(text())))
         else:
             self.label.setText(str(text))
@@ -247,11 +313,14 @@ class QT_Input(QT_Widget):
         super().__init__(**props)
 
         on_edit = props.get("on_edit", None)
-        if on_edit:
+        if on_edit and not isinstance(on_edit, str):
             self.on_edit = on_edit
 
         self.input = QLineEdit()
-        self.input.textEdited.connect(self.on_edit)
+        if isinstance(on_edit, str):
+            connect_action(self.input, "on_edit", on_edit)
+        else:
+            self.input.textEdited.connect(self.on_edit)
         if props.get("key", None):
             self.input.setObjectName(f"{props['key']}_input")
 
@@ -262,3 +331,378 @@ class QT_Input(QT_Widget):
 
     def text(self):
         return self.input.text()
+
+
+def apply_flat_props(widget: QWidget, **props):
+    """
+    What QT_Widget.__init__ does for its wrapper, applied to a native leaf widget.
+    """
+    if diagnostics.__enabled__:
+        diagnostics.track("widget", widget)
+    apply_widget_props(widget, **props)
+    if "margin" in props:
+        handle_accessor(widget.setContentsMargins, props["margin"], operation="*")
+    if props.get("ref", None):
+        props["ref"].current = widget
+    if props.get("key", None):
+        widget.setObjectName(props["key"])
+
+
+class QT_FlatButton(QPushButton):
+    """
+    Flat rendering of Button, a QPushButton without the QT_Widget wrapper.
+    """
+
+    def __init__(
+        self,
+        *,
+        text,
+        on_click: Callable[[None], None] | None = None,
+        **props,
+    ):
+        super().__init__()
+        # 和 QT_Button 一样可以用 .button 访问
+        self.button = self
+        apply_flat_props(self, **props)
+
+        if isinstance(text, TextBinding):
+            text.bind(self.setText)
+        elif callable(text):
+            create_effect(lambda: self.setText(str(text())))
+        else:
+            self.setText(str(text))
+
+        if isinstance(on_click, str):
+            connect_action(self, "on_click", on_click)
+        elif on_click:
+            self.clicked.connect(on_click)
+
+    def __repr__(self) -> str:
+        return f"<QT_Widget[QT_FlatButton] objectName={self.objectName()}>"
+
+    def reconnect(self, on_click):
+        self.clicked.disconnect()
+        self.clicked.connect(on_click)
+
+
+class QT_FlatLabel(QLabel):
+    """
+    Flat rendering of Label, a QLabel without the QT_Widget wrapper.
+    """
+
+    def __init__(self, *, text, **props):
+        super().__init__()
+        self.label = self
+        apply_flat_props(self, **props)
+        if "alignment" in props:
+            handle_accessor(self.setAlignment, props["alignment"])
+
+        if isinstance(text, TextBinding):
+            text.bind(self.setText)
+        elif callable(text):
+            create_effect(lambda: self.setText(str(text())))
+        else:
+            self.setText(str(text))
+
+    def __repr__(self) -> str:
+        return f"<QT_Widget[QT_FlatLabel] objectName={self.objectName()}>"
+
+
+class QT_FlatInput(QLineEdit):
+    """
+    Flat rendering of Input, a QLineEdit without the QT_Widget wrapper.
+    """
+
+    def __init__(self, **props):
+        super().__init__()
+        self.input = self
+        apply_flat_props(self, **props)
+        if "alignment" in props:
+            handle_accessor(self.setAlignment, props["alignment"])
+
+        on_edit = props.get("on_edit", None)
+        if isinstance(on_edit, str):
+            connect_action(self, "on_edit", on_edit)
+        elif on_edit:
+            self.textEdited.connect(on_edit)
+
+    def __repr__(self) -> str:
+        return f"<QT_Widget[QT_FlatInput] objectName={self.objectName()}>"
+
+
+def _setup_item_view(view, model: ReactiveTableModel, props: dict):
+    view.setModel(model)
+    if props.get("delegate", None):
+        view.setItemDelegate(props["delegate"])
+
+    on_click = props.get("on_click", None)
+    if on_click:
+        view.clicked.connect(lambda index: on_click(model.row_at(index), index.row()))
+
+
+class QT_Table(QT_Widget):
+    """
+    rows 可以是 signal 或 ReactiveList, 由 QTableView 按需绘制可见的行
+    """
+
+    def __init__(self, *, rows, columns, **props):
+        super().__init__(**props)
+
+        self.model = ReactiveTableModel(rows, columns)
+        self.table = QTableView()
+        _setup_item_view(self.table, self.model, props)
+
+        # 固定行高, 不需要为了计算行高去访问每一行的数据
+        vertical_header = self.table.verticalHeader()
+        vertical_header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        if not props.get("row_header", False):
+            vertical_header.hide()
+
+        if props.get("key", None):
+            self.table.setObjectName(f"{props['key']}_table")
+
+        self.layout().addWidget(self.table)
+
+
+class QT_ListView(QT_Widget):
+    def __init__(self, *, items, display: Callable[[Any], Any] = str, **props):
+        super().__init__(**props)
+
+        self.model = ReactiveTableModel(items, [("", display)])
+        self.list_view = QListView()
+        _setup_item_view(self.list_view, self.model, props)
+        self.list_view.setUniformItemSizes(True)
+
+        if props.get("key", None):
+            self.list_view.setObjectName(f"{props['key']}_list_view")
+
+        self.layout().addWidget(self.list_view)
+
+
+class QT_Canvas(QWidget):
+    """
+    Paints the primitives of reactpyqt.canvas, see its docstring.
+
+    Each change repaints only the bounds of the primitives that were added or removed,
+    QPainterPaths and bounds are cached per primitive, static is cached as a QPixmap.
+    """
+
+    # 变化的图元太多时整块重绘, 比合并几百个矩形更快
+    MAX_DIRTY_RECTS = 256
+
+    def __init__(
+        self,
+        *,
+        shapes,
+        static=None,
+        background=None,
+        antialias=True,
+        **props,
+    ):
+        super().__init__()
+        apply_flat_props(self, **props)
+        self.antialias = antialias
+        self.background = QColor(background) if background is not None else None
+        self._shapes: list = []
+        self._static: list = []
+        self._layer: QPixmap | None = None
+        # shape -> QRect, Path 的 shape -> QPainterPath
+        self._bounds: dict = {}
+        self._paths: dict = {}
+        self._colors: dict = {}
+        self._pens: dict = {}
+        self._brushes: dict = {}
+        self._fonts: dict = {}
+
+        if callable(shapes):
+            create_effect(lambda: self.set_shapes(shapes()))
+        else:
+            self.set_shapes(shapes)
+        if callable(static):
+            create_effect(lambda: self.set_static(static()))
+        elif static:
+            self.set_static(static)
+
+    def __repr__(self) -> str:
+        return f"<QT_Widget[QT_Canvas] objectName={self.objectName()}>"
+
+    def set_shapes(self, shapes):
+        prev = self._shapes
+        # ReactiveList 给的是它自己的列表, 要留一份来比较
+        self._shapes = list(shapes)
+        if prev == self._shapes:
+            return
+
+        removed = Counter(prev)
+        removed.subtract(self._shapes)
+        dirty = [shape for shape, n in removed.items() if n != 0]
+        if not dirty:
+            # 只有顺序变了, 重叠部分的上下关系可能变了
+            self._forget_missing()
+            self.update()
+            return
+
+        if len(dirty) > self.MAX_DIRTY_RECTS:
+            self.update()
+        else:
+            for shape in dirty:
+                self.update(self._bounds_of(shape))
+        self._forget_missing()
+
+    def set_static(self, shapes):
+        self._static = list(shapes)
+        self._layer = None
+        self.update()
+
+    def _forget_missing(self):
+        live = set(self._shapes)
+        live.update(self._static)
+        if len(self._bounds) > len(live):
+            self._bounds = {s: r for s, r in self._bounds.items() if s in live}
+            self._paths = {s: p for s, p in self._paths.items() if s in live}
+
+    def _color(self, value) -> QColor:
+        color = self._colors.get(value)
+        if color is None:
+            color = QColor(*value) if isinstance(value, tuple) else QColor(value)
+            self._colors[value] = color
+        return color
+
+    def _font(self, size: int) -> QFont:
+        font = self._fonts.get(size)
+        if font is None:
+            font = QFont(self.font())
+            font.setPixelSize(size)
+            self._fonts[size] = font
+        return font
+
+    def _path_of(self, shape: Path) -> QPainterPath:
+        path = self._paths.get(shape)
+        if path is None:
+            path = QPainterPath()
+            points = shape.points
+            if points:
+                path.moveTo(*points[0])
+                for point in points[1:]:
+                    path.lineTo(*point)
+                if shape.closed:
+                    path.closeSubpath()
+            self._paths[shape] = path
+        return path
+
+    def _bounds_of(self, shape) -> QRect:
+        bounds = self._bounds.get(shape)
+        if bounds is not None:
+            return bounds
+
+        if isinstance(shape, Rect):
+            rect = QRectF(shape.x, shape.y, shape.width, shape.height)
+            pad = shape.stroke_width
+        elif isinstance(shape, Line):
+            rect = QRectF(QPointF(shape.x1, shape.y1), QPointF(shape.x2, shape.y2))
+            rect = rect.normalized()
+            pad = shape.width
+        elif isinstance(shape, Text):
+            size = QFontMetrics(self._font(shape.size)).size(0, shape.text)
+            rect = QRectF(shape.x, shape.y, size.width(), size.height())
+            pad = 1
+        elif isinstance(shape, Path):
+            rect = self._path_of(shape).boundingRect()
+            pad = shape.stroke_width
+        else:
+            raise TypeError(f"Invalid canvas shape {shape}")
+
+        # 描边和抗锯齿会画到外面一点
+        pad = pad / 2 + 2
+        bounds = rect.adjusted(-pad, -pad, pad, pad).toAlignedRect()
+        self._bounds[shape] = bounds
+        return bounds
+
+    def _set_pen(self, painter: QPainter, state: list, color, width):
+        key = (color, width)
+        if state[0] == key:
+            return
+        pen = self._pens.get(key)
+        if pen is None:
+            if color is None:
+                pen = QPen(Qt.PenStyle.NoPen)
+            else:
+                pen = QPen(self._color(color))
+                pen.setWidthF(width)
+            self._pens[key] = pen
+        painter.setPen(pen)
+        state[0] = key
+
+    def _set_brush(self, painter: QPainter, state: list, color):
+        if state[1] == color:
+            return
+        brush = self._brushes.get(color)
+        if brush is None:
+            if color is None:
+                brush = QBrush(Qt.BrushStyle.NoBrush)
+            else:
+                brush = QBrush(self._color(color))
+            self._brushes[color] = brush
+        painter.setBrush(brush)
+        state[1] = color
+
+    def _draw(self, painter: QPainter, shape, state: list):
+        # state 是上一次设置的 (pen, brush), 相同的就不再设置
+        kind = type(shape)
+        if kind is Rect:
+            self._set_pen(painter, state, shape.stroke, shape.stroke_width)
+            self._set_brush(painter, state, shape.fill)
+            painter.drawRect(QRectF(shape.x, shape.y, shape.width, shape.height))
+        elif kind is Line:
+            self._set_pen(painter, state, shape.color, shape.width)
+            painter.drawLine(QPointF(shape.x1, shape.y1), QPointF(shape.x2, shape.y2))
+        elif kind is Text:
+            self._set_pen(painter, state, shape.color, 1)
+            painter.setFont(self._font(shape.size))
+            rect = QRectF(self._bounds_of(shape))
+            painter.drawText(
+                QRectF(shape.x, shape.y, rect.width(), rect.height()),
+                Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop,
+                shape.text,
+            )
+        elif kind is Path:
+            self._set_pen(painter, state, shape.stroke, shape.stroke_width)
+            self._set_brush(painter, state, shape.fill)
+            painter.drawPath(self._path_of(shape))
+
+    def _paint_shapes(self, painter: QPainter, shapes: list, area: QRect | None):
+        if self.antialias:
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        state = [(), ()]
+        if area is None or area.contains(self.rect()):
+            # 整块重绘时不需要逐个判断 bounds
+            for shape in shapes:
+                self._draw(painter, shape, state)
+            return
+        for shape in shapes:
+            if self._bounds_of(shape).intersects(area):
+                self._draw(painter, shape, state)
+
+    def _static_layer(self) -> QPixmap:
+        ratio = self.devicePixelRatioF()
+        if self._layer is None or self._layer.size() != self.size() * ratio:
+            logger.debug("Rendering static layer of {}", self)
+            layer = QPixmap(self.size() * ratio)
+            layer.setDevicePixelRatio(ratio)
+            layer.fill(Qt.GlobalColor.transparent)
+            painter = QPainter(layer)
+            self._paint_shapes(painter, self._static, None)
+            painter.end()
+            self._layer = layer
+        return self._layer
+
+    def paintEvent(self, event):
+        area = event.rect()
+        painter = QPainter(self)
+        if self.background is not None:
+            painter.fillRect(area, self.background)
+        if self._static:
+            # painter 已经裁剪到 area, 只会复制这一块
+            painter.drawPixmap(QPoint(0, 0), self._static_layer())
+        self._paint_shapes(painter, self._shapes, area)
+        painter.end()
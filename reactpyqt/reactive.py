@@ -1,7 +1,9 @@
 from __future__ import annotations
+from string import Formatter
 from typing import Callable, Any
 
-from .globalvar import __listener__
+from .globalvar import __listener__, __owner__
+from . import diagnostics
 
 
 SignalAccessor = Callable[[], Any]
@@ -13,6 +15,8 @@ class Signal:
         super().__init__()
         self._value = init_value
         self._subscribers = set()
+        if diagnostics.__enabled__:
+            diagnostics.track("signal", self)
 
     def __repr__(self) -> str:
         return f"<Signal value={self._value}>"
@@ -20,25 +24,257 @@ class Signal:
     def get(self):
         if __listener__:
             self._subscribers.add(__listener__)
+            if __owner__ is not None:
+                __owner__.subscriptions.append((self, __listener__))
         return self._value
 
     def set(self, next_value):
-        if callable(next_value):
+        # class 也是 callable, 但它是值 (例如 Dynamic 的 Component class), 不是 updater
+        if callable(next_value) and not isinstance(next_value, type):
             self._value = next_value(self._value)
         else:
             if self._value == next_value:
                 return
             self._value = next_value
 
-        for subscriber in self._subscribers:
+        # 复制一份, subscriber 运行时可能会创建新的 effect 订阅这个 signal
+        for subscriber in tuple(self._subscribers):
             subscriber()
 
     def subscribe(self, cb):
         self._subscribers.add(cb)
 
 
+class ReactiveList(Signal):
+    """
+    A list signal with in-place operations.
+
+    Every operation notifies subscribers once and emits a patch,
+    so consumers like For can apply the change at its index
+    instead of copying and comparing the whole list.
+
+    Patches are tuples:
+        ("insert", index, item)
+        ("insert_range", index, items)
+        ("remove", index, item)
+        ("remove_range", start, stop)
+        ("move", from_index, to_index)
+        ("replace", index, item)
+        ("reset", items)
+
+    The list returned by get() is the live list, treat it as read-only.
+    """
+
+    def __init__(self, items=None):
+        super().__init__(list(items) if items is not None else [])
+        self._patch_subscribers = []
+
+    def __repr__(self) -> str:
+        return f"<ReactiveList len={len(self._value)}>"
+
+    def __call__(self):
+        return self.get()
+
+    def __len__(self):
+        return len(self._value)
+
+    def subscribe_patch(self, cb: Callable[[tuple], None]):
+        self._patch_subscribers.append(cb)
+
+    def unsubscribe_patch(self, cb: Callable[[tuple], None]):
+        if cb in self._patch_subscribers:
+            self._patch_subscribers.remove(cb)
+
+    def _notify(self, patch: tuple):
+        for cb in tuple(self._patch_subscribers):
+            cb(patch)
+        for subscriber in tuple(self._subscribers):
+            subscriber()
+
+    def set(self, next_value):
+        if callable(next_value) and not isinstance(next_value, type):
+            next_value = next_value(self._value)
+        self._value = list(next_value)
+        self._notify(("reset", self._value))
+
+    def insert(self, index: int, item):
+        if index < 0:
+            index += len(self._value)
+        index = max(0, min(index, len(self._value)))
+        self._value.insert(index, item)
+        self._notify(("insert", index, item))
+
+    def append(self, item):
+        self.insert(len(self._value), item)
+
+    def insert_range(self, index: int, items):
+        """
+        Insert items before index with a single patch.
+        """
+        items = list(items)
+        if not items:
+            return
+        if index < 0:
+            index += len(self._value)
+        index = max(0, min(index, len(self._value)))
+        self._value[index:index] = items
+        self._notify(("insert_range", index, items))
+
+    def extend(self, items):
+        self.insert_range(len(self._value), items)
+
+    def pop(self, index: int = -1):
+        if index < 0:
+            index += len(self._value)
+        item = self._value.pop(index)
+        self._notify(("remove", index, item))
+        return item
+
+    def remove_range(self, start: int, stop: int):
+        """
+        Remove self[start:stop] with a single patch.
+        """
+        start, stop, _ = slice(start, stop).indices(len(self._value))
+        if start >= stop:
+            return
+        del self._value[start:stop]
+        self._notify(("remove_range", start, stop))
+
+    def move(self, from_index: int, to_index: int):
+        """
+        Move the item at from_index so it ends up at to_index.
+        """
+        length = len(self._value)
+        if from_index < 0:
+            from_index += length
+        if not 0 <= from_index < length:
+            raise IndexError("ReactiveList.move index out of range")
+        # 和 insert 一样, 负数从末尾算, 超出范围的夹到两端
+        if to_index < 0:
+            to_index += length
+        to_index = max(0, min(to_index, length - 1))
+        if from_index == to_index:
+            return
+        self._value.insert(to_index, self._value.pop(from_index))
+        self._notify(("move", from_index, to_index))
+
+    def replace(self, index: int, item):
+        if index < 0:
+            index += len(self._value)
+        self._value[index] = item
+        self._notify(("replace", index, item))
+
+
+class Owner:
+    """
+    Everything a rendered subtree has to release when it is removed:
+    signal subscriptions of its effects, on_cleanup callbacks and child owners.
+
+    Effects created while an owner is current are unsubscribed on dispose,
+    so signals that outlive the subtree no longer hold its widgets.
+    """
+
+    def __init__(
+        self,
+        parent: Owner | None = None,
+        *,
+        error_handler: Callable[[Exception], None] | None = None,
+        delegate: Any = None,
+    ):
+        self.parent = parent
+        self.children: dict[Owner, None] = {}
+        self.cleanups: list[Callable[[], None]] = []
+        self.subscriptions: list[tuple[Signal, Callable]] = []
+        self.disposed = False
+        # ErrorBoundary 设置的, 子孙 owner 下的 effect 出错时交给它处理
+        self.error_handler = error_handler
+        self.handles_errors = error_handler is not None or (
+            parent is not None and parent.handles_errors
+        )
+        # 有 actions 的 For 设置的 EventDelegate, 见 delegate.get_delegate
+        self.delegate = delegate
+        if parent is not None:
+            parent.children[self] = None
+
+    def __repr__(self) -> str:
+        return f"<Owner children={len(self.children)} cleanups={len(self.cleanups)}>"
+
+    def handle_error(self, error: Exception):
+        owner = self
+        while owner is not None:
+            if owner.error_handler is not None:
+                owner.error_handler(error)
+                return
+            owner = owner.parent
+        raise error
+
+    def dispose(self):
+        if self.disposed:
+            return
+        self.disposed = True
+
+        for child in list(self.children):
+            child.dispose()
+        for cb in reversed(self.cleanups):
+            cb()
+        for signal, listener in self.subscriptions:
+            signal._subscribers.discard(listener)
+
+        self.children.clear()
+        self.cleanups.clear()
+        self.subscriptions.clear()
+        if self.parent is not None:
+            self.parent.children.pop(self, None)
+
+
+def get_owner() -> Owner | None:
+    return __owner__
+
+
+def run_with_owner(owner: Owner | None, cb):
+    global __owner__
+    prev_owner = __owner__
+    __owner__ = owner
+    try:
+        return cb()
+    finally:
+        __owner__ = prev_owner
+
+
+def catch_errors(cb: Callable) -> Callable:
+    """
+    Send exceptions raised by cb to the nearest ErrorBoundary of the current owner.
+
+    Without a boundary cb is returned as is.
+    """
+    owner = __owner__
+    if owner is None or not owner.handles_errors:
+        return cb
+
+    def guarded(*args):
+        try:
+            return cb(*args)
+        except Exception as e:
+            owner.handle_error(e)
+
+    return guarded
+
+
+def on_cleanup(cb: Callable[[], None]):
+    """
+    Run cb when the current owner (a For row, a Switch case, ...) is disposed.
+
+    Outside of an owner cb is never called, the subtree lives as long as the app.
+    """
+    if __owner__ is not None:
+        __owner__.cleanups.append(cb)
+
+
 def create_effect(cb):
     global __listener__
+    cb = catch_errors(cb)
+    if diagnostics.__enabled__:
+        diagnostics.track("effect", cb)
     prev_listener = __listener__
     __listener__ = cb
     cb()
@@ -51,12 +287,68 @@ def create_signal(value) -> tuple[SignalAccessor, SignalSetter]:
     return (s.get, s.set)
 
 
+def create_list(items=None) -> ReactiveList:
+    """
+    Create a ReactiveList, it is an accessor itself and can be passed to For.
+    """
+    return ReactiveList(items)
+
+
 def create_memo(cb):
     value, set_value = create_signal(None)
     create_effect(lambda: set_value(cb()))
     return value
 
 
+def create_selector(
+    source: SignalAccessor, fn: Callable[[Any, Any], bool] | None = None
+) -> Callable[[Any], bool]:
+    """
+    Return is_selected(key), True when key == source().
+
+    An effect reading is_selected(key) only reruns when the result for its own key
+    changes, moving the selection of a list reruns two rows instead of all of them.
+    With fn(key, value) instead of ==, every key that has been read is checked.
+    """
+    # key -> 只用来记录订阅者的 signal
+    signals: dict[Any, Signal] = {}
+    current = untrack(source)
+
+    def notify(key):
+        signal = signals.get(key)
+        if signal is None:
+            return
+        if not signal._subscribers:
+            # 读过它的行都已经移除了
+            del signals[key]
+            return
+        for subscriber in tuple(signal._subscribers):
+            subscriber()
+
+    def handler():
+        nonlocal current
+        prev, current = current, source()
+        if fn is None:
+            if prev != current:
+                notify(prev)
+                notify(current)
+        else:
+            for key in [key for key in signals if fn(key, prev) != fn(key, current)]:
+                notify(key)
+
+    create_effect(handler)
+
+    def is_selected(key) -> bool:
+        if __listener__:
+            signal = signals.get(key)
+            if signal is None:
+                signal = signals[key] = Signal(None)
+            signal.get()
+        return key == current if fn is None else fn(key, current)
+
+    return is_selected
+
+
 def untrack(cb):
     global __listener__
     prev_listener = __listener__
@@ -71,10 +363,72 @@ def on_mount(cb):
     create_effect(lambda: untrack(cb))
 
 
-def with_text(template: str, *args: SignalAccessor) -> SignalAccessor:
-    result, set_result = create_signal("")
-    create_effect(lambda: set_result(template.format(*[arg() for arg in args])))
-    return result
+def _compile_template(template: str) -> Callable[..., str]:
+    """
+    template.format, as a %-format when the template only has plain {} fields.
+    """
+    parts = []
+    for literal, field, spec, conversion in Formatter().parse(template):
+        parts.append(literal.replace("%", "%%"))
+        if field is None:
+            continue
+        if field or spec or conversion:
+            return template.format
+        parts.append("%s")
+    fmt = "".join(parts)
+    return lambda *values: fmt % values
+
+
+# 同一个模板在成千上万行里重复使用, 只编译一次
+__templates__: dict[str, Callable[..., str]] = {}
+
+
+class TextBinding:
+    """
+    A compiled text template and the accessors of its fields, see with_text.
+
+    Calling it returns the formatted text like an accessor. Label and Button
+    call bind instead, which writes the text from a single effect.
+    """
+
+    __slots__ = ("format", "args")
+
+    def __init__(self, template: str, args: tuple[SignalAccessor, ...]):
+        format = __templates__.get(template)
+        if format is None:
+            format = __templates__[template] = _compile_template(template)
+        self.format = format
+        self.args = args
+
+    def __repr__(self) -> str:
+        return f"<TextBinding args={len(self.args)}>"
+
+    def __call__(self) -> str:
+        return self.format(*[arg() for arg in self.args])
+
+    def bind(self, set_text: Callable[[str], None]):
+        """
+        Call set_text with the text now and whenever it changes.
+        """
+        format, args = self.format, self.args
+        last = None
+
+        def handler():
+            nonlocal last
+            text = format(*[arg() for arg in args])
+            # 没变的文字不再调用 Qt
+            if text != last:
+                last = text
+                set_text(text)
+
+        create_effect(handler)
+
+
+def with_text(template: str, *args: SignalAccessor) -> TextBinding:
+    """
+    Text of template formatted with the values of args, e.g. with_text("Count {}", count).
+    """
+    return TextBinding(template, args)
 
 
 def map_list(list: SignalAccessor, map_cb: Callable[[Any, int], None]) -> Callable:
@@ -0,0 +1,239 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+# fmt: off
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from .qt_widget import QT_Widget
+# fmt: on
+
+
+class Renderer(ABC):
+    """
+    Everything the reconciler does to widgets goes through a Renderer.
+
+    A host is a widget that holds children (QT_VBox, QT_HBox, ...),
+    its children are kept in order and addressed by index.
+    """
+
+    @abstractmethod
+    def create_widget(self, tag: str, props: dict) -> Any:
+        raise NotImplementedError
+
+    @abstractmethod
+    def widget_key(self, widget) -> str:
+        raise NotImplementedError
+
+    @abstractmethod
+    def child_count(self, host) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def child_at(self, host, index: int):
+        raise NotImplementedError
+
+    @abstractmethod
+    def index_of(self, host, widget) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def parent_of(self, widget):
+        """
+        The widget holding widget, None for a top level widget.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def insert_widget(self, host, index: int, widget):
+        raise NotImplementedError
+
+    @abstractmethod
+    def take_widget(self, host, widget):
+        """
+        Detach widget from host without destroying it.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def destroy_widget(self, widget):
+        raise NotImplementedError
+
+    def append_widget(self, host, widget):
+        self.insert_widget(host, self.child_count(host), widget)
+
+    def detach_widget(self, host, widget):
+        """
+        Take widget out of host to keep it off screen until it is inserted again.
+        """
+        self.take_widget(host, widget)
+
+    def remove_widget(self, host, widget):
+        self.take_widget(host, widget)
+        self.destroy_widget(widget)
+
+    @contextmanager
+    def batch(self, host) -> Iterator[None]:
+        """
+        Group the changes to the children of host, e.g. a whole For patch,
+        so they are laid out and painted once. Batches can be nested.
+        """
+        yield
+
+    def call_when_idle(self, callback: Callable[[], None]):
+        """
+        Run callback once the pending events are handled, e.g. to prebuild widgets
+        that are likely needed next. Runs it right away by default.
+        """
+        callback()
+
+
+class QtRenderer(Renderer):
+    """
+    With flat, Button/Label/Input are rendered as the native QPushButton/QLabel/QLineEdit
+    instead of a QT_Widget (a QWidget and a layout) holding one,
+    a third of the Qt objects per leaf.
+    """
+
+    def __init__(self, *, flat=False):
+        self.flat = flat
+        # id(host) -> 嵌套的 batch 层数
+        self._batches: dict[int, int] = {}
+
+    def widget_class(self, tag: str) -> type[QT_Widget]:
+        from .qt_widget import (
+            QT_HBox,
+            QT_VBox,
+            QT_Button,
+            QT_Label,
+            QT_Input,
+            QT_ScrollArea,
+            QT_Table,
+            QT_ListView,
+            QT_FlatButton,
+            QT_FlatLabel,
+            QT_FlatInput,
+            QT_Canvas,
+        )
+
+        if tag == "button":
+            return QT_FlatButton if self.flat else QT_Button
+        elif tag == "label":
+            return QT_FlatLabel if self.flat else QT_Label
+        elif tag == "input":
+            return QT_FlatInput if self.flat else QT_Input
+        elif tag == "vbox":
+            return QT_VBox
+        elif tag == "hbox":
+            return QT_HBox
+        elif tag == "scrollarea":
+            return QT_ScrollArea
+        elif tag == "table":
+            return QT_Table
+        elif tag == "listview":
+            return QT_ListView
+        elif tag == "canvas":
+            return QT_Canvas
+        else:
+            raise ValueError(f"Invalid tag: {tag}")
+
+    def create_widget(self, tag: str, props: dict) -> QT_Widget:
+        return self.widget_class(tag)(**props)
+
+    def widget_key(self, widget) -> str:
+        return widget.objectName()
+
+    def child_count(self, host) -> int:
+        # flat 模式下的叶子控件没有 layout
+        layout = host.layout()
+        return layout.count() if layout is not None else 0
+
+    def child_at(self, host, index: int):
+        item = host.layout().itemAt(index)
+        return item.widget() if item else None
+
+    def index_of(self, host, widget) -> int:
+        return host.layout().indexOf(widget)
+
+    def parent_of(self, widget):
+        return widget.parentWidget()
+
+    def insert_widget(self, host, index: int, widget):
+        layout = host.layout()
+        if not hasattr(layout, "insertWidget"):
+            raise ValueError(
+                f"Layout {type(layout).__name__} does not support inserting widgets"
+            )
+        layout.insertWidget(index, widget)
+
+    def append_widget(self, host, widget):
+        host.layout().addWidget(widget)
+
+    def take_widget(self, host, widget):
+        host.layout().removeWidget(widget)
+
+    def detach_widget(self, host, widget):
+        host.layout().removeWidget(widget)
+        # 否则控件还是 host 的子控件, 会留在原来的位置上显示
+        widget.setParent(None)
+
+    def destroy_widget(self, widget):
+        # 马上隐藏, 否则在 deleteLater 真正删除之前还会留在原来的位置参与绘制
+        widget.hide()
+        widget.deleteLater()
+
+    @contextmanager
+    def batch(self, host) -> Iterator[None]:
+        key = id(host)
+        depth = self._batches.get(key, 0)
+        self._batches[key] = depth + 1
+        if depth == 0:
+            updates_enabled = host.updatesEnabled()
+            # 批量修改期间 host 和它的子控件都不重绘
+            host.setUpdatesEnabled(False)
+        try:
+            yield
+        finally:
+            if depth == 0:
+                del self._batches[key]
+                layout = host.layout()
+                if layout is not None:
+                    # 只在最后算一次几何
+                    layout.invalidate()
+                host.setUpdatesEnabled(updates_enabled)
+            else:
+                self._batches[key] = depth
+
+    def call_when_idle(self, callback: Callable[[], None]):
+        from .qt.QtCore import QTimer
+
+        # 0 毫秒的 timer 在事件队列清空之后才触发
+        QTimer.singleShot(0, callback)
+
+
+__renderer__: Renderer | None = None
+
+
+def get_renderer() -> Renderer:
+    global __renderer__
+    if __renderer__ is None:
+        __renderer__ = QtRenderer()
+    return __renderer__
+
+
+def set_renderer(renderer: Renderer):
+    global __renderer__
+    __renderer__ = renderer
+
+
+def use_flat_widgets(flat=True) -> QtRenderer:
+    """
+    Render Button/Label/Input as native widgets from now on, call it before render.
+    """
+    renderer = get_renderer()
+    if not isinstance(renderer, QtRenderer):
+        renderer = QtRenderer()
+        set_renderer(renderer)
+    renderer.flat = flat
+    return renderer
@@ -0,0 +1,157 @@
+"""
+Async data for components.
+
+    user = create_resource(lambda user_id: api.get_user(user_id), source=user_id)
+
+    Suspense(
+        Label(lambda: user()["name"] if user() else ""),
+        fallback=Label("Loading..."),
+    )
+
+The fetcher runs in the thread pool, its result is set in the main thread.
+A Suspense shows its fallback while a resource read in its subtree is pending.
+"""
+
+from __future__ import annotations
+from typing import Callable, Any
+
+from .reactive import Signal, SignalAccessor, create_effect, untrack
+
+__suspense__: SuspenseContext | None = None
+
+
+class SuspenseContext:
+    """
+    The resources a Suspense is waiting for.
+
+    A resource is waited for once, after the Suspense has committed its content
+    a refetch updates the content in place instead of showing the fallback again.
+    """
+
+    def __init__(self):
+        self.pending: set[Resource] = set()
+        self._ready = Signal(True)
+
+    def __repr__(self) -> str:
+        return f"<SuspenseContext pending={len(self.pending)}>"
+
+    def ready(self) -> bool:
+        return self._ready.get()
+
+    def suspend(self, resource: Resource):
+        if resource in self.pending:
+            return
+        self.pending.add(resource)
+        resource._contexts.add(self)
+        self._ready.set(False)
+
+    def resolve(self, resource: Resource):
+        self.pending.discard(resource)
+        resource._contexts.discard(self)
+        if not self.pending:
+            self._ready.set(True)
+
+
+def run_with_suspense(context: SuspenseContext | None, cb):
+    global __suspense__
+    prev_suspense = __suspense__
+    __suspense__ = context
+    try:
+        return cb()
+    finally:
+        __suspense__ = prev_suspense
+
+
+class Resource:
+    """
+    A signal whose value is loaded by fetcher in the thread pool.
+
+    Calling it returns the latest value (None until the first load),
+    loading() and error() are signals too.
+    """
+
+    def __init__(self, fetcher: Callable, source: SignalAccessor | None = None):
+        self.fetcher = fetcher
+        self.source = source
+        self._value = Signal(None)
+        self._loading = Signal(False)
+        self._error = Signal(None)
+        self._contexts: set[SuspenseContext] = set()
+        self._version = 0
+        self._task = None
+
+        if source is None:
+            self.refetch()
+        else:
+            create_effect(self._track_source)
+
+    def __repr__(self) -> str:
+        return f"<Resource loading={self._loading._value}>"
+
+    def __call__(self):
+        if __suspense__ is not None and self._loading._value:
+            __suspense__.suspend(self)
+        return self._value.get()
+
+    def loading(self) -> bool:
+        return self._loading.get()
+
+    def error(self) -> Exception | None:
+        return self._error.get()
+
+    def _track_source(self):
+        arg = self.source()
+        # set loading 会触发别的 effect, 不能让它们订阅到 source 的 effect 上
+        untrack(lambda: self._load(arg, with_arg=True))
+
+    def refetch(self):
+        if self.source is None:
+            self._load(None, with_arg=False)
+        else:
+            self._load(untrack(self.source), with_arg=True)
+
+    def mutate(self, value: Any):
+        """
+        Set the value directly, a pending fetch is dropped.
+        """
+        self._version += 1
+        self._task = None
+        self._finish(value, None)
+
+    def _load(self, arg, *, with_arg: bool):
+        from .timer import run_in_thread
+
+        self._version += 1
+        version = self._version
+        fetcher = self.fetcher
+        self._loading.set(True)
+        self._task = run_in_thread(
+            (lambda: fetcher(arg)) if with_arg else fetcher,
+            lambda result, error: self._done(version, result, error),
+        )
+
+    def _done(self, version: int, result, error: Exception | None):
+        # 只用最后一次 fetch 的结果
+        if version != self._version:
+            return
+        self._task = None
+        self._finish(result, error)
+
+    def _finish(self, result, error: Exception | None):
+        self._error.set(error)
+        if error is None:
+            # result 也可能是 callable, 不能直接传给 set
+            self._value.set(lambda _: result)
+        self._loading.set(False)
+        for context in list(self._contexts):
+            context.resolve(self)
+
+
+def create_resource(fetcher: Callable, source: SignalAccessor | None = None) -> Resource:
+    """
+    Load data with fetcher in the thread pool.
+
+    Without source, fetcher() is called once.
+    With source, fetcher(source()) is called now and every time source changes.
+    """
+    return Resource(fetcher, source)
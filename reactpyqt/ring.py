@@ -0,0 +1,196 @@
+"""
+Fixed-size numeric history for live charts, backed by a preallocated NumPy array.
+
+    samples = create_ring(1_000_000)
+    set_interval(lambda: samples.extend(read_sensor_batch()), 1)
+
+    points = downsample(samples, width=800)
+    create_effect(lambda: chart.set_points(*points()))
+
+extend() writes a whole batch into the buffer and notifies once.
+Readers get a read-only view of the buffer, nothing is copied, the view is only
+valid until the next extend. downsample() reduces the view to a few points per
+pixel column before it reaches a widget.
+
+Needs numpy, `pip install reactpyqt[numpy]`.
+"""
+
+from __future__ import annotations
+from typing import Callable
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError("reactpyqt.ring requires numpy, install reactpyqt[numpy]") from e
+
+from .reactive import Signal, SignalAccessor, create_effect
+
+
+class RingSignal:
+    """
+    The last capacity values written, oldest first.
+
+    Every value is stored twice, at i and i + capacity, so the window
+    always is one contiguous slice of the buffer and get() never copies.
+    """
+
+    def __init__(self, capacity: int, dtype=np.float64):
+        if capacity <= 0:
+            raise ValueError(f"Invalid ring capacity {capacity}")
+        self.capacity = capacity
+        self._buffer = np.zeros(2 * capacity, dtype=dtype)
+        self._buffer.flags.writeable = False
+        # 下一个写入的位置, 在 [0, capacity) 里
+        self._pos = 0
+        self._length = 0
+        # 一共写入过多少个值, 用来算 x 坐标
+        self._total = 0
+        # 只用来通知, 值是写入的批次数
+        self._version = Signal(0)
+
+    def __repr__(self) -> str:
+        return f"<RingSignal len={self._length} capacity={self.capacity}>"
+
+    def __len__(self):
+        return self._length
+
+    def __call__(self) -> np.ndarray:
+        return self.get()
+
+    def get(self) -> np.ndarray:
+        self._version.get()
+        end = self._pos + self.capacity
+        return self._buffer[end - self._length : end]
+
+    @property
+    def start_index(self) -> int:
+        """
+        Sample number of the oldest value in the window.
+        """
+        return self._total - self._length
+
+    def extend(self, values):
+        """
+        Write a batch of values, dependents are notified once.
+        """
+        values = np.asarray(values, dtype=self._buffer.dtype).ravel()
+        count = len(values)
+        if count == 0:
+            return
+        self._total += count
+        if count > self.capacity:
+            values = values[-self.capacity :]
+            count = self.capacity
+
+        buffer = self._buffer
+        buffer.flags.writeable = True
+        try:
+            # 环绕时分两段写, 两份各写一次
+            first = min(count, self.capacity - self._pos)
+            for offset in (0, self.capacity):
+                start = self._pos + offset
+                buffer[start : start + first] = values[:first]
+                buffer[offset : offset + count - first] = values[first:]
+        finally:
+            buffer.flags.writeable = False
+
+        self._pos = (self._pos + count) % self.capacity
+        self._length = min(self._length + count, self.capacity)
+        self._version.set(lambda v: v + 1)
+
+    def append(self, value):
+        self.extend((value,))
+
+    def clear(self):
+        self._pos = 0
+        self._length = 0
+        self._version.set(lambda v: v + 1)
+
+
+def create_ring(capacity: int, dtype=np.float64) -> RingSignal:
+    return RingSignal(capacity, dtype)
+
+
+def minmax(y: np.ndarray, width: int) -> np.ndarray:
+    """
+    Indices of the min and max of y in each of width buckets, in order.
+
+    Keeps every spike visible, at most 2 * width points.
+    """
+    n = len(y)
+    if n <= 2 * width:
+        return np.arange(n)
+    bucket = n // width
+    # 多出来的最旧的几个值不画
+    offset = n - bucket * width
+    blocks = y[offset:].reshape(width, bucket)
+    low = blocks.argmin(axis=1)
+    high = blocks.argmax(axis=1)
+    base = offset + np.arange(width) * bucket
+    indices = np.empty(2 * width, dtype=np.intp)
+    indices[0::2] = base + np.minimum(low, high)
+    indices[1::2] = base + np.maximum(low, high)
+    return indices
+
+
+def lttb(y: np.ndarray, width: int) -> np.ndarray:
+    """
+    Indices of y picked by Largest-Triangle-Three-Buckets, width points.
+
+    Keeps the visual shape with fewer points than minmax, slower for large widths.
+    """
+    n = len(y)
+    if n <= width or width < 3:
+        return np.arange(n)
+    x = np.arange(n, dtype=np.float64)
+    every = (n - 2) / (width - 2)
+    indices = np.empty(width, dtype=np.intp)
+    indices[0] = 0
+    indices[-1] = n - 1
+    a = 0
+    for i in range(width - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(area.argmax())
+        indices[i + 1] = a
+    return indices
+
+
+_METHODS: dict[str, Callable[[np.ndarray, int], np.ndarray]] = {
+    "minmax": minmax,
+    "lttb": lttb,
+}
+
+
+def downsample(
+    source: RingSignal | SignalAccessor,
+    width: int | SignalAccessor,
+    *,
+    method="minmax",
+) -> SignalAccessor:
+    """
+    Accessor of (x, y) arrays of source reduced to about width points.
+
+    x is the sample number (RingSignal.start_index based), width may be an accessor,
+    e.g. the pixel width of the chart. method is "minmax" or "lttb".
+    """
+    reduce = _METHODS[method]
+    result = Signal(None)
+
+    def handler():
+        y = source()
+        points = width() if callable(width) else width
+        indices = reduce(y, max(int(points), 1))
+        start = source.start_index if isinstance(source, RingSignal) else 0
+        # 数组不能用 == 比较, 直接替换
+        result.set(lambda _: (indices + start, y[indices]))
+
+    create_effect(handler)
+    return result.get
@@ -0,0 +1,193 @@
+"""
+Fill a ReactiveList from an iterator or async iterator without blocking the UI.
+
+    lines = stream_list(open("app.log"), chunk_size=200, max_rows=10_000)
+    For(each=lines, map_fn=lambda line, idx: Label(line))
+
+For(each=iterator, ...) does the same with For's chunk_size and max_rows.
+
+The source is consumed in the thread pool into a bounded queue, the producer
+waits while the queue is full. A QTimer in the main thread appends what has
+arrived with one extend per event loop turn, at most chunk_size items at a time.
+With max_rows the oldest rows are removed once the list grows past it.
+
+Without a Qt application there is no event loop to run the timer, e.g. with
+the headless renderer in tests, call pump() to append what has arrived.
+"""
+
+from __future__ import annotations
+import asyncio
+import queue
+from threading import Event
+from typing import Any, AsyncIterable, Iterable
+
+from .qt.QtCore import QCoreApplication, QRunnable, QThreadPool, QTimer, Slot
+
+from .globalvar import __intervals__
+from .reactive import ReactiveList, Signal, on_cleanup
+
+
+class _End:
+    """
+    Put into the queue after the last item.
+    """
+
+    def __init__(self, error: Exception | None):
+        self.error = error
+
+
+class StreamProducer(QRunnable):
+    """
+    Move the items of source into a bounded queue, in the thread pool.
+    """
+
+    def __init__(self, source: Iterable | AsyncIterable, buffer: queue.Queue):
+        super().__init__()
+        self.source = source
+        self.buffer = buffer
+        self._stopped = Event()
+
+    @Slot()
+    def run(self):
+        try:
+            if hasattr(self.source, "__aiter__"):
+                asyncio.run(self._consume_async())
+            else:
+                for item in self.source:
+                    if not self._put(item):
+                        return
+        except Exception as e:
+            self._put(_End(e))
+            return
+        self._put(_End(None))
+
+    async def _consume_async(self):
+        async for item in self.source:
+            # 阻塞的是这个线程自己的 event loop, 正好就是背压
+            if not self._put(item):
+                return
+
+    def _put(self, item) -> bool:
+        # 带超时, stop 之后不会一直卡在满的队列上
+        while not self._stopped.is_set():
+            try:
+                self.buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def stop(self):
+        self._stopped.set()
+
+
+class StreamList(ReactiveList):
+    """
+    A ReactiveList filled from source, see the module docstring.
+
+    done() and error() are signals, done() turns True when source is exhausted,
+    failed or the stream is stopped.
+    """
+
+    def __init__(
+        self,
+        source: Iterable | AsyncIterable,
+        *,
+        chunk_size=100,
+        max_rows: int | None = None,
+        buffer_size=1000,
+        poll_interval=16,
+    ):
+        super().__init__()
+        self.chunk_size = chunk_size
+        self.max_rows = max_rows
+        self.poll_interval = poll_interval
+        self._done = Signal(False)
+        self._error = Signal(None)
+        self._buffer: queue.Queue = queue.Queue(maxsize=buffer_size)
+        self._producer = StreamProducer(source, self._buffer)
+        self._timer: QTimer | None = None
+        if QCoreApplication.instance() is not None:
+            self._timer = QTimer()
+            self._timer.timeout.connect(self.pump)
+
+        # 和 interval 一样, 退出时要让线程池里的生产者停下来
+        __intervals__.add(self)
+        on_cleanup(self.stop)
+        QThreadPool.globalInstance().start(self._producer)
+        if self._timer is not None:
+            self._timer.start(0)
+
+    def __repr__(self) -> str:
+        return f"<StreamList len={len(self._value)} done={self._done._value}>"
+
+    def done(self) -> bool:
+        return self._done.get()
+
+    def error(self) -> Exception | None:
+        return self._error.get()
+
+    def pump(self):
+        """
+        Append at most chunk_size of the items that have arrived.
+        """
+        if self._done._value:
+            return
+        chunk: list[Any] = []
+        finished = False
+        while len(chunk) < self.chunk_size:
+            try:
+                item = self._buffer.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, _End):
+                finished = True
+                self._error.set(item.error)
+                break
+            chunk.append(item)
+        received = len(chunk)
+
+        if chunk and self.max_rows is not None:
+            # 先删旧的再加新的, 列表任何时候都不会超过 max_rows
+            chunk = chunk[-self.max_rows :]
+            overflow = len(self._value) + len(chunk) - self.max_rows
+            if overflow > 0:
+                self.remove_range(0, overflow)
+        self.extend(chunk)
+
+        if finished:
+            self._finish()
+        elif self._timer is not None:
+            # 队列里还有就下一轮马上继续, 否则按 poll_interval 等生产者
+            full = received == self.chunk_size
+            self._timer.setInterval(0 if full else self.poll_interval)
+
+    def _finish(self):
+        if self._timer is not None:
+            self._timer.stop()
+        self._done.set(True)
+
+    def stop(self):
+        """
+        Stop consuming source, rows that already arrived are kept.
+        """
+        self._producer.stop()
+        if not self._done._value:
+            self._finish()
+
+
+def stream_list(
+    source: Iterable | AsyncIterable,
+    *,
+    chunk_size=100,
+    max_rows: int | None = None,
+    buffer_size=1000,
+) -> StreamList:
+    """
+    Return a ReactiveList filled from source in chunks, see the module docstring.
+
+    Stops when the current owner (a For row, a Switch case, ...) is disposed.
+    """
+    return StreamList(
+        source, chunk_size=chunk_size, max_rows=max_rows, buffer_size=buffer_size
+    )
@@ -0,0 +1,208 @@
+from __future__ import annotations
+import weakref
+from itertools import count
+from .qt.QtCore import QTimer
+from .qt.QtWidgets import QApplication, QWidget
+
+from .utils.log import logger
+
+# 多个控件共用的 qss 字符串只解析一次:
+# 先后被两个不同控件用到的 qss 生成一个 class, 规则统一挂到 QApplication 的 stylesheet 上,
+# 控件只设置 dynamic property 来引用这个 class, 之后切换只需要 repolish.
+# 只有一个控件用过的 (例如 reactive 的 f"min-width: {n()}px") 用控件自己的 stylesheet,
+# 不会每次都让整个 app 重新 polish.
+#
+# 控件自己的 stylesheet 总是优先于 app 的, 所以容器 (有 layout 或子控件的) 用到自己的
+# stylesheet 时, class 规则也要写进去, 否则子控件的 qss 会被父控件自己的 qss 盖掉.
+# 这些规则限定在这个控件下面, 见 _own_stylesheet
+STYLE_PROPERTY = "rpqStyle"
+SEEN_LIMIT = 4096
+
+# qss -> 现在用着它的控件数
+__qss_uses__: dict[str, int] = {}
+# id(widget) -> 控件现在的 qss
+__widget_qss__: dict[int, str] = {}
+# qss -> 第一个用它的控件的 id, 换了一个控件再用时就共用
+__qss_seen__: dict[str, int] = {}
+# qss -> class, 没有控件再用的在下一次 flush 时删除
+__style_classes__: dict[str, str] = {}
+# id(widget) -> (控件, 控件自己的 class), 用自己 stylesheet 的控件
+__own_styled__: dict[int, tuple[weakref.ref, str]] = {}
+__class_ids__ = count()
+__base_stylesheet__: str | None = None
+__flush_pending__ = False
+
+
+def set_base_stylesheet(qss: str):
+    """
+    Set the application stylesheet that interned rules are appended to.
+
+    By default it is the application stylesheet found on the first flush.
+    """
+    global __base_stylesheet__
+    __base_stylesheet__ = qss
+    flush_stylesheet()
+
+
+def flush_stylesheet():
+    """
+    Write the interned rules to the application stylesheet and to every
+    widget with its own stylesheet, restyling every widget.
+    """
+    global __base_stylesheet__, __flush_pending__
+    __flush_pending__ = False
+    app = QApplication.instance()
+    if app is None:
+        return
+    if __base_stylesheet__ is None:
+        __base_stylesheet__ = app.styleSheet()
+
+    # 不再使用的规则跟着这次刷新一起删掉, 不单独为它们刷新一次
+    for qss in [qss for qss in __style_classes__ if qss not in __qss_uses__]:
+        del __style_classes__[qss]
+    rules = [_style_rule(style_class, qss) for qss, style_class in __style_classes__.items()]
+    app.setStyleSheet("\n".join([__base_stylesheet__, *rules]))
+
+    for key, (widget_ref, own_class) in list(__own_styled__.items()):
+        widget = widget_ref()
+        if widget is None:
+            del __own_styled__[key]
+        elif _hosts_children(widget):
+            widget.setStyleSheet(_own_stylesheet(own_class, __widget_qss__[key]))
+
+
+def schedule_flush():
+    """
+    flush_stylesheet once the current event loop turn is done,
+    however many rules were added during it.
+    """
+    global __flush_pending__
+    if __flush_pending__:
+        return
+    __flush_pending__ = True
+    QTimer.singleShot(0, flush_stylesheet)
+
+
+def _style_rule(style_class: str, qss: str, scope="") -> str:
+    # 控件自身的规则多一个类型选择器, 优先级高于从父级继承来的规则
+    return (
+        f'{scope}QWidget[{STYLE_PROPERTY}="{style_class}"] {{ {qss} }}\n'
+        f'{scope}*[{STYLE_PROPERTY}="{style_class}"] * {{ {qss} }}'
+    )
+
+
+def _hosts_children(widget: QWidget) -> bool:
+    # 容器在设置 qss 时已经有 layout, 子控件是之后才加进来的
+    return widget.layout() is not None or bool(widget.findChildren(QWidget))
+
+
+def _own_stylesheet(own_class: str, qss: str, with_rules=True) -> str:
+    # 带选择器的 qss 原样保留, 没有选择器的和 class 规则一样写成控件自身和子控件两条
+    own_rule = qss if "{" in qss else _style_rule(own_class, qss)
+    if not with_rules:
+        return own_rule
+    # 只作用在这个控件下面, 不会匹配到它上面用了同一个 class 的控件
+    scope = f'*[{STYLE_PROPERTY}="{own_class}"] '
+    rules = [_style_rule(style_class, qss, scope) for qss, style_class in __style_classes__.items()]
+    return "\n".join([own_rule, *rules])
+
+
+def intern_qss(qss: str, widget: QWidget | None = None) -> str | None:
+    """
+    Return the generated class name for qss once a second widget uses it,
+    registering its rule for the next flush.
+
+    Only selector-less qss (declarations applied to the widget and its children,
+    same as `widget.setStyleSheet`) can be hoisted, otherwise return None.
+    """
+    style_class = __style_classes__.get(qss)
+    if style_class is not None:
+        return style_class
+    if not qss or "{" in qss:
+        return None
+    first_user = __qss_seen__.setdefault(qss, id(widget))
+    if first_user == id(widget):
+        return None
+
+    style_class = f"s{next(__class_ids__)}"
+    __style_classes__[qss] = style_class
+    logger.debug("Interned qss as {}: {}", style_class, qss)
+    schedule_flush()
+    return style_class
+
+
+def _use_qss(widget: QWidget, qss: str):
+    key = id(widget)
+    prev_qss = __widget_qss__.get(key)
+    if prev_qss is None:
+        # 控件删除时把它的 qss 计数减掉
+        widget.destroyed.connect(lambda: _forget_widget(key))
+    else:
+        _release_qss(prev_qss)
+    __widget_qss__[key] = qss
+    __qss_uses__[qss] = __qss_uses__.get(qss, 0) + 1
+    # 不断变化的 reactive qss 不会一直留在这里
+    if len(__qss_seen__) >= SEEN_LIMIT:
+        __qss_seen__.clear()
+
+
+def _forget_widget(key: int):
+    __own_styled__.pop(key, None)
+    _release_qss(__widget_qss__.pop(key, None))
+
+
+def _release_qss(qss: str | None):
+    if qss is None:
+        return
+    uses = __qss_uses__.get(qss, 0) - 1
+    if uses > 0:
+        __qss_uses__[qss] = uses
+    else:
+        __qss_uses__.pop(qss, None)
+
+
+def repolish(widget: QWidget):
+    style = widget.style()
+    for target in [widget, *widget.findChildren(QWidget)]:
+        style.unpolish(target)
+        style.polish(target)
+    widget.update()
+
+
+def _set_own_stylesheet(widget: QWidget, qss: str):
+    key = id(widget)
+    own = __own_styled__.get(key)
+    if own is None:
+        own = __own_styled__[key] = (weakref.ref(widget), f"o{next(__class_ids__)}")
+        # 先设置 property, setStyleSheet 时 polish 才能匹配到
+        widget.setProperty(STYLE_PROPERTY, own[1])
+    widget.setStyleSheet(_own_stylesheet(own[1], qss, _hosts_children(widget)))
+
+
+def apply_qss(widget: QWidget, qss: str):
+    """
+    Replacement for `widget.setStyleSheet(qss)` that shares parsed rules between widgets.
+
+    qss used by more than one widget is parsed once, switching to it only swaps
+    the dynamic property and repolishes. Other qss is set on the widget itself,
+    together with the shared rules so a widget's own qss still wins over its parent's.
+    """
+    if __widget_qss__.get(id(widget)) == qss:
+        return
+    _use_qss(widget, qss)
+    style_class = intern_qss(qss, widget)
+
+    if style_class is None:
+        _set_own_stylesheet(widget, qss)
+        return
+
+    prev_class = widget.property(STYLE_PROPERTY)
+    if prev_class == style_class:
+        return
+    own = __own_styled__.pop(id(widget), None)
+    if own is not None:
+        widget.setStyleSheet("")
+    widget.setProperty(STYLE_PROPERTY, style_class)
+    if prev_class is not None:
+        # 第一次设置时控件还没 polish, 之后的变化需要重新 polish
+        repolish(widget)
@@ -1,6 +1,9 @@
-from PyQt6.QtCore import QRunnable, QThreadPool, pyqtSignal, pyqtSlot, QObject
+from threading import Event
+
+from .qt.QtCore import QRunnable, QThreadPool, Signal, Slot, QObject
 
 from .globalvar import __intervals__
+from .reactive import on_cleanup
 
 
 class Timeout(QRunnable):
@@ -12,36 +15,52 @@ class Timeout(QRunnable):
     """
 
     class TimtoutSignal(QObject):
-        timeout = pyqtSignal()
+        timeout = Signal()
 
     def __init__(self, timeout: int):
         super().__init__()
         self.timeout = timeout
         self.signal = self.TimtoutSignal()
+        self._cancelled = Event()
 
-    @pyqtSlot()
+    @Slot()
     def run(self):
-        import time
-
-        time.sleep(self.timeout)
+        # wait 而不是 sleep, cancel 后线程马上释放回线程池
+        if self._cancelled.wait(self.timeout):
+            return
         try:
             self.signal.timeout.emit()
         except RuntimeError:
             pass
 
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
 
 def set_timeout(func, sec):
     """
     Like JavaScript's setTimeout.
 
     Set a timeout to run a function after a certain amount of time.
+    Return the timeout instance to allow cancelling it.
+
+    Will be cancelled when the component that set it is removed.
 
     :param func: function to run
     :param sec: int, seconds to wait
+
+    :return: Timeout
     """
     timeout = Timeout(sec)
-    timeout.signal.timeout.connect(func)
+    # signal 是排队送到主线程的, cancel 之后可能还有一个在路上
+    timeout.signal.timeout.connect(lambda: None if timeout.cancelled else func())
+    on_cleanup(timeout.cancel)
     QThreadPool.globalInstance().start(timeout)
+    return timeout
 
 
 class Interval(QRunnable):
@@ -53,27 +72,28 @@ class Interval(QRunnable):
     """
 
     class IntervalSignal(QObject):
-        tick = pyqtSignal()
+        tick = Signal()
 
     def __init__(self, interval: int):
         super().__init__()
         self.interval = interval
         self.signal = self.IntervalSignal()
-        self._running = True
+        self._stopped = Event()
 
-    @pyqtSlot()
+    @Slot()
     def run(self):
-        import time
-
-        while self._running:
-            time.sleep(self.interval)
+        while not self._stopped.wait(self.interval):
             try:
                 self.signal.tick.emit()
             except RuntimeError:
                 pass
 
     def stop(self):
-        self._running = False
+        self._stopped.set()
+
+    @property
+    def running(self) -> bool:
+        return not self._stopped.is_set()
 
 
 def set_interval(func, sec):
@@ -84,7 +104,8 @@ def set_interval(func, sec):
     Return the interval instance to allow stopping it later.
 
     Will start immediately.
-    Will stop when the application exits.
+    Will stop when the component that set it is removed,
+    or when the application exits.
 
     :param func: function to run
     :param sec: int, interval in seconds
@@ -92,9 +113,54 @@ def set_interval(func, sec):
     :return: Interval
     """
 
-    global __intervals__
     interval = Interval(sec)
-    __intervals__.append(interval)
-    interval.signal.tick.connect(func)
+    # 弱引用, 运行中的 interval 由它自己的 run 持有
+    __intervals__.add(interval)
+    interval.signal.tick.connect(lambda: func() if interval.running else None)
+    on_cleanup(interval.stop)
     QThreadPool.globalInstance().start(interval)
     return interval  # Return the interval instance to allow stopping it later
+
+
+class Task(QRunnable):
+    """
+    Run a function in the thread pool and emit its result in the main thread.
+    """
+
+    class TaskSignal(QObject):
+        # result, exception
+        done = Signal(object, object)
+
+    def __init__(self, func):
+        super().__init__()
+        self.func = func
+        self.signal = self.TaskSignal()
+
+    @Slot()
+    def run(self):
+        try:
+            result, error = self.func(), None
+        except Exception as e:
+            result, error = None, e
+        try:
+            self.signal.done.emit(result, error)
+        except RuntimeError:
+            pass
+
+
+def run_in_thread(func, callback):
+    """
+    Run func in the thread pool, then callback(result, exception) in the main thread.
+
+    Keep the returned task alive until callback is called,
+    otherwise its signal may be deleted before the result arrives.
+
+    :param func: function to run, without arguments
+    :param callback: function to call with the result and the exception (or None)
+
+    :return: Task
+    """
+    task = Task(func)
+    task.signal.done.connect(callback)
+    QThreadPool.globalInstance().start(task)
+    return task
@@ -1,17 +1,43 @@
-def flatten(nested_list: list) -> list:
+from types import GeneratorType
+
+# 需要展开或者丢掉的 child
+_SPECIAL_CHILDREN = (bool, list, tuple, GeneratorType)
+
+
+def normalize_children(children: tuple) -> tuple:
     """
-    将嵌套列表展开
+    Flatten nested lists/tuples/generators of children and drop None/bool,
+    so `cond and Label(...)` can be used as a child.
+
+    Children without any of those are returned as is, without copying.
     """
-    stack = list(nested_list[::-1])  # 将列表倒序入栈
-    flat_list = []
+    for child in children:
+        if child is None or isinstance(child, _SPECIAL_CHILDREN):
+            break
+    else:
+        return children
 
+    result = []
+    stack = [iter(children)]
     while stack:
-        item = stack.pop()
-
-        if isinstance(item, list):
-            # 如果是列表，将其中元素倒序入栈
-            stack.extend(item[::-1])
+        for child in stack[-1]:
+            if child is None or isinstance(child, bool):
+                continue
+            if isinstance(child, _SPECIAL_CHILDREN):
+                stack.append(iter(child))
+                break
+            result.append(child)
         else:
-            flat_list.append(item)
+            stack.pop()
+    return tuple(result)
+
+
+def gen_key() -> str:
+    """
+    Generate a unique key for nodes without an explicit key.
+
+    uuid is imported on first use to keep `import reactpyqt` cheap.
+    """
+    from uuid import uuid4
 
-    return flat_list
+    return str(uuid4())
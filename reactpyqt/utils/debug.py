@@ -1,10 +1,10 @@
 from __future__ import annotations
-from PyQt6.QtWidgets import QLayout
-from loguru import logger
+from .log import logger
 
 # fmt: off
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
+    from ..qt.QtWidgets import QLayout
     from core import ReactiveNode
 # fmt: on
 
@@ -38,5 +38,19 @@ def print_layout_contents(layout: QLayout, level=0):
             print_layout_contents(sub_layout, level + 1)
 
 
+def print_widget_tree(widget, level=0):
+    """
+    Renderer independent version of print_layout_contents.
+    """
+    from ..renderer import get_renderer
+
+    renderer = get_renderer()
+    indent = "  " * level
+    for i in range(renderer.child_count(widget)):
+        child = renderer.child_at(widget, i)
+        logger.debug(f"{indent}Widget: {renderer.widget_key(child)} ({type(child).__name__})")
+        print_widget_tree(child, level + 1)
+
+
 def print_tree(node: ReactiveNode):
     node.for_each_child(lambda node, depth: logger.debug(f"{'  ' * depth}{node}"))
@@ -1,8 +1,11 @@
 from __future__ import annotations
-from PyQt6.QtWidgets import QLayout, QHBoxLayout, QVBoxLayout
-from loguru import logger
-
-from .validation import is_component_node
+from .log import logger
+from .validation import (
+    is_component_node,
+    is_virtual_widget_node,
+    is_control_flow_node,
+)
+from ..renderer import get_renderer
 
 # fmt: off
 from typing import TYPE_CHECKING
@@ -12,98 +15,95 @@ if TYPE_CHECKING:
 # fmt: on
 
 
-def find_widget_index(layout: QLayout, object_name: str) -> int:
+def last_mounted_widget(node: ReactiveNode) -> QT_Widget | None:
+    """
+    The last widget node has put into its host, None if it has none.
     """
-    Find qt widget index in layout by object name.
+    while node is not None:
+        if is_virtual_widget_node(node):
+            return node.qt_widget
+        if is_control_flow_node(node):
+            return node.rendered_widgets[-1] if node.rendered_widgets else None
+        # component node, 它的控件在 child 上
+        node = node.child
+    return None
 
-    If not found, return -1
+
+def find_control_flow_index(host_node: ReactiveNode, node: ReactiveNode) -> int:
     """
-    for index in range(layout.count()):
-        item = layout.itemAt(index)
-        widget = item.widget()
-        if widget and widget.objectName() == object_name:
-            return index
-    return -1  # 未找到该objectName的控件
-
-
-def remove_widgets_from_layout(layout: QLayout, indexes: list[int]):
-    # 从后往前删除，避免删除后索引错乱
-    for idx in sorted(indexes, reverse=True):
-        item = layout.itemAt(idx)
-        if item:
-            logger.debug(
-                f"Removing widget {item.widget().objectName()} from layout {layout.objectName()}"
-            )
-            layout.removeItem(item)
-            item.widget().deleteLater()
-    layout.update()
-
-
-def remove_widgets_by_length(
-    host_node: ReactiveNode,
-    node: ReactiveNode,
-    length: int,
-):
-    if host_node.qt_widget is None:
-        raise ValueError("Node has no QT_Widget")
-    layout = host_node.qt_widget.layout()
+    Find the layout index where the widgets of a control flow node start.
 
+    It is the index right after the last widget of the nearest previous sibling
+    that has mounted anything (a widget, a component or another control flow), or 0.
+    """
     root_attached_node = node.find_parent(
         lambda node: not is_component_node(node.parent), include_self=True
     )
     if not root_attached_node:
         raise ValueError("Cannot find root attached node")
-    prev_widget = root_attached_node.find_virtual_widget_prev_sibling()
-    if prev_widget:
-        index = find_widget_index(layout, prev_widget.qt_widget.objectName())
-        if index < 0:
-            raise ValueError(
-                f"Cannot find widget {prev_widget.qt_widget.objectName()} in layout"
-            )
-        index += 1
-    else:
-        index = 0
-
-    indexes = list(range(index, index + length))
-    remove_widgets_from_layout(layout, indexes)
-
-
-def insert_widgets_to_layout(
+
+    sibling = root_attached_node.prev_sibling
+    while sibling is not None:
+        prev_widget = last_mounted_widget(sibling)
+        if prev_widget is not None:
+            index = get_renderer().index_of(host_node.qt_widget, prev_widget)
+            if index < 0:
+                raise ValueError(f"Cannot find widget of {sibling.key} in {host_node.key}")
+            return index + 1
+        sibling = sibling.prev_sibling
+    return 0
+
+
+def replace_rendered_widgets(
     host_node: ReactiveNode,
     node: ReactiveNode,
     widgets: list[QT_Widget],
 ):
-    if host_node.qt_widget is None:
+    """
+    Swap the widgets a control flow node has mounted in its host for widgets.
+    """
+    host = host_node.qt_widget
+    if host is None:
         raise ValueError("Host node has no QT_Widget")
-    host_layout = host_node.qt_widget.layout()
-    if not isinstance(host_layout, QHBoxLayout) and not isinstance(
-        host_layout, QVBoxLayout
-    ):
-        raise ValueError(
-            "insert_widgets_to_layout only supports QHBoxLayout and QVBoxLayout"
-        )
 
-    root_attached_node = node.find_parent(
-        lambda node: not is_component_node(node.parent), include_self=True
-    )
-    if not root_attached_node:
-        raise ValueError("Cannot find root attached node")
-    logger.debug(f"insert_widgets_to_layout root_attached_node {root_attached_node}")
-    prev_widget = root_attached_node.find_virtual_widget_prev_sibling()
-    if prev_widget:
-        logger.debug(f"insert_widgets_to_layout prev_widget {prev_widget}")
-        index = find_widget_index(host_layout, prev_widget.qt_widget.objectName())
-        if index < 0:
-            raise ValueError(
-                f"Cannot find widget {prev_widget.qt_widget.objectName()} in layout {host_layout.objectName()}"
-            )
-        index += 1
-    else:
-        logger.debug("insert_widgets_to_layout no prev_widget")
-        index = 0
+    renderer = get_renderer()
+    with renderer.batch(host):
+        for widget in node.rendered_widgets:
+            renderer.remove_widget(host, widget)
+            node.dispose_widget(widget)
+        insert_widgets_at(host, find_control_flow_index(host_node, node), widgets)
+    node.rendered_widgets = list(widgets)
+
+
+def swap_rendered_widgets(
+    host_node: ReactiveNode,
+    node: ReactiveNode,
+    widgets: list[QT_Widget],
+):
+    """
+    Like replace_rendered_widgets, but the old widgets are only detached,
+    they keep their effects and can be inserted again later.
+    """
+    host = host_node.qt_widget
+    if host is None:
+        raise ValueError("Host node has no QT_Widget")
+
+    renderer = get_renderer()
+    with renderer.batch(host):
+        for widget in node.rendered_widgets:
+            renderer.detach_widget(host, widget)
+        insert_widgets_at(host, find_control_flow_index(host_node, node), widgets)
+    node.rendered_widgets = list(widgets)
+
+
+def remove_widget_from_layout(host: QT_Widget, widget: QT_Widget):
+    renderer = get_renderer()
+    logger.debug("Removing widget {}", renderer.widget_key(widget))
+    renderer.remove_widget(host, widget)
+
 
+def insert_widgets_at(host: QT_Widget, index: int, widgets: list[QT_Widget]):
+    renderer = get_renderer()
     for idx, widget in enumerate(widgets):
-        logger.debug(
-            f"Inserting widget {widget.objectName()} to layout {host_layout.objectName()} at index {index + idx}"
-        )
-        host_layout.insertWidget(index + idx, widget)
+        logger.debug("Inserting widget {} at index {}", widget, index + idx)
+        renderer.insert_widget(host, index + idx, widget)
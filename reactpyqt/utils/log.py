@@ -0,0 +1,17 @@
+class _LazyLogger:
+    """
+    loguru 的 logger 代理, 第一次使用时才 import loguru
+
+    import loguru 会连带 import asyncio 等模块, 占了 import reactpyqt 的大部分时间
+    """
+
+    def __getattr__(self, name):
+        from loguru import logger as _logger
+
+        attr = getattr(_logger, name)
+        # 缓存到实例上, 之后的访问不再经过 __getattr__
+        setattr(self, name, attr)
+        return attr
+
+
+logger = _LazyLogger()
@@ -1,9 +1,16 @@
 from __future__ import annotations
-from PyQt6.QtCore import QRect
+
+# fmt: off
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from ..qt.QtCore import QRect
+# fmt: on
 
 
 def zoom_rect(rect: QRect, factor):
     """中心缩放 QRect"""
+    from ..qt.QtCore import QRect
+
     width = int(rect.width() * factor)
     height = int(rect.height() * factor)
     x = int(rect.x() - (width - rect.width()) / 2)
@@ -1,5 +1,5 @@
 from __future__ import annotations
-import threading
+from _thread import get_ident
 
 # fmt: off
 from typing import TYPE_CHECKING
@@ -7,6 +7,8 @@ if TYPE_CHECKING:
     from core import ReactiveNode
 # fmt: on
 
+_main_thread_ident: int | None = None
+
 
 def is_main_thread():
     """
@@ -14,7 +16,12 @@ def is_main_thread():
 
     :return: bool
     """
-    return threading.get_ident() == threading.main_thread().ident
+    global _main_thread_ident
+    if _main_thread_ident is None:
+        import threading
+
+        _main_thread_ident = threading.main_thread().ident
+    return get_ident() == _main_thread_ident
 
 
 def is_component_node(obj: ReactiveNode) -> bool:
@@ -8,4 +8,9 @@ setup(
     install_requires=[
         "loguru>=0.7.0",
     ],
+    extras_require={
+        "pyqt6": ["PyQt6"],
+        "pyside6": ["PySide6"],
+        "numpy": ["numpy"],
+    },
 )
@@ -0,0 +1,17 @@
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+@pytest.fixture(scope="session")
+def qt_app():
+    """
+    One QApplication for the whole run.
+
+    Qt's global thread pool is destroyed with the application,
+    so it must outlive every test that runs something in the pool.
+    """
+    QtWidgets = pytest.importorskip("reactpyqt.qt.QtWidgets")
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
@@ -0,0 +1,75 @@
+from contextlib import contextmanager
+
+import pytest
+
+from reactpyqt.core import Component, VBox, Label, For
+from reactpyqt.headless import HeadlessRenderer, render_headless
+from reactpyqt.reactive import create_list
+from reactpyqt.renderer import set_renderer
+
+
+class RecordingRenderer(HeadlessRenderer):
+    """
+    Records the host of every batch and how many children it had at the end.
+    """
+
+    def __init__(self):
+        self.batches = []
+
+    @contextmanager
+    def batch(self, host):
+        yield
+        self.batches.append((host.key, len(host.children)))
+
+
+@pytest.fixture
+def renderer():
+    renderer = RecordingRenderer()
+    set_renderer(renderer)
+    yield renderer
+    set_renderer(HeadlessRenderer())
+
+
+def test_bulk_for_patches_are_batched(renderer):
+    items = create_list(["a"])
+
+    class App(Component):
+        def render(self):
+            return VBox(For(each=items, map_fn=lambda item, _: Label(item)), key="rows")
+
+    render_headless(App())
+    items.append("b")
+    items.pop(0)
+    assert renderer.batches == []
+
+    items.extend(["c", "d"])
+    items.remove_range(0, 2)
+    items.set(["x", "y", "z"])
+    assert renderer.batches == [("rows", 3), ("rows", 1), ("rows", 3)]
+
+
+def test_qt_batch_suspends_updates_until_the_outer_batch_ends(qt_app):
+    QtWidgets = pytest.importorskip("reactpyqt.qt.QtWidgets")
+    from reactpyqt.renderer import QtRenderer
+
+    qt_renderer = QtRenderer()
+    host = QtWidgets.QWidget()
+    QtWidgets.QVBoxLayout(host)
+
+    with qt_renderer.batch(host):
+        assert not host.updatesEnabled()
+        with qt_renderer.batch(host):
+            pass
+        assert not host.updatesEnabled()
+    assert host.updatesEnabled()
+
+    with pytest.raises(ValueError):
+        with qt_renderer.batch(host):
+            raise ValueError("failed patch")
+    assert host.updatesEnabled()
+
+    # 原来就关着的保持关着
+    host.setUpdatesEnabled(False)
+    with qt_renderer.batch(host):
+        pass
+    assert not host.updatesEnabled()
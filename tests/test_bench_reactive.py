@@ -0,0 +1,38 @@
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+BENCH_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "bench_reactive.py"
+)
+
+spec = importlib.util.spec_from_file_location("bench_reactive", BENCH_FILE)
+bench_reactive = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(bench_reactive)
+
+
+@pytest.mark.parametrize("name", list(bench_reactive.SCENARIOS))
+def test_scenario_runs(name):
+    # 只确认每个场景还能跑, 计时由下面的 gate 负责
+    op, ops_per_call = bench_reactive.SCENARIOS[name]()
+    assert ops_per_call > 0
+    op()
+    op()
+
+
+def test_every_scenario_has_a_baseline():
+    with open(bench_reactive.BASELINE_FILE) as f:
+        baseline = json.load(f)
+    assert set(baseline) == set(bench_reactive.SCENARIOS)
+
+
+@pytest.mark.skipif(
+    not os.environ.get("REACTPYQT_BENCH"), reason="set REACTPYQT_BENCH=1 to run the benchmark gate"
+)
+def test_no_regression_against_baseline():
+    proc = subprocess.run([sys.executable, BENCH_FILE], capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stdout + proc.stderr
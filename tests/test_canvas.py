@@ -0,0 +1,69 @@
+import pytest
+
+qt_widget = pytest.importorskip("reactpyqt.qt_widget")
+from reactpyqt.canvas import Line, Path, Rect, Text  # noqa: E402
+from reactpyqt.reactive import create_list  # noqa: E402
+
+
+@pytest.fixture
+def canvas(qt_app):
+    canvas = qt_widget.QT_Canvas(shapes=[], background="white", antialias=False)
+    canvas.resize(200, 200)
+    updates = []
+
+    # 记录重绘区域, None 是整块重绘
+    def update(*rect):
+        updates.append(rect[0] if rect else None)
+
+    canvas.update = update
+    canvas.updates = updates
+    return canvas
+
+
+def test_only_changed_shapes_are_repainted(canvas):
+    grid = [Line(0, y, 200, y) for y in range(0, 200, 20)]
+    canvas.set_shapes([*grid, Rect(10, 10, 20, 20, fill="red")])
+    canvas.updates.clear()
+
+    canvas.set_shapes([*grid, Rect(50, 10, 20, 20, fill="red")])
+    old, new = canvas.updates
+    assert old.contains(10, 10) and not old.contains(50, 10)
+    assert new.contains(50, 10) and not new.contains(10, 10)
+
+    canvas.updates.clear()
+    canvas.set_shapes([*grid, Rect(50, 10, 20, 20, fill="red")])
+    assert canvas.updates == []
+
+
+def test_reorder_and_large_changes_repaint_everything(canvas):
+    shapes = [Rect(0, 0, 10, 10), Text(0, 20, "a"), Path(((0, 0), (5, 5)), closed=True)]
+    canvas.set_shapes(shapes)
+    canvas.updates.clear()
+
+    canvas.set_shapes(shapes[::-1])
+    assert canvas.updates == [None]
+
+    canvas.updates.clear()
+    canvas.set_shapes([Rect(x, 0, 1, 1) for x in range(canvas.MAX_DIRTY_RECTS + 1)])
+    assert canvas.updates == [None]
+
+
+def test_removed_shapes_are_forgotten(canvas):
+    canvas.set_shapes([Rect(0, 0, 10, 10), Path(((0, 0), (10, 10)))])
+    canvas.set_shapes([Rect(0, 0, 10, 10)])
+    assert list(canvas._bounds) == [Rect(0, 0, 10, 10)]
+    assert canvas._paths == {}
+
+
+def test_reactive_list_shapes_are_painted(qt_app):
+    shapes = create_list([Rect(10, 10, 30, 30, fill="#ff0000", stroke=None)])
+    canvas = qt_widget.QT_Canvas(shapes=shapes, background="#ffffff", antialias=False)
+    canvas.resize(100, 100)
+
+    def color_at(x, y):
+        return canvas.grab().toImage().pixelColor(x, y).name()
+
+    assert color_at(20, 20) == "#ff0000"
+    shapes.replace(0, Rect(50, 50, 30, 30, fill="#0000ff", stroke=None))
+    assert color_at(20, 20) == "#ffffff"
+    assert color_at(60, 60) == "#0000ff"
@@ -0,0 +1,81 @@
+from reactpyqt.core import Component, VBox, HBox, Label, Button, Input, For, ErrorBoundary
+from reactpyqt.headless import render_headless
+from reactpyqt.reactive import create_list
+
+
+def test_actions_get_the_row_item_and_current_index():
+    todo = create_list(["a", "b", "c"])
+    renamed = []
+
+    class App(Component):
+        def render(self):
+            return VBox(
+                For(
+                    each=todo,
+                    map_fn=lambda item, _: HBox(
+                        Label(item),
+                        Button("x", on_click="remove", key=f"remove-{item}"),
+                        Input(on_edit="rename", key=f"edit-{item}"),
+                    ),
+                    actions={
+                        "remove": lambda item, idx: todo.pop(idx),
+                        "rename": lambda item, idx, text: renamed.append((item, idx, text)),
+                    },
+                )
+            )
+
+    root = render_headless(App())
+    root.find("remove-a").click()
+    assert todo() == ["b", "c"]
+    # 行号按点击时的位置算, 不是创建行时的
+    root.find("edit-c").edit("C")
+    assert renamed == [("c", 1, "C")]
+    root.find("remove-c").click()
+    assert [label.text for label in root.find_all("label")] == ["b"]
+
+
+def test_nested_for_uses_outer_actions():
+    groups = create_list(["g1", "g2"])
+    picked = []
+
+    class App(Component):
+        def render(self):
+            return VBox(
+                For(
+                    each=groups,
+                    map_fn=lambda group, _: VBox(
+                        For(
+                            each=create_list([f"{group}-a", f"{group}-b"]),
+                            map_fn=lambda item, _: Button(item, on_click="pick", key=item),
+                            actions={"unused": lambda item, idx: None},
+                        )
+                    ),
+                    actions={"pick": lambda group, idx: picked.append((group, idx))},
+                )
+            )
+
+    root = render_headless(App())
+    root.find("g2-b").click()
+    assert picked == [("g2", 1)]
+
+
+def test_action_errors_reach_the_error_boundary():
+    def fail(item, idx):
+        raise ValueError(f"cannot remove {item}")
+
+    class App(Component):
+        def render(self):
+            return VBox(
+                ErrorBoundary(
+                    For(
+                        each=create_list(["a"]),
+                        map_fn=lambda item, _: Button(item, on_click="remove", key=item),
+                        actions={"remove": fail},
+                    ),
+                    fallback=lambda error, reset: Label(str(error)),
+                )
+            )
+
+    root = render_headless(App())
+    root.find("a").click()
+    assert [label.text for label in root.find_all("label")] == ["cannot remove a"]
@@ -0,0 +1,59 @@
+import gc
+
+import pytest
+
+from reactpyqt import diagnostics
+from reactpyqt.core import Component, VBox, Label, For
+from reactpyqt.headless import render_headless
+from reactpyqt.reactive import create_list, create_signal
+
+suffix, _ = create_signal("")
+
+
+@pytest.fixture
+def enabled():
+    diagnostics.enable()
+    yield
+    diagnostics.disable()
+
+
+class Row(Component):
+    def render(self):
+        return Label(lambda: self.props["name"] + suffix())
+
+
+def render_rows(items):
+    class App(Component):
+        def render(self):
+            return VBox(For(each=items, map_fn=lambda item, _: Row(name=item)))
+
+    return render_headless(App())
+
+
+def test_removed_rows_are_released(enabled):
+    items = create_list([f"row {idx}" for idx in range(10)])
+    render_rows(items)
+    gc.collect()
+    before = diagnostics.snapshot()
+    assert before[("widget", "Row")] == 10
+
+    items.remove_range(0, 8)
+    gc.collect()
+    changes = diagnostics.diff(before, diagnostics.snapshot())
+    assert ("widget", "Row", -8) in changes
+    assert all(delta < 0 for _, _, delta in changes)
+    assert diagnostics.stale_effects() == []
+
+
+def test_stale_effects_find_effects_of_destroyed_widgets(enabled):
+    items = create_list(["a"])
+    root = render_rows(items)
+    label = root.find_all("label")[0]
+    # 模拟没有随 owner 释放的 effect: 控件已经删除, effect 还被持有着
+    label.destroyed = True
+    assert [owner for owner, _ in diagnostics.stale_effects()] == ["Row"]
+
+
+def test_nothing_is_tracked_while_disabled():
+    render_rows(create_list(["a"]))
+    assert diagnostics.count() == {kind: 0 for kind in diagnostics.KINDS}
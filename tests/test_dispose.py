@@ -0,0 +1,71 @@
+import pytest
+
+from reactpyqt.core import Component, VBox, Label, For, Switch, Case
+from reactpyqt.headless import render_headless
+from reactpyqt.reactive import create_effect, create_list, create_signal, on_cleanup
+
+timer = pytest.importorskip("reactpyqt.timer")
+
+
+class Row(Component):
+    """
+    Records its effect runs, cleanups and interval in the lists passed as props.
+    """
+
+    def render(self):
+        name = self.props["name"]
+        tick = self.props["tick"]
+        create_effect(lambda: self.props["runs"].append((name, tick())))
+        on_cleanup(lambda: self.props["cleaned"].append(name))
+        self.props["intervals"][name] = timer.set_interval(lambda: None, 60)
+        return Label(name)
+
+
+def make_row_props():
+    tick, set_tick = create_signal(0)
+    props = {"tick": tick, "runs": [], "cleaned": [], "intervals": {}}
+    return props, set_tick
+
+
+def test_removed_for_row_is_disposed():
+    props, set_tick = make_row_props()
+    items = create_list(["a", "b"])
+
+    class App(Component):
+        def render(self):
+            return VBox(For(each=items, map_fn=lambda item, _: Row(name=item, **props)))
+
+    render_headless(App())
+    items.pop(0)
+    assert props["cleaned"] == ["a"]
+    assert not props["intervals"]["a"].running
+    assert props["intervals"]["b"].running
+
+    props["runs"].clear()
+    set_tick(1)
+    assert props["runs"] == [("b", 1)]
+    props["intervals"]["b"].stop()
+
+
+def test_replaced_switch_case_is_disposed():
+    props, set_tick = make_row_props()
+    show, set_show = create_signal(True)
+
+    class App(Component):
+        def render(self):
+            return VBox(
+                Switch(
+                    condition=show,
+                    cases=[Case(when=lambda v: v, render=Row(name="case", **props))],
+                    fallback=Label("off"),
+                )
+            )
+
+    render_headless(App())
+    set_show(False)
+    assert props["cleaned"] == ["case"]
+    assert not props["intervals"]["case"].running
+
+    props["runs"].clear()
+    set_tick(1)
+    assert props["runs"] == []
@@ -0,0 +1,81 @@
+from reactpyqt.core import Component, VBox, Label, Dynamic
+from reactpyqt.headless import render_headless
+from reactpyqt.reactive import create_signal, on_cleanup
+
+
+def make_screens(cleaned: list, built: list):
+    class Home(Component):
+        def render(self):
+            built.append("home")
+            on_cleanup(lambda: cleaned.append("home"))
+            return Label("home")
+
+    class Settings(Component):
+        def render(self):
+            built.append("settings")
+            on_cleanup(lambda: cleaned.append("settings"))
+            return Label("settings")
+
+    return Home, Settings
+
+
+def labels(root):
+    return [widget.text for widget in root.find_all("label")]
+
+
+def test_setter_accepts_component_classes():
+    cleaned, built = [], []
+    Home, Settings = make_screens(cleaned, built)
+    page, set_page = create_signal(Home)
+
+    class App(Component):
+        def render(self):
+            return VBox(Dynamic(component=page, cache=False))
+
+    root = render_headless(App())
+    set_page(Settings)
+    assert page() is Settings
+    assert labels(root) == ["settings"]
+    assert cleaned == ["home"]
+
+    set_page(Home)
+    assert labels(root) == ["home"]
+    assert cleaned == ["home", "settings"]
+    assert built == ["home", "settings", "home"]
+
+
+def test_cached_classes_are_built_once():
+    cleaned, built = [], []
+    Home, Settings = make_screens(cleaned, built)
+    page, set_page = create_signal(Home)
+
+    class App(Component):
+        def render(self):
+            return VBox(Dynamic(component=page))
+
+    root = render_headless(App())
+    set_page(Settings)
+    set_page(Home)
+    assert labels(root) == ["home"]
+    assert built == ["home", "settings"]
+    assert cleaned == []
+
+
+def test_instances_are_not_cached():
+    count, set_count = create_signal(0)
+    cleaned = []
+
+    class Screen(Component):
+        def render(self):
+            on_cleanup(lambda: cleaned.append(self.props["n"]))
+            return Label(str(self.props["n"]))
+
+    class App(Component):
+        def render(self):
+            return VBox(Dynamic(component=lambda: Screen(n=count())))
+
+    root = render_headless(App())
+    for n in range(1, 4):
+        set_count(n)
+    assert labels(root) == ["3"]
+    assert cleaned == [0, 1, 2]
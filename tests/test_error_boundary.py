@@ -0,0 +1,47 @@
+from reactpyqt.core import Component, VBox, Label, For, ErrorBoundary
+from reactpyqt.headless import render_headless
+from reactpyqt.reactive import create_signal
+
+
+def texts(widget):
+    return [child.text for child in widget.walk() if child.tag == "label"]
+
+
+def bad_row(item, idx):
+    if item == "bad":
+        raise ValueError("bad row")
+    return Label(item)
+
+
+def mount_for(nested: bool):
+    items, set_items = create_signal(["a", "b"])
+
+    class App(Component):
+        def render(self):
+            each = For(each=items, map_fn=bad_row)
+            return VBox(
+                Label("before"),
+                ErrorBoundary(VBox(each) if nested else each, fallback=Label("failed")),
+                Label("after"),
+            )
+
+    return render_headless(App()), set_items
+
+
+def test_for_inside_error_boundary():
+    for nested in (False, True):
+        root, set_items = mount_for(nested)
+        assert texts(root) == ["before", "a", "b", "after"]
+
+        set_items(["a", "bad"])
+        assert texts(root) == ["before", "failed", "after"]
+
+
+def test_for_failing_on_mount_shows_fallback():
+    items, _ = create_signal(["bad"])
+
+    class App(Component):
+        def render(self):
+            return VBox(ErrorBoundary(For(each=items, map_fn=bad_row), fallback=Label("failed")))
+
+    assert texts(render_headless(App())) == ["failed"]
@@ -0,0 +1,41 @@
+import pytest
+
+QtWidgets = pytest.importorskip("reactpyqt.qt.QtWidgets")
+from reactpyqt.core import VBox, Label, Button, Input, create_qt_widget_nested  # noqa: E402
+from reactpyqt.reactive import create_signal  # noqa: E402
+from reactpyqt.renderer import get_renderer, set_renderer, use_flat_widgets  # noqa: E402
+
+
+@pytest.fixture
+def flat(qt_app):
+    prev_renderer = get_renderer()
+    use_flat_widgets()
+    yield qt_app
+    set_renderer(prev_renderer)
+
+
+def test_flat_widgets_are_native(flat):
+    text, set_text = create_signal("a")
+    clicks, edits = [], []
+
+    panel = create_qt_widget_nested(
+        VBox(
+            Label(text),
+            Button("ok", on_click=lambda: clicks.append(True)),
+            Input(on_edit=edits.append),
+        )
+    )
+    label, button, line_edit = panel.findChildren(QtWidgets.QWidget)
+
+    assert isinstance(label, QtWidgets.QLabel) and label.label is label
+    assert isinstance(button, QtWidgets.QPushButton) and button.button is button
+    assert isinstance(line_edit, QtWidgets.QLineEdit) and line_edit.input is line_edit
+    # 没有一层包装的 QWidget
+    assert [widget.findChildren(QtWidgets.QWidget) for widget in (label, button)] == [[], []]
+
+    set_text("b")
+    assert label.text() == "b"
+    button.click()
+    assert clicks == [True]
+    line_edit.textEdited.emit("typed")
+    assert edits == ["typed"]
@@ -0,0 +1,76 @@
+from reactpyqt.core import Component, VBox, HBox, Label, Button, Input
+from reactpyqt.headless import render_headless
+from reactpyqt.reactive import create_signal
+
+
+def test_render_builds_the_widget_tree():
+    class App(Component):
+        def render(self):
+            return VBox(Label("title"), HBox(Button("ok"), Button("cancel")))
+
+    root = render_headless(App())
+    assert root.snapshot() == {
+        "tag": "root",
+        "children": [
+            {
+                "tag": "vbox",
+                "children": [
+                    {"tag": "label", "props": {"text": "title"}},
+                    {
+                        "tag": "hbox",
+                        "children": [
+                            {"tag": "button", "props": {"text": "ok"}},
+                            {"tag": "button", "props": {"text": "cancel"}},
+                        ],
+                    },
+                ],
+            }
+        ],
+    }
+
+
+def test_accessor_props_follow_their_signal():
+    count, set_count = create_signal(0)
+
+    class App(Component):
+        def render(self):
+            return VBox(Label(lambda: f"count {count()}", key="count"))
+
+    root = render_headless(App())
+    label = root.find("count")
+    assert label.text == "count 0"
+
+    set_count(2)
+    assert label.text == "count 2"
+    assert root.snapshot()["children"][0]["children"][0]["props"] == {"text": "count 2"}
+
+
+def test_handlers_update_state():
+    text, set_text = create_signal("")
+    count, set_count = create_signal(0)
+
+    class App(Component):
+        def render(self):
+            return VBox(
+                Input(on_edit=set_text, key="input"),
+                Button("add", on_click=lambda: set_count(count() + 1), key="add"),
+                Label(lambda: f"{text()} {count()}", key="out"),
+            )
+
+    root = render_headless(App())
+    root.find("input").edit("hi")
+    root.find("add").click()
+    root.find("add").click()
+    assert root.find("out").text == "hi 2"
+    assert root.find("input").text == "hi"
+
+
+def test_snapshot_keys():
+    class App(Component):
+        def render(self):
+            return VBox(Label("a", key="a"), key="box")
+
+    snapshot = render_headless(App()).snapshot(keys=True)
+    box = snapshot["children"][0]
+    assert box["key"] == "box"
+    assert box["children"][0]["key"] == "a"
@@ -0,0 +1,67 @@
+import pytest
+
+from reactpyqt.reactive import Owner, create_list, create_signal, run_with_owner
+
+item_model = pytest.importorskip("reactpyqt.item_model")
+from reactpyqt.qt import QT_API  # noqa: E402
+
+QtTest = pytest.importorskip("PyQt6.QtTest" if QT_API == "pyqt6" else "PySide6.QtTest")
+
+COLUMNS = [("name", str)]
+
+
+def checked_model(rows):
+    model = item_model.ReactiveTableModel(rows, COLUMNS)
+    # Fatal: 模型发出的通知和数据不一致时直接失败
+    tester = QtTest.QAbstractItemModelTester(
+        model, QtTest.QAbstractItemModelTester.FailureReportingMode.Fatal
+    )
+    return model, tester
+
+
+def names(model):
+    return [model.data(model.index(row, 0)) for row in range(model.rowCount())]
+
+
+def test_list_patches_keep_the_model_consistent():
+    rows = create_list([f"r{i}" for i in range(5)])
+    model, _tester = checked_model(rows)
+
+    rows.insert(0, "first")
+    rows.extend(["a", "b"])
+    rows.pop(2)
+    rows.remove_range(0, 2)
+    rows.move(0, -1)
+    rows.move(-1, 0)
+    rows.replace(1, "z")
+    assert names(model) == rows.get()
+    assert model._rows is not rows.get()
+
+    rows.set(["q"])
+    assert names(model) == ["q"]
+
+
+def test_signal_rows_become_the_smallest_change():
+    a, b, c = "a", "b", "c"
+    rows, set_rows = create_signal([a, b])
+    model, _tester = checked_model(rows)
+    changed = []
+    model.dataChanged.connect(lambda first, last: changed.append((first.row(), last.row())))
+
+    set_rows([a, b, c])
+    assert changed == []
+    set_rows([a, "x", c])
+    assert changed == [(1, 1)]
+    set_rows(["y"])
+    assert names(model) == ["y"]
+    set_rows([])
+    assert model.rowCount() == 0
+
+
+def test_list_model_unsubscribes_on_cleanup():
+    owner = Owner()
+    rows = create_list([1])
+    run_with_owner(owner, lambda: item_model.ReactiveTableModel(rows, COLUMNS))
+    assert len(rows._patch_subscribers) == 1
+    owner.dispose()
+    assert rows._patch_subscribers == []
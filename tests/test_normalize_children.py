@@ -0,0 +1,29 @@
+from reactpyqt.core import Label
+from reactpyqt.utils.common import normalize_children
+
+
+def test_plain_children_are_returned_as_is():
+    children = (Label("a"), Label("b"))
+    assert normalize_children(children) is children
+
+
+def test_none_and_bool_are_dropped():
+    a, b = Label("a"), Label("b")
+    assert normalize_children((None, a, False, True, b)) == (a, b)
+
+
+def test_nested_lists_are_flattened_in_order():
+    a, b, c, d = (Label(text) for text in "abcd")
+    assert normalize_children((a, [b, (c, [None])], [], d)) == (a, b, c, d)
+
+
+def test_generators_are_consumed():
+    labels = [Label(str(i)) for i in range(3)]
+    children = (label for label in labels)
+    assert normalize_children((children, None)) == tuple(labels)
+
+
+def test_conditional_child():
+    a = Label("a")
+    show = False
+    assert normalize_children((show and Label("hidden"), a)) == (a,)
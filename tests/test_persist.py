@@ -0,0 +1,60 @@
+import os
+
+from reactpyqt import persist
+from reactpyqt.persist import PersistStore
+
+
+def reopen(store: PersistStore) -> PersistStore:
+    store._close_files()
+    return PersistStore(store.path)
+
+
+def test_values_and_list_patches_are_restored(tmp_path):
+    store = PersistStore(str(tmp_path / "state.rpq"))
+    todo = store.list("todo", ["a"])
+    _, set_count = store.signal("count", 0)
+    todo.append("b")
+    todo.insert(0, "z")
+    todo.move(0, 2)
+    todo.replace(1, "B")
+    todo.pop(0)
+    set_count(5)
+
+    store = reopen(store)
+    assert store.list("todo", [])() == ["B", "z"]
+    assert store.signal("count", 0)[0]() == 5
+    store._close_files()
+
+
+def test_repeated_sets_compact_the_file(tmp_path):
+    store = PersistStore(str(tmp_path / "state.rpq"))
+    _, set_count = store.signal("count", 0)
+    for n in range(10_000):
+        set_count(n)
+
+    assert os.path.getsize(store.path) <= persist.COMPACT_MIN_SIZE
+    store = reopen(store)
+    assert store.signal("count", 0)[0]() == 9999
+    store._close_files()
+
+
+def test_open_drops_superseded_and_incomplete_records(tmp_path):
+    store = PersistStore(str(tmp_path / "state.rpq"))
+    _, set_count = store.signal("count", 0)
+    todo = store.list("todo", [])
+    todo.append("kept")
+    for n in range(100):
+        set_count(n)
+    store._close_files()
+    with open(store.path, "ab") as f:
+        # 写到一半的 record
+        f.write(persist._HEADER.pack(persist._VALUE, 5, 100) + b"count")
+    size = os.path.getsize(store.path)
+
+    # 没有注册的名字原样保留, 不需要 unpickle
+    store = PersistStore(store.path)
+    assert os.path.getsize(store.path) < size
+    store = reopen(store)
+    assert store.signal("count", 0)[0]() == 99
+    assert store.list("todo", [])() == ["kept"]
+    store._close_files()
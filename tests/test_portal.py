@@ -0,0 +1,44 @@
+from reactpyqt.core import Component, VBox, Label, Portal, Switch, Case
+from reactpyqt.headless import render_headless
+from reactpyqt.reactive import create_signal, on_cleanup
+
+
+def test_portal_moves_the_same_widgets():
+    target, set_target = create_signal(None)
+    show, set_show = create_signal(True)
+    built, cleaned = [], []
+
+    class Panel(Component):
+        def render(self):
+            built.append(True)
+            on_cleanup(lambda: cleaned.append(True))
+            return Label("panel", key="panel")
+
+    class App(Component):
+        def render(self):
+            return VBox(
+                VBox(key="dock-a"),
+                VBox(key="dock-b"),
+                Switch(
+                    condition=show,
+                    cases=[Case(when=lambda v: v, render=VBox(Portal(Panel(), mount=target)))],
+                ),
+            )
+
+    root = render_headless(App())
+    dock_a, dock_b = root.find("dock-a"), root.find("dock-b")
+    assert root.find("panel") is None
+
+    set_target(dock_a)
+    panel = root.find("panel")
+    assert dock_a.children == [panel]
+
+    set_target(dock_b)
+    assert dock_a.children == []
+    assert dock_b.children == [panel]
+    assert built == [True]
+
+    set_show(False)
+    assert dock_b.children == []
+    assert panel.destroyed
+    assert cleaned == [True]
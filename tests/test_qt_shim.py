@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+from importlib.util import find_spec
+
+import pytest
+
+CHECK = """
+from reactpyqt.qt import QT_API, is_deleted
+from reactpyqt.qt.QtCore import QObject, Signal, Slot
+
+class Source(QObject):
+    changed = Signal(int)
+
+    @Slot(int)
+    def take(self, value):
+        self.value = value
+
+source = Source()
+source.changed.connect(source.take)
+source.changed.emit(3)
+child = QObject(source)
+assert source.value == 3 and not is_deleted(child)
+del source
+assert is_deleted(child)
+print(QT_API)
+"""
+
+
+def run_with_api(api: str) -> subprocess.CompletedProcess:
+    # 绑定在第一次 import 时选定, 每个绑定单独起一个进程
+    env = {**os.environ, "REACTPYQT_QT_API": api}
+    return subprocess.run(
+        [sys.executable, "-c", CHECK], env=env, capture_output=True, text=True, timeout=60
+    )
+
+
+@pytest.mark.parametrize("api, module", [("pyqt6", "PyQt6"), ("pyside6", "PySide6")])
+def test_selected_binding(api, module):
+    if find_spec(module) is None:
+        pytest.skip(f"{module} is not installed")
+    result = run_with_api(api)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == api
+
+
+def test_invalid_binding():
+    result = run_with_api("pyqt4")
+    assert result.returncode != 0
+    assert "Invalid REACTPYQT_QT_API pyqt4" in result.stderr
@@ -0,0 +1,65 @@
+from reactpyqt.core import Component, VBox, Label, For
+from reactpyqt.headless import render_headless
+from reactpyqt.reactive import create_list
+
+
+def render_list(items):
+    built = []
+
+    def row(item, _):
+        built.append(item)
+        return Label(item)
+
+    class App(Component):
+        def render(self):
+            return VBox(For(each=items, map_fn=row, fallback=Label("empty")))
+
+    (vbox,) = render_headless(App()).children
+    return vbox, built
+
+
+def texts(vbox) -> list[str]:
+    return [child.text for child in vbox.children]
+
+
+def test_patches_only_build_new_rows():
+    items = create_list(["a", "b", "c"])
+    vbox, built = render_list(items)
+    first, second, third = vbox.children
+
+    items.insert_range(1, ["x", "y"])
+    assert texts(vbox) == ["a", "x", "y", "b", "c"]
+    items.remove_range(1, 3)
+    assert texts(vbox) == ["a", "b", "c"]
+    items.move(0, -1)
+    assert texts(vbox) == ["b", "c", "a"]
+    items.replace(1, "C")
+    assert texts(vbox) == ["b", "C", "a"]
+
+    assert built == ["a", "b", "c", "x", "y", "C"]
+    assert vbox.children == [second, vbox.children[1], first]
+    assert third not in vbox.children
+
+
+def test_reset_and_fallback():
+    items = create_list(["a"])
+    vbox, built = render_list(items)
+
+    items.set(["p", "q"])
+    assert texts(vbox) == ["p", "q"]
+    items.remove_range(0, 2)
+    assert texts(vbox) == ["empty"]
+    items.append("r")
+    assert texts(vbox) == ["r"]
+    assert built == ["a", "p", "q", "r"]
+
+
+def test_move_with_negative_indexes():
+    items = create_list(["a", "b", "c", "d"])
+    vbox, _ = render_list(items)
+
+    items.move(-1, 0)
+    assert texts(vbox) == ["d", "a", "b", "c"]
+    items.move(1, 99)
+    assert texts(vbox) == ["d", "b", "c", "a"]
+    assert items() == ["d", "b", "c", "a"]
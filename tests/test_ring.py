@@ -0,0 +1,74 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+from reactpyqt.reactive import create_effect, create_signal  # noqa: E402
+from reactpyqt.ring import create_ring, downsample, lttb, minmax  # noqa: E402
+
+
+def test_ring_wraps_around():
+    ring = create_ring(5)
+    ring.extend([1, 2, 3])
+    assert ring().tolist() == [1, 2, 3]
+
+    # 跨过缓冲区末尾
+    ring.extend([4, 5, 6, 7])
+    assert ring().tolist() == [3, 4, 5, 6, 7]
+    assert ring.start_index == 2
+
+    ring.append(8)
+    assert ring().tolist() == [4, 5, 6, 7, 8]
+
+    # 一批比容量还多, 只留最后几个
+    ring.extend(range(100, 112))
+    assert ring().tolist() == [107, 108, 109, 110, 111]
+    assert ring.start_index == 15
+
+
+def test_get_is_a_read_only_view_and_extend_notifies_once():
+    ring = create_ring(4)
+    runs = []
+    create_effect(lambda: runs.append(len(ring())))
+    ring.extend([1.0, 2.0, 3.0])
+    assert runs == [0, 3]
+
+    window = ring()
+    assert np.shares_memory(window, ring._buffer)
+    with pytest.raises(ValueError):
+        window[0] = 10
+
+    ring.clear()
+    assert len(ring) == 0 and runs == [0, 3, 0]
+
+
+def test_minmax_keeps_spikes():
+    y = np.zeros(10_000)
+    y[1234] = 50
+    y[8765] = -50
+    indices = minmax(y, 100)
+    assert len(indices) == 200
+    assert 1234 in indices and 8765 in indices
+    assert (np.diff(indices) >= 0).all()
+
+
+def test_lttb_keeps_endpoints():
+    y = np.sin(np.linspace(0, 20, 5000))
+    indices = lttb(y, 300)
+    assert len(indices) == 300
+    assert indices[0] == 0 and indices[-1] == 4999
+    assert (np.diff(indices) > 0).all()
+
+
+def test_downsample_follows_the_ring_and_width():
+    ring = create_ring(1000)
+    width, set_width = create_signal(10)
+    points = downsample(ring, width)
+    ring.extend(np.arange(1500, dtype=np.float64))
+
+    x, y = points()
+    assert len(x) == 20
+    assert x[0] >= ring.start_index == 500
+    assert (y == x).all()
+
+    set_width(1000)
+    x, _ = points()
+    assert len(x) == 1000
@@ -0,0 +1,100 @@
+from reactpyqt.core import Component, VBox, Label, Router, ErrorBoundary
+from reactpyqt.headless import render_headless
+from reactpyqt.reactive import create_signal, on_cleanup
+
+
+def make_screen(name: str, built: list, cleaned: list):
+    class Screen(Component):
+        def render(self):
+            built.append(name)
+            on_cleanup(lambda: cleaned.append(name))
+            return Label(name)
+
+    return Screen
+
+
+def render_router(route, built, cleaned, **props):
+    routes = {name: make_screen(name, built, cleaned) for name in ("home", "settings", "about")}
+
+    class App(Component):
+        def render(self):
+            return VBox(Router(route=route, routes=routes, fallback=Label("404"), **props))
+
+    return render_headless(App())
+
+
+def labels(root) -> list[str]:
+    return [label.text for label in root.find_all("label")]
+
+
+def test_routes_and_fallback_with_cache():
+    route, set_route = create_signal("home")
+    built, cleaned = [], []
+    root = render_router(route, built, cleaned)
+    assert labels(root) == ["home"]
+    (home,) = root.find_all("label")
+
+    set_route("missing")
+    assert labels(root) == ["404"]
+    set_route("settings")
+    set_route("home")
+    assert labels(root) == ["home"]
+    # 缓存的页面只摘下来, 回来时还是同一个控件
+    assert root.find_all("label") == [home]
+    assert built == ["home", "settings"]
+    assert cleaned == []
+
+
+def test_without_cache_screens_are_rebuilt_and_disposed():
+    route, set_route = create_signal("home")
+    built, cleaned = [], []
+    root = render_router(route, built, cleaned, cache=False)
+
+    set_route("settings")
+    set_route("home")
+    assert labels(root) == ["home"]
+    assert built == ["home", "settings", "home"]
+    assert cleaned == ["home", "settings"]
+
+
+def test_prefetch_builds_likely_routes_when_idle():
+    route, set_route = create_signal("home")
+    built, cleaned = [], []
+    next_routes = {"home": ["settings", "missing"], "settings": ["about"]}
+    root = render_router(route, built, cleaned, prefetch=lambda r: next_routes.get(r, []))
+    # headless 的 call_when_idle 马上执行
+    assert built == ["home", "settings"]
+    assert labels(root) == ["home"]
+
+    set_route("settings")
+    assert built == ["home", "settings", "about"]
+    assert labels(root) == ["settings"]
+
+
+def test_failed_prefetch_is_retried_on_visit():
+    route, set_route = create_signal("home")
+    attempts = []
+
+    class Broken(Component):
+        def render(self):
+            attempts.append(True)
+            raise ValueError("broken screen")
+
+    class App(Component):
+        def render(self):
+            return VBox(
+                ErrorBoundary(
+                    Router(
+                        route=route,
+                        routes={"home": lambda: Label("home"), "broken": Broken},
+                        prefetch=["broken"],
+                    ),
+                    fallback=lambda error, reset: Label(str(error)),
+                )
+            )
+
+    root = render_headless(App())
+    assert labels(root) == ["home"] and len(attempts) == 1
+    set_route("broken")
+    assert labels(root) == ["broken screen"]
+    assert len(attempts) == 2
@@ -0,0 +1,45 @@
+from reactpyqt.core import Component, VBox, Label, For
+from reactpyqt.headless import render_headless
+from reactpyqt.reactive import create_effect, create_list, create_selector, create_signal
+
+
+def test_moving_the_selection_reruns_two_rows():
+    selected, set_selected = create_signal(0)
+    is_selected = create_selector(selected)
+    runs = []
+
+    class App(Component):
+        def render(self):
+            def row(item, _):
+                def text():
+                    runs.append(item)
+                    return f"> {item}" if is_selected(item) else str(item)
+
+                return Label(text)
+
+            return VBox(For(each=create_list(range(100)), map_fn=row))
+
+    root = render_headless(App())
+    assert len(runs) == 100
+
+    runs.clear()
+    set_selected(42)
+    assert sorted(runs) == [0, 42]
+    labels = [label.text for label in root.find_all("label")]
+    assert labels[0] == "0" and labels[42] == "> 42"
+
+    runs.clear()
+    set_selected(42)
+    assert runs == []
+
+
+def test_custom_fn_checks_every_read_key():
+    limit, set_limit = create_signal(3)
+    is_below = create_selector(limit, lambda key, value: key < value)
+    runs = []
+    for key in range(6):
+        create_effect(lambda key=key: runs.append((key, is_below(key))))
+
+    runs.clear()
+    set_limit(5)
+    assert runs == [(3, True), (4, True)]
@@ -0,0 +1,32 @@
+from reactpyqt.core import Component, VBox, HBox, Label, Button, For, is_static
+from reactpyqt.headless import render_headless
+from reactpyqt.reactive import create_signal
+
+
+def test_plain_subtrees_are_static():
+    assert is_static(HBox(Label("a"), VBox(Button("b"), spacing=4)))
+    assert is_static(Button("remove", on_click="remove"))
+
+
+def test_accessors_callbacks_and_control_flow_are_not_static():
+    value, _ = create_signal("a")
+    assert not is_static(HBox(Label(value)))
+    assert not is_static(HBox(Button("b", on_click=lambda: None)))
+    assert not is_static(VBox(For(each=value, map_fn=lambda item, _: Label(item))))
+
+
+def test_static_rows_render_like_dynamic_ones():
+    items, _ = create_signal(["a", "b"])
+
+    class App(Component):
+        def render(self):
+            return VBox(For(each=items, map_fn=lambda item, _: HBox(Label(item), Label("x"))))
+
+    rows = render_headless(App()).snapshot()["children"][0]["children"]
+    assert rows[1] == {
+        "tag": "hbox",
+        "children": [
+            {"tag": "label", "props": {"text": "b"}},
+            {"tag": "label", "props": {"text": "x"}},
+        ],
+    }
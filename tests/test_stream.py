@@ -0,0 +1,91 @@
+import time
+
+import pytest
+
+from reactpyqt.core import Component, VBox, Label, For, Switch, Case
+from reactpyqt.globalvar import __intervals__
+from reactpyqt.headless import render_headless
+from reactpyqt.reactive import create_signal
+
+stream = pytest.importorskip("reactpyqt.stream")
+
+
+def mounted_streams(before=()):
+    return [s for s in __intervals__ if isinstance(s, stream.StreamList) and s not in before]
+
+
+def pump_until_done(source, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not source.done() and time.monotonic() < deadline:
+        source.pump()
+        time.sleep(0.001)
+    assert source.done()
+
+
+def test_stream_starts_when_mounted():
+    started = []
+
+    def numbers():
+        started.append(True)
+        yield from range(250)
+
+    before = mounted_streams()
+    rows = For(each=numbers(), map_fn=lambda n, _: Label(str(n)), chunk_size=100)
+    assert not started and not mounted_streams(before)
+
+    class App(Component):
+        def render(self):
+            return VBox(rows)
+
+    root = render_headless(App())
+    (source,) = mounted_streams(before)
+    pump_until_done(source)
+    (vbox,) = root.children
+    assert [child.text for child in vbox.children] == [str(n) for n in range(250)]
+
+
+def test_unmounted_stream_is_never_read():
+    started = []
+
+    def numbers():
+        started.append(True)
+        yield 1
+
+    before = mounted_streams()
+    For(each=numbers(), map_fn=lambda n, _: Label(str(n)))
+    time.sleep(0.05)
+    assert not started and not mounted_streams(before)
+
+
+def test_removed_stream_stops():
+    show, set_show = create_signal(True)
+
+    def forever():
+        n = 0
+        while True:
+            yield n
+            n += 1
+
+    class App(Component):
+        def render(self):
+            return VBox(
+                Switch(
+                    condition=show,
+                    cases=[
+                        Case(
+                            when=lambda v: v,
+                            render=VBox(For(each=forever(), map_fn=lambda n, _: Label(str(n)))),
+                        )
+                    ],
+                    fallback=Label("hidden"),
+                )
+            )
+
+    before = mounted_streams()
+    render_headless(App())
+    (source,) = mounted_streams(before)
+    source.pump()
+    set_show(False)
+    assert source.done()
+    # 生产者停在满的队列上, stop 之后也要能退出
+    assert stream.QThreadPool.globalInstance().waitForDone(2000)
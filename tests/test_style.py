@@ -0,0 +1,67 @@
+import pytest
+
+QtWidgets = pytest.importorskip("reactpyqt.qt.QtWidgets")
+from reactpyqt import style  # noqa: E402
+
+
+@pytest.fixture
+def app(qt_app):
+    return qt_app
+
+
+def make_panel(count: int):
+    panel = QtWidgets.QWidget()
+    layout = QtWidgets.QVBoxLayout(panel)
+    labels = [QtWidgets.QLabel(f"row {idx}") for idx in range(count)]
+    for label in labels:
+        layout.addWidget(label)
+    panel.resize(120, 40 * count)
+    panel.show()
+    return panel, labels
+
+
+def color_of(app, widget) -> str:
+    # 等合并后的 flush 跑完再截图
+    app.processEvents()
+    return widget.grab().toImage().pixelColor(2, 2).name()
+
+
+def test_shared_child_qss_wins_over_parent_own_qss(app):
+    panel, labels = make_panel(2)
+    style.apply_qss(panel, "background-color: #0000ff;")
+    for label in labels:
+        style.apply_qss(label, "background-color: #ff0000;")
+
+    assert labels[1].property(style.STYLE_PROPERTY).startswith("s")
+    assert [color_of(app, label) for label in labels] == ["#ff0000", "#ff0000"]
+    assert color_of(app, panel) == "#0000ff"
+
+
+def test_own_child_qss_wins_over_parent_shared_qss(app):
+    panels = [make_panel(1) for _ in range(2)]
+    for panel, _ in panels:
+        style.apply_qss(panel, "background-color: #00ff00;")
+    (panel, (label,)) = panels[1]
+    style.apply_qss(label, "background-color: #ff00ff;")
+
+    assert panel.property(style.STYLE_PROPERTY).startswith("s")
+    assert color_of(app, label) == "#ff00ff"
+
+
+def test_selected_row_switches_by_property(app):
+    panel, labels = make_panel(3)
+
+    def select(selected: int):
+        for idx, label in enumerate(labels):
+            qss = "background-color: #ffff00;" if idx == selected else "background-color: #ffffff;"
+            style.apply_qss(label, qss)
+
+    select(0)
+    select(1)
+    app.processEvents()
+    select(2)
+
+    # 两个值都被不同的行用过, 之后切换只换 property, 不再设置控件自己的 stylesheet
+    assert [label.styleSheet() for label in labels[1:]] == ["", ""]
+    assert labels[2].property(style.STYLE_PROPERTY) == style.__style_classes__["background-color: #ffff00;"]
+    assert [color_of(app, label) for label in labels] == ["#ffffff", "#ffffff", "#ffff00"]
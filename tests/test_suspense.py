@@ -0,0 +1,90 @@
+import threading
+import time
+
+import pytest
+
+from reactpyqt.core import Component, VBox, Label, Suspense
+from reactpyqt.headless import render_headless
+from reactpyqt.reactive import create_signal
+
+pytest.importorskip("reactpyqt.qt.QtCore")
+from reactpyqt.resource import create_resource  # noqa: E402
+
+
+@pytest.fixture
+def app(qt_app):
+    # 线程池的结果通过 queued signal 回到主线程, 需要处理事件
+    return qt_app
+
+
+def wait_until(app, condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.001)
+    assert condition()
+
+
+def texts(root) -> list[str]:
+    return [label.text for label in root.find_all("label")]
+
+
+def render_suspense(resource):
+    class App(Component):
+        def render(self):
+            return VBox(
+                Suspense(
+                    Label(lambda: f"hello {resource()}"),
+                    fallback=Label("loading"),
+                )
+            )
+
+    return render_headless(App())
+
+
+def test_fallback_until_resource_is_loaded(app):
+    release = threading.Event()
+
+    def fetch():
+        release.wait(5)
+        return "world"
+
+    resource = create_resource(fetch)
+    root = render_suspense(resource)
+    assert texts(root) == ["loading"]
+
+    release.set()
+    wait_until(app, lambda: texts(root) == ["hello world"])
+    assert not resource.loading()
+
+
+def test_refetch_updates_content_in_place(app):
+    name, set_name = create_signal("a")
+    fetched = []
+
+    def fetch(value):
+        fetched.append(value)
+        return value.upper()
+
+    resource = create_resource(fetch, source=name)
+    root = render_suspense(resource)
+    wait_until(app, lambda: texts(root) == ["hello A"])
+    (label,) = root.find_all("label")
+
+    set_name("b")
+    assert resource.loading()
+    # 已经显示过内容, 重新加载时不回到 fallback
+    assert texts(root) == ["hello A"]
+    wait_until(app, lambda: texts(root) == ["hello B"])
+    assert root.find_all("label") == [label]
+    assert fetched == ["a", "b"]
+
+
+def test_fetch_error_is_kept_on_the_resource(app):
+    def fetch():
+        raise ValueError("offline")
+
+    resource = create_resource(fetch)
+    wait_until(app, lambda: not resource.loading())
+    assert str(resource.error()) == "offline"
+    assert resource() is None
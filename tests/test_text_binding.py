@@ -0,0 +1,39 @@
+import pytest
+
+from reactpyqt.reactive import create_signal, with_text
+
+
+def test_bind_skips_unchanged_text():
+    count, set_count = create_signal(1)
+    unit, set_unit = create_signal("item")
+    written = []
+
+    binding = with_text("{} {}(s)", count, unit)
+    binding.bind(written.append)
+    assert written == ["1 item(s)"]
+
+    set_count(2)
+    set_count(2)
+    # 值变了但文字一样
+    set_unit("item")
+    set_count(3)
+    assert written == ["1 item(s)", "2 item(s)", "3 item(s)"]
+    assert binding() == "3 item(s)"
+
+
+def test_templates_are_compiled_once():
+    value, _ = create_signal(0.5)
+    first = with_text("{}% done", value)
+    second = with_text("{}% done", value)
+    assert first.format is second.format
+    assert first() == "0.5% done"
+    assert with_text("{:.0%} done", value)() == "50% done"
+    assert with_text("pair {}", lambda: (1, 2))() == "pair (1, 2)"
+
+
+def test_label_writes_the_binding(qt_app):
+    qt_widget = pytest.importorskip("reactpyqt.qt_widget")
+    count, set_count = create_signal(1)
+    label = qt_widget.QT_FlatLabel(text=with_text("Count {}", count))
+    set_count(2)
+    assert label.text() == "Count 2"
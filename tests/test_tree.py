@@ -0,0 +1,74 @@
+from reactpyqt.core import Component, VBox, HBox, Label, Button, Tree
+from reactpyqt.headless import render_headless
+
+
+def children_of(node: str) -> list[str]:
+    return [f"{node}/{idx}" for idx in range(3)]
+
+
+def render_tree(**props):
+    trees = []
+    load_children = props.pop("load_children", children_of)
+
+    class App(Component):
+        def render(self):
+            tree = Tree(
+                roots=["a", "b"],
+                load_children=load_children,
+                has_children=lambda node: node.count("/") < 2,
+                render=lambda node, depth: HBox(
+                    Button(
+                        lambda: "-" if tree.is_expanded(node) else "+",
+                        on_click="toggle",
+                        key=f"toggle-{node}",
+                    ),
+                    Label(node),
+                ),
+                **props,
+            )
+            trees.append(tree)
+            return VBox(tree)
+
+    root = render_headless(App())
+    return root, trees[0]
+
+
+def labels(root) -> list[str]:
+    return [label.text for label in root.find_all("label")]
+
+
+def test_expand_and_collapse_by_toggle():
+    root, _ = render_tree()
+    assert labels(root) == ["a", "b"]
+
+    root.find("toggle-a").click()
+    assert labels(root) == ["a", "a/0", "a/1", "a/2", "b"]
+    assert root.find("toggle-a").text == "-"
+
+    root.find("toggle-a/1").click()
+    assert labels(root) == ["a", "a/0", "a/1", "a/1/0", "a/1/1", "a/1/2", "a/2", "b"]
+
+    root.find("toggle-a").click()
+    assert labels(root) == ["a", "b"]
+    assert root.find("toggle-a").text == "+"
+    # 展开的子孙节点跟着父节点一起重新展开
+    root.find("toggle-a").click()
+    assert labels(root)[:6] == ["a", "a/0", "a/1", "a/1/0", "a/1/1", "a/1/2"]
+
+
+def test_expanded_keys_expand_in_order():
+    loads = []
+
+    def load(node):
+        loads.append(node)
+        return children_of(node)
+
+    root, tree = render_tree(load_children=load, expanded={"b", "b/2", "a/0"})
+    assert labels(root) == ["a", "b", "b/0", "b/1", "b/2", "b/2/0", "b/2/1", "b/2/2"]
+    assert loads == ["b", "b/2"]
+
+    tree.expand("a")
+    assert labels(root)[:5] == ["a", "a/0", "a/0/0", "a/0/1", "a/0/2"]
+    tree.collapse("b")
+    assert labels(root) == ["a", "a/0", "a/0/0", "a/0/1", "a/0/2", "a/1", "a/2", "b"]
+    assert tree._index_of("b") == 7